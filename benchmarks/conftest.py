@@ -0,0 +1,51 @@
+import hashlib
+import json
+import os
+import shutil
+
+import pytest
+
+from pickled_pipeline import Cache
+
+CHECKPOINTS_PER_CACHE = 10
+
+
+@pytest.fixture(scope="function")
+def cache(tmp_path):
+    return Cache(cache_dir=tmp_path / "pipeline_cache")
+
+
+def populate_cache(cache_dir, entry_count):
+    """Fill ``cache_dir`` with ``entry_count`` small entries.
+
+    Entries are spread over ten checkpoints recorded in the manifest. Every
+    entry is a copy of one real entry file, which keeps setup fast enough to
+    repeat for each benchmark round.
+    """
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    cache = Cache(cache_dir=cache_dir)
+
+    @cache.checkpoint(name="template")
+    def template():
+        return "cached value"
+
+    template()
+    [template_name] = [
+        name for name in os.listdir(cache_dir) if name.startswith("template__")
+    ]
+    with open(os.path.join(cache_dir, template_name), "rb") as template_file:
+        template_bytes = template_file.read()
+    os.remove(os.path.join(cache_dir, template_name))
+
+    checkpoint_names = [
+        f"step{index}" for index in range(CHECKPOINTS_PER_CACHE)
+    ]
+    for index in range(entry_count):
+        checkpoint_name = checkpoint_names[index % CHECKPOINTS_PER_CACHE]
+        key_hash = hashlib.md5(str(index).encode()).hexdigest()
+        path = os.path.join(cache_dir, f"{checkpoint_name}__{key_hash}.pkl")
+        with open(path, "wb") as entry_file:
+            entry_file.write(template_bytes)
+    with open(cache.manifest_path, "w", encoding="utf-8") as manifest:
+        json.dump(checkpoint_names, manifest)
+    return checkpoint_names
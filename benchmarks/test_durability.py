@@ -0,0 +1,26 @@
+"""
+Benchmarks for storing entries at each durability level.
+"""
+
+import itertools
+
+import pytest
+
+from pickled_pipeline import Cache
+
+PAYLOAD_SIZES = [1024, 1024 * 1024]
+
+
+@pytest.mark.parametrize("durability", ["none", "atomic", "fsync"])
+@pytest.mark.parametrize("size", PAYLOAD_SIZES)
+def test_store_throughput_by_durability(benchmark, tmp_path, durability, size):
+    cache = Cache(cache_dir=tmp_path / "cache", durability=durability)
+    payload = b"x" * size
+    counter = itertools.count()
+
+    @cache.checkpoint(name="produce")
+    def produce(index):
+        return payload
+
+    benchmark.extra_info["payload_bytes"] = size
+    benchmark(lambda: produce(next(counter)))
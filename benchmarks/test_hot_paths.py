@@ -0,0 +1,69 @@
+"""
+Benchmarks for the per-call overhead of a checkpoint hit and for key building.
+"""
+
+import inspect
+import itertools
+from typing import Any
+
+import pytest
+
+from pickled_pipeline import Cache
+from pickled_pipeline.cache import _normalize_arguments
+
+
+@pytest.mark.parametrize("collect_metrics", [True, False])
+def test_hit_overhead_of_trivial_checkpoint(
+    benchmark,
+    tmp_path,
+    collect_metrics,
+):
+    cache = Cache(
+        cache_dir=tmp_path / "cache",
+        collect_metrics=collect_metrics,
+    )
+
+    @cache.checkpoint(name="trivial")
+    def trivial(x):
+        return x
+
+    trivial(1)
+
+    assert benchmark(trivial, 1) == 1
+
+
+def test_miss_overhead_of_trivial_checkpoint(benchmark, cache):
+    counter = itertools.count()
+
+    @cache.checkpoint(name="trivial")
+    def trivial(x):
+        return x
+
+    benchmark(lambda: trivial(next(counter)))
+
+
+ARGUMENTS: dict[str, tuple[tuple[Any, ...], dict[str, Any]]] = {
+    "small": ((1, "text"), {}),
+    "large": (
+        (list(range(100_000)), {f"key{i}": "v" * 32 for i in range(1_000)}),
+        {},
+    ),
+}
+
+
+@pytest.mark.parametrize("canonical_keys", [False, True])
+@pytest.mark.parametrize("size", sorted(ARGUMENTS))
+def test_key_building(benchmark, tmp_path, size, canonical_keys):
+    cache = Cache(cache_dir=tmp_path / "cache", canonical_keys=canonical_keys)
+
+    def step(a, b):
+        return a, b
+
+    signature = inspect.signature(step)
+    args, kwargs = ARGUMENTS[size]
+
+    def build_key():
+        normalized = _normalize_arguments(signature, None, set(), args, kwargs)
+        return cache._cache_path("step", normalized)
+
+    benchmark(build_key)
@@ -0,0 +1,95 @@
+"""
+Benchmarks for truncating and clearing large caches, and for manifest updates
+from several processes sharing one cache directory.
+"""
+
+import multiprocessing
+import time
+
+import pytest
+
+from pickled_pipeline import Cache
+
+from .conftest import populate_cache
+
+ENTRY_COUNTS = [1_000, 10_000, 100_000]
+
+
+@pytest.mark.parametrize("entry_count", ENTRY_COUNTS)
+def test_truncate_cache(benchmark, tmp_path, entry_count):
+    cache_dir = tmp_path / "cache"
+
+    def setup():
+        checkpoint_names = populate_cache(cache_dir, entry_count)
+        # Truncate the later half of the checkpoints.
+        return (Cache(cache_dir=cache_dir), checkpoint_names[5]), {}
+
+    benchmark.pedantic(
+        lambda cache, name: cache.truncate_cache(name),
+        setup=setup,
+        rounds=3,
+        iterations=1,
+    )
+
+
+@pytest.mark.parametrize("entry_count", ENTRY_COUNTS)
+def test_clear_cache(benchmark, tmp_path, entry_count):
+    cache_dir = tmp_path / "cache"
+
+    def setup():
+        populate_cache(cache_dir, entry_count)
+        return (Cache(cache_dir=cache_dir),), {}
+
+    benchmark.pedantic(
+        lambda cache: cache.clear_cache(),
+        setup=setup,
+        rounds=3,
+        iterations=1,
+    )
+
+
+def _record_checkpoints(cache_dir, worker_index, checkpoint_count):
+    cache = Cache(cache_dir=cache_dir)
+    for index in range(checkpoint_count):
+
+        @cache.checkpoint(name=f"worker{worker_index}_step{index}")
+        def step():
+            return index
+
+        step()
+
+
+PROCESS_COUNT = 4
+CHECKPOINTS_PER_PROCESS = 50
+
+
+def test_manifest_contention_across_processes(benchmark, tmp_path):
+    context = multiprocessing.get_context("spawn")
+    rounds = iter(range(1_000))
+    lost_updates = []
+
+    def setup():
+        return (tmp_path / f"cache{next(rounds)}",), {}
+
+    def run(cache_dir):
+        processes = [
+            context.Process(
+                target=_record_checkpoints,
+                args=(cache_dir, worker_index, CHECKPOINTS_PER_PROCESS),
+            )
+            for worker_index in range(PROCESS_COUNT)
+        ]
+        started = time.perf_counter()
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - started
+        recorded = len(Cache(cache_dir=cache_dir).list_checkpoints())
+        lost_updates.append(PROCESS_COUNT * CHECKPOINTS_PER_PROCESS - recorded)
+        return elapsed
+
+    benchmark.pedantic(run, setup=setup, rounds=3, iterations=1)
+    # Last-writer-wins manifest races are a known limitation; record how many
+    # checkpoint names were lost so regressions in either direction show up.
+    benchmark.extra_info["lost_manifest_updates"] = lost_updates
@@ -0,0 +1,44 @@
+"""
+Benchmarks for interpreter startup: importing the package and running the CLI.
+
+Each round starts a fresh interpreter, so the results include its own startup;
+`python -c pass` is measured as the baseline to subtract.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+import pickled_pipeline
+
+STARTUP_CASES = {
+    "bare_interpreter": "pass",
+    "import_package": "import pickled_pipeline",
+    "open_cache": "from pickled_pipeline import Cache\nCache({cache_dir!r})",
+    "cli_list": (
+        "from pickled_pipeline.cli import cli\n"
+        "cli(['list', '--cache-dir', {cache_dir!r}], standalone_mode=False)"
+    ),
+}
+
+
+@pytest.mark.parametrize("case", STARTUP_CASES)
+def test_startup_latency(benchmark, tmp_path, case):
+    code = STARTUP_CASES[case].format(cache_dir=str(tmp_path / "cache"))
+    package_root = os.path.dirname(os.path.dirname(pickled_pipeline.__file__))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [package_root, env.get("PYTHONPATH")])
+    )
+
+    def run():
+        subprocess.run(
+            [sys.executable, "-c", code],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            check=True,
+        )
+
+    benchmark.pedantic(run, rounds=20, warmup_rounds=1)
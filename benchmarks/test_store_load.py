@@ -0,0 +1,47 @@
+"""
+Benchmarks for storing and loading entries across payload sizes and kinds.
+"""
+
+import itertools
+
+import pytest
+
+PAYLOAD_SIZES = [1024, 64 * 1024, 1024 * 1024, 16 * 1024 * 1024]
+
+
+def _payload(kind, size):
+    if kind == "bytes":
+        return b"x" * size
+    if kind == "text":
+        return "x" * size
+    # A list of short strings exercises the general pickle path.
+    return ["x" * 62] * (size // 64)
+
+
+@pytest.mark.parametrize("kind", ["bytes", "text", "objects"])
+@pytest.mark.parametrize("size", PAYLOAD_SIZES)
+def test_store_throughput(benchmark, cache, kind, size):
+    payload = _payload(kind, size)
+    counter = itertools.count()
+
+    @cache.checkpoint(name="produce")
+    def produce(index):
+        return payload
+
+    benchmark.extra_info["payload_bytes"] = size
+    benchmark(lambda: produce(next(counter)))
+
+
+@pytest.mark.parametrize("kind", ["bytes", "text", "objects"])
+@pytest.mark.parametrize("size", PAYLOAD_SIZES)
+def test_load_throughput(benchmark, cache, kind, size):
+    payload = _payload(kind, size)
+
+    @cache.checkpoint(name="produce")
+    def produce():
+        return payload
+
+    produce()
+
+    benchmark.extra_info["payload_bytes"] = size
+    assert benchmark(produce) == payload
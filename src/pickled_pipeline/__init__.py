@@ -1,3 +1,55 @@
-from pickled_pipeline.cache import Cache
+import importlib
+import logging
+from typing import TYPE_CHECKING, Any
 
-__all__ = ["Cache"]
+if TYPE_CHECKING:
+    from pickled_pipeline.adaptive import AdaptivePolicy
+    from pickled_pipeline.cache import Cache, CacheMissError
+    from pickled_pipeline.chunked import ChunkedSequence
+    from pickled_pipeline.metrics import (
+        CheckpointMetrics,
+        CheckpointStats,
+        EntryInfo,
+    )
+    from pickled_pipeline.recovery import RepairReport
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+# Public names are imported from their modules on first access, so importing
+# the package (for example to run the CLI) does not load the whole cache.
+_EXPORTS = {
+    "AdaptivePolicy": "pickled_pipeline.adaptive",
+    "Cache": "pickled_pipeline.cache",
+    "CacheMissError": "pickled_pipeline.cache",
+    "CheckpointMetrics": "pickled_pipeline.metrics",
+    "CheckpointStats": "pickled_pipeline.metrics",
+    "ChunkedSequence": "pickled_pipeline.chunked",
+    "EntryInfo": "pickled_pipeline.metrics",
+    "RepairReport": "pickled_pipeline.recovery",
+}
+
+__all__ = [
+    "AdaptivePolicy",
+    "Cache",
+    "CacheMissError",
+    "CheckpointMetrics",
+    "CheckpointStats",
+    "ChunkedSequence",
+    "EntryInfo",
+    "RepairReport",
+]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}"
+        )
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
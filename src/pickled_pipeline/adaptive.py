@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class AdaptivePolicy:
+    """When a checkpoint should stop using the cache.
+
+    A checkpoint is bypassed once its average load time exceeds its average
+    compute time multiplied by ``margin``, after at least ``min_samples`` loads
+    have been measured. While bypassed, calls run the function directly and
+    neither read nor write cache entries. Every ``reevaluate_every`` bypassed
+    calls, one call goes through the cache again to refresh the measurements.
+    """
+
+    min_samples: int = 3
+    reevaluate_every: int = 100
+    margin: float = 1.0
+    smoothing: float = 0.3
+
+    def __post_init__(self) -> None:
+        if self.min_samples < 1:
+            raise ValueError("min_samples must be at least 1.")
+        if self.reevaluate_every < 1:
+            raise ValueError("reevaluate_every must be at least 1.")
+        if not 0 < self.smoothing <= 1:
+            raise ValueError("smoothing must be in (0, 1].")
+
+
+class AdaptiveState:
+    """Per-checkpoint moving averages behind an :class:`AdaptivePolicy`.
+
+    Updates are not synchronized; a lost update from a concurrent call only
+    nudges the averages and cannot corrupt cache entries.
+    """
+
+    def __init__(self, checkpoint_name: str, policy: AdaptivePolicy):
+        self.checkpoint_name = checkpoint_name
+        self.policy = policy
+        self.compute_seconds: float | None = None
+        self.load_seconds: float | None = None
+        self.load_samples = 0
+        self.bypassing = False
+        self._bypassed_calls = 0
+
+    def should_bypass(self) -> bool:
+        if not self.bypassing:
+            return False
+        self._bypassed_calls += 1
+        if self._bypassed_calls >= self.policy.reevaluate_every:
+            # Let this call probe the cache so the decision is re-evaluated.
+            self._bypassed_calls = 0
+            return False
+        return True
+
+    def observe_compute(self, seconds: float) -> None:
+        self.compute_seconds = self._smooth(self.compute_seconds, seconds)
+        self._decide()
+
+    def observe_load(
+        self,
+        load_seconds: float,
+        compute_seconds: float | None,
+    ) -> None:
+        self.load_seconds = self._smooth(self.load_seconds, load_seconds)
+        self.load_samples += 1
+        if compute_seconds is not None:
+            self.compute_seconds = self._smooth(
+                self.compute_seconds,
+                compute_seconds,
+            )
+        self._decide()
+
+    def _smooth(self, average: float | None, sample: float) -> float:
+        if average is None:
+            return sample
+        return average + self.policy.smoothing * (sample - average)
+
+    def _decide(self) -> None:
+        if (
+            self.load_samples < self.policy.min_samples
+            or self.load_seconds is None
+            or self.compute_seconds is None
+        ):
+            return
+        bypassing = (
+            self.load_seconds > self.compute_seconds * self.policy.margin
+        )
+        if bypassing != self.bypassing:
+            self.bypassing = bypassing
+            self._bypassed_calls = 0
+            if bypassing:
+                logger.info(
+                    "[%s] Loading costs more than recomputing; bypassing "
+                    "the cache.",
+                    self.checkpoint_name,
+                )
+            else:
+                logger.info(
+                    "[%s] Loading is cheaper than recomputing again; using "
+                    "the cache.",
+                    self.checkpoint_name,
+                )
@@ -0,0 +1,83 @@
+"""Append-only logs of list items, stored as cache entries.
+
+A log entry's payload is a sequence of records::
+
+    size  Q   length of the pickle that follows
+    data      pickled list of the items one call appended
+
+The header's ``payload_size`` is the commit point. An append writes its record
+past the committed size and only then rewrites the header, so a reader, or a
+run after a crash mid-append, never sees a partial record.
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+import struct
+from typing import IO, Any
+
+from pickled_pipeline import entry
+
+_SIZE = struct.Struct("<Q")
+
+
+def encode_record(items: list[Any]) -> bytes:
+    data = pickle.dumps(items)
+    return _SIZE.pack(len(data)) + data
+
+
+def read_records(f: IO[bytes], payload_size: int) -> tuple[list[Any], int]:
+    """Replay the committed records of ``f``.
+
+    ``f`` must be positioned at the payload. Returns the items in append order
+    and the number of records they came from.
+    """
+    items: list[Any] = []
+    records = 0
+    remaining = payload_size
+    while remaining:
+        size_data = f.read(_SIZE.size)
+        if len(size_data) != _SIZE.size or remaining < _SIZE.size:
+            raise EOFError("Append log record is truncated.")
+        (size,) = _SIZE.unpack(size_data)
+        remaining -= _SIZE.size
+        data = f.read(size)
+        if len(data) != size or remaining < size:
+            raise EOFError("Append log record is truncated.")
+        remaining -= size
+        record = pickle.loads(data)
+        if not isinstance(record, list):
+            raise EOFError("Append log record is not a list.")
+        items.extend(record)
+        records += 1
+    return items, records
+
+
+def append_record(
+    f: IO[bytes],
+    header: entry.EntryHeader,
+    record: bytes,
+    compute_seconds: float,
+    sync: bool = False,
+) -> entry.EntryHeader:
+    """Append ``record`` after the committed payload, then commit it.
+
+    With ``sync`` the record is on disk before the header names it, and the
+    header is on disk before this returns.
+    """
+    f.seek(entry.HEADER_SIZE + header.payload_size)
+    f.write(record)
+    f.flush()
+    if sync:
+        os.fsync(f.fileno())
+    header = header._replace(
+        compute_seconds=header.compute_seconds + compute_seconds,
+        payload_size=header.payload_size + len(record),
+    )
+    f.seek(0)
+    f.write(entry.pack_header(header))
+    if sync:
+        f.flush()
+        os.fsync(f.fileno())
+    return header
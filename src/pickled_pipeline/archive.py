@@ -0,0 +1,128 @@
+"""Single-file archives of a cache directory.
+
+An archive is an uncompressed zip file holding the manifest, each entry under
+its cache filename, and referenced blobs under ``blobs/``. The zip central
+directory is the index, so a mounted archive serves one entry by seeking to it
+without reading or extracting the others.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import time
+import zipfile
+from collections.abc import Iterable
+from typing import IO
+
+from pickled_pipeline.recovery import temp_prefix
+
+ARCHIVE_MANIFEST_NAME = "cache_manifest.json"
+ARCHIVE_BLOB_PREFIX = "blobs/"
+
+
+def write_archive(
+    archive_path: str,
+    checkpoint_order: list[str],
+    members: Iterable[tuple[str, str]],
+) -> int:
+    """Write ``members`` as ``(arcname, path)`` pairs to ``archive_path``.
+
+    The archive is written to a temporary file and moved into place. Members
+    removed from disk while packing are skipped. Returns the number of members
+    written.
+    """
+    fd, temp_path = tempfile.mkstemp(
+        prefix=temp_prefix(),
+        suffix=".zip",
+        dir=os.path.dirname(os.path.abspath(archive_path)),
+    )
+    os.close(fd)
+    written = 0
+    try:
+        with zipfile.ZipFile(temp_path, "w", zipfile.ZIP_STORED) as archive:
+            archive.writestr(
+                ARCHIVE_MANIFEST_NAME,
+                json.dumps(checkpoint_order),
+            )
+            for arcname, path in members:
+                try:
+                    archive.write(path, arcname)
+                except FileNotFoundError:
+                    continue
+                written += 1
+        os.replace(temp_path, archive_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    return written
+
+
+class CacheArchive:
+    """Read-only random access to the members of a packed cache."""
+
+    def __init__(self, path: str | os.PathLike[str]):
+        self.path = os.fspath(path)
+        self._zip = zipfile.ZipFile(self.path)
+        self.names = frozenset(self._zip.namelist())
+        try:
+            manifest = json.loads(self._zip.read(ARCHIVE_MANIFEST_NAME))
+        except KeyError:
+            manifest = []
+        if not isinstance(manifest, list) or not all(
+            isinstance(item, str) for item in manifest
+        ):
+            self._zip.close()
+            raise ValueError(
+                "Archive manifest must be a JSON list of strings."
+            )
+        self.checkpoint_order: list[str] = manifest
+        self.forgotten_checkpoints: set[str] = set()
+
+    def __enter__(self) -> CacheArchive:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._zip.close()
+
+    def entry_names(self) -> list[str]:
+        return [
+            name
+            for name in self.names
+            # Entries sit at the archive root; anything with a path separator
+            # is a blob or foreign member and must not be extracted as one.
+            if "/" not in name
+            and "\\" not in name
+            and name != ARCHIVE_MANIFEST_NAME
+        ]
+
+    def blob_name(self, digest: str) -> str:
+        return f"{ARCHIVE_BLOB_PREFIX}{digest}.pkl"
+
+    def serves(self, checkpoint_name: str, filename: str) -> bool:
+        return (
+            filename in self.names
+            and checkpoint_name not in self.forgotten_checkpoints
+        )
+
+    def open(self, name: str) -> IO[bytes]:
+        try:
+            return self._zip.open(name)
+        except KeyError:
+            raise FileNotFoundError(
+                f"'{name}' is not in archive '{self.path}'."
+            ) from None
+
+    def size(self, name: str) -> int:
+        return self._zip.getinfo(name).file_size
+
+    def modified_time(self, name: str) -> float:
+        date_time = self._zip.getinfo(name).date_time
+        return time.mktime(date_time + (0, 0, -1))
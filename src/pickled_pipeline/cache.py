@@ -3,17 +3,128 @@ from __future__ import annotations
 import json
 import hashlib
 import inspect
+import io
+import logging
 import os
 import pickle
+import shutil
+import struct
+import sys
 import tempfile
-from collections.abc import Callable, Iterable
-from functools import wraps
-from typing import Any, ParamSpec, TypeVar, cast
+import threading
+import time
+import types
+import weakref
+from collections.abc import Awaitable, Callable, Iterable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass, field
+from functools import update_wrapper, wraps
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    BinaryIO,
+    Literal,
+    ParamSpec,
+    TypeVar,
+    cast,
+)
 
+from pickled_pipeline import append_log, entry, hooks
+from pickled_pipeline.adaptive import AdaptivePolicy, AdaptiveState
+from pickled_pipeline.chunked import ChunkedSequence, unchunk, write_chunks
+from pickled_pipeline.hot_tier import HotTier, arena_path, reap_arenas
+from pickled_pipeline.keys import canonical_key
+from pickled_pipeline.metrics import (
+    CheckpointMetrics,
+    CheckpointStats,
+    EntryInfo,
+)
+from pickled_pipeline.prefetch import Prefetcher, read_trace, write_trace
+from pickled_pipeline.recovery import (
+    DEFAULT_TEMP_MAX_AGE,
+    TEMP_PREFIX,
+    RepairReport,
+    is_orphaned_temp,
+    temp_prefix,
+)
+from pickled_pipeline.throttle import Throttle
+
+# asyncio, concurrent.futures, and the archive module (which imports
+# zipfile) are slow to import and serve optional features, so the code using
+# them imports them on first use.
+if TYPE_CHECKING:
+    import asyncio
+
+    from pickled_pipeline.archive import CacheArchive
 
 P = ParamSpec("P")
 R = TypeVar("R")
+T = TypeVar("T")
 CACHE_MANIFEST_FILENAME = "cache_manifest.json"
+BLOB_DIRNAME = "blobs"
+
+logger = logging.getLogger(__name__)
+
+_NO_THROTTLE = nullcontext()
+
+# Outcomes of looking up a call's entry.
+_MISS = "miss"
+_HIT = "hit"
+_STALE = "stale"
+
+# Inode, size, and modification time of an entry file, stored ahead of its
+# bytes in the hot tier so bytes of a since-rewritten file are never served.
+_IDENTITY = struct.Struct("<QQQ")
+
+_LoadedEntry = tuple[Any, int, entry.EntryHeader | None, bool]
+_ScannedEntry = tuple[str, str, os.stat_result, entry.EntryHeader | None]
+
+ProgressCallback = Callable[[int, int], None]
+"""Called as ``progress(removed, total)`` while files are being removed."""
+
+Durability = Literal["none", "atomic", "fsync"]
+"""How entry writes survive interruption; see ``Cache(durability=...)``."""
+
+DEFAULT_DELETE_JOBS = 8
+# Files removed per thread-pool task; large enough to amortize task overhead,
+# small enough to keep progress reports frequent.
+_DELETE_BATCH_SIZE = 256
+
+# Hits are written to entry headers in batches, at least this often while
+# they keep coming, so hits stay read-only on disk.
+_USAGE_FLUSH_SECONDS = 5.0
+
+
+class CacheMissError(LookupError):
+    """A read-only cache configured with ``on_miss="raise"`` has no entry."""
+
+    def __init__(self, checkpoint_name: str, cache_dir: str):
+        super().__init__(
+            f"[{checkpoint_name}] No cached result in read-only cache "
+            f"'{cache_dir}'."
+        )
+        self.checkpoint_name = checkpoint_name
+        self.cache_dir = cache_dir
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return type(self), (self.checkpoint_name, self.cache_dir)
+
+
+def _fsync_directory(path: str) -> None:
+    # Persists a rename. Windows cannot open directories, and NTFS journals
+    # renames itself.
+    if os.name == "nt":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _identity(stat: os.stat_result) -> bytes:
+    return _IDENTITY.pack(stat.st_ino, stat.st_size, stat.st_mtime_ns)
 
 
 def _default_checkpoint_name(func: Callable[..., Any]) -> str:
@@ -21,168 +132,2112 @@ def _default_checkpoint_name(func: Callable[..., Any]) -> str:
     return qualified_name.replace("<", "").replace(">", "")
 
 
+def _key_version(
+    func: Callable[..., Any],
+    version: str | int | None,
+    code_version: bool,
+) -> tuple[Any, ...] | None:
+    """Build the optional version component of a checkpoint's keys.
+
+    ``None`` leaves keys exactly as they were before versions existed, so
+    existing entries keep hitting until a version is opted into.
+    """
+    if version is None and not code_version:
+        return None
+    return (
+        version,
+        _code_fingerprint(inspect.unwrap(func)) if code_version else None,
+    )
+
+
+def _code_fingerprint(func: Callable[..., Any]) -> str:
+    """Hash a function's bytecode, constants, and referenced names.
+
+    Line numbers and file paths are not included, so moving a function or
+    editing unrelated code leaves the fingerprint alone. The bytecode format
+    differs between Python versions, so upgrading Python changes it too.
+    """
+    digest = hashlib.sha256()
+    code = getattr(func, "__code__", None)
+    if code is None:
+        raise TypeError(
+            f"code_version requires a Python function, got {func!r}."
+        )
+    _hash_code(code, digest)
+    return digest.hexdigest()
+
+
+def _hash_code(code: types.CodeType, digest: Any) -> None:
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        _hash_constant(const, digest)
+
+
+def _hash_constant(const: Any, digest: Any) -> None:
+    if isinstance(const, types.CodeType):
+        digest.update(b"code(")
+        _hash_code(const, digest)
+        digest.update(b")")
+    elif isinstance(const, tuple):
+        digest.update(b"tuple(")
+        for item in const:
+            _hash_constant(item, digest)
+        digest.update(b")")
+    elif isinstance(const, frozenset):
+        # Set iteration order depends on string hash randomization.
+        digest.update(repr(sorted(repr(item) for item in const)).encode())
+    else:
+        digest.update(repr(const).encode())
+
+
+def _varkw_name(signature: inspect.Signature) -> str | None:
+    for param_name, param in signature.parameters.items():
+        if param.kind == param.VAR_KEYWORD:
+            return param_name
+    return None
+
+
+def _normalize_arguments(
+    signature: inspect.Signature,
+    varkw_name: str | None,
+    excluded_arg_names: set[str],
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> tuple[tuple[str, Any], ...]:
+    # Map arguments to their names, including varargs and keyword-only args.
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    bound_args = bound.arguments
+
+    normalized_items: list[tuple[str, Any]] = []
+    normalized_varkw: tuple[tuple[str, Any], ...] | None = None
+    if varkw_name and varkw_name in bound_args:
+        varkw = dict(bound_args[varkw_name])
+        for arg in excluded_arg_names:
+            varkw.pop(arg, None)
+        normalized_varkw = tuple(sorted(varkw.items()))
+
+    for arg_name, value in bound_args.items():
+        if arg_name in excluded_arg_names:
+            continue
+        if arg_name == varkw_name:
+            value = normalized_varkw
+        normalized_items.append((arg_name, value))
+    return tuple(normalized_items)
+
+
+@dataclass
+class _CheckpointState:
+    """Per-decoration settings and runtime state shared by every call."""
+
+    name: str
+    metrics: CheckpointMetrics | None
+    signature: inspect.Signature
+    varkw_name: str | None = None
+    excluded_arg_names: set[str] = field(default_factory=set)
+    adaptive: AdaptiveState | None = None
+    throttle: Throttle | None = None
+    ttl: float | None = None
+    stale_while_revalidate: bool = False
+    cache_exceptions: tuple[type[BaseException], ...] = ()
+    exception_ttl: float | None = None
+    key_version: tuple[Any, ...] | None = None
+    chunk_size: int | None = None
+
+
+class _UsageBuffer:
+    """Hit counts and load times not yet added to entry headers."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pending: dict[str, tuple[float, int, float]] = {}
+        self._flushed_at = time.monotonic()
+
+    def add(
+        self,
+        cache_path: str,
+        created: float,
+        load_seconds: float,
+    ) -> None:
+        with self._lock:
+            pending = self._pending.get(cache_path)
+            if pending is None or pending[0] != created:
+                self._pending[cache_path] = (created, 1, load_seconds)
+            else:
+                self._pending[cache_path] = (
+                    created,
+                    pending[1] + 1,
+                    pending[2] + load_seconds,
+                )
+            due = time.monotonic() - self._flushed_at >= _USAGE_FLUSH_SECONDS
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._flushed_at = time.monotonic()
+        for cache_path, (created, hits, load_seconds) in pending.items():
+            try:
+                entry.add_usage(cache_path, created, hits, load_seconds)
+            except OSError as error:
+                # Removed entries and read-only file systems just lose the
+                # counts; they are statistics.
+                logger.debug(
+                    "Could not record hits for '%s': %s",
+                    cache_path,
+                    error,
+                )
+
+    def reset_after_fork(self) -> None:
+        # The parent still records its own pending hits.
+        self._lock = threading.Lock()
+        self._pending = {}
+
+
+class _CheckpointFunction:
+    """A decorated function that pickles as a handle to its checkpoint.
+
+    Calls go straight to the wrapper built by the decorator. A function that
+    can be imported by name pickles by reference like any other; otherwise
+    it pickles as its cache, the decorator and options that created it, and
+    the undecorated function, and :func:`_reconnect_checkpoint` rebuilds it
+    in the receiving process.
+    """
+
+    __qualname__: str
+    __wrapped__: Callable[..., Any]
+
+    def __init__(
+        self,
+        call: Callable[..., Any],
+        func: Callable[..., Any],
+        cache: Cache,
+        decorator: str,
+        options: dict[str, Any],
+    ):
+        update_wrapper(self, func)
+        self._call = call
+        self._cache = cache
+        self._decorator = decorator
+        self._options = options
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self._call(*args, **kwargs)
+
+    def __get__(self, instance: object, owner: type | None = None) -> Any:
+        if instance is None:
+            return self
+        return types.MethodType(self, instance)
+
+    def __repr__(self) -> str:
+        return f"<checkpointed function {self.__qualname__}>"
+
+    def __reduce__(self) -> str | tuple[Any, ...]:
+        if _is_importable(self):
+            return self.__qualname__
+        return _reconnect_checkpoint, (
+            self._cache,
+            self._decorator,
+            self._options,
+            self.__wrapped__,
+        )
+
+
+def _is_importable(obj: Any) -> bool:
+    target = sys.modules.get(obj.__module__)
+    for part in obj.__qualname__.split("."):
+        target = getattr(target, part, None)
+    return target is obj
+
+
+def _reconnect_checkpoint(
+    cache: Cache,
+    decorator: str,
+    options: dict[str, Any],
+    func: Callable[..., Any],
+) -> Callable[..., Any]:
+    # A forked worker, or one that imported the decorating module, already
+    # has the wrapper; reuse it rather than decorating a second time.
+    checkpoint_name = options["name"] or _default_checkpoint_name(func)
+    existing = cache._functions.get(checkpoint_name)
+    if existing is not None and existing.__wrapped__ is func:
+        return existing
+    decorate = getattr(cache, decorator)(**options)
+    return cast(Callable[..., Any], decorate(func))
+
+
+# Every Cache in this process, so unpickled handles can reuse an open cache
+# and forked children can reset the state they inherit.
+_open_caches: weakref.WeakSet[Cache] = weakref.WeakSet()
+# Caches opened by unpickling stay open for later tasks in the same worker.
+_reconnected_caches: list[Cache] = []
+
+
+def _reconnect_cache(cache_dir: str, options: dict[str, Any]) -> Cache:
+    for cache in list(_open_caches):
+        if (
+            cache._options == options
+            and os.path.abspath(cache.cache_dir) == cache_dir
+        ):
+            return cache
+    cache = Cache(cache_dir, **options)
+    _reconnected_caches.append(cache)
+    return cache
+
+
+def _reset_caches_after_fork() -> None:
+    for cache in list(_open_caches):
+        cache._reset_after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_caches_after_fork)
+
+
 class Cache:
-    def __init__(self, cache_dir: str | os.PathLike[str] = "pipeline_cache"):
+    def __init__(
+        self,
+        cache_dir: str | os.PathLike[str] = "pipeline_cache",
+        collect_metrics: bool = True,
+        deduplicate: bool = False,
+        read_only: bool = False,
+        on_miss: Literal["compute", "raise"] = "compute",
+        prefetch: bool = False,
+        prefetch_depth: int = 8,
+        hot_tier_size: int | None = None,
+        durability: Durability = "atomic",
+        repair_on_open: bool = False,
+        canonical_keys: bool = False,
+    ):
+        if on_miss not in ("compute", "raise"):
+            raise ValueError("on_miss must be 'compute' or 'raise'.")
+        if durability not in ("none", "atomic", "fsync"):
+            raise ValueError(
+                "durability must be 'none', 'atomic', or 'fsync'."
+            )
+        if prefetch_depth < 1:
+            raise ValueError("prefetch_depth must be at least 1.")
         self.cache_dir = os.fspath(cache_dir)
-        os.makedirs(self.cache_dir, exist_ok=True)
+        self.collect_metrics = collect_metrics
+        self.deduplicate = deduplicate
+        self.read_only = read_only
+        self.on_miss = on_miss
+        self.prefetch = prefetch
+        self.prefetch_depth = prefetch_depth
+        self.durability = durability
+        self.canonical_keys = canonical_keys
+        # What a worker needs to reopen this cache. Prefetching and repair
+        # stay with the process that opened it.
+        self._options: dict[str, Any] = {
+            "collect_metrics": collect_metrics,
+            "deduplicate": deduplicate,
+            "read_only": read_only,
+            "on_miss": on_miss,
+            "hot_tier_size": hot_tier_size,
+            "durability": durability,
+            "canonical_keys": canonical_keys,
+        }
+        self._checkpoints: dict[str, _CheckpointState] = {}
+        self._functions: dict[str, _CheckpointFunction] = {}
+        self._metrics: dict[str, CheckpointMetrics] = {}
+        self._hooks: list[hooks.PhaseHook] = []
+        self._archives: list[CacheArchive] = []
+        self._revalidating: set[str] = set()
+        self._revalidation_threads: set[threading.Thread] = set()
+        self._revalidation_tasks: set[asyncio.Task[None]] = set()
+        self._revalidation_lock = threading.Lock()
+        self._append_locks: dict[str, threading.Lock] = {}
+        self._append_locks_lock = threading.Lock()
+        if not read_only:
+            os.makedirs(self.cache_dir, exist_ok=True)
         self.manifest_path = os.path.join(
             self.cache_dir,
             CACHE_MANIFEST_FILENAME,
         )
-        self.checkpoint_order = self._load_manifest()
+        self.blob_dir = os.path.join(self.cache_dir, BLOB_DIRNAME)
+        self._checkpoint_order: list[str] | None = None
+        # Read-only caches snapshot the entry paths once so lookups never
+        # touch the file system.
+        self._index = self._build_index() if read_only else None
+        self._usage: _UsageBuffer | None = None
+        if not read_only:
+            self._usage = _UsageBuffer()
+            weakref.finalize(self, self._usage.flush)
+        self._hot_tier: HotTier | None = None
+        if hot_tier_size is not None:
+            self._hot_tier = HotTier(arena_path(self.cache_dir), hot_tier_size)
+            # Unmaps the arena, and removes it once no process holds it.
+            self._close_hot_tier = weakref.finalize(
+                self,
+                self._hot_tier.close,
+            )
+        self._access_trace: list[str] = []
+        self._traced: set[str] = set()
+        self._prefetch_plan: list[str] = []
+        self._prefetcher: Prefetcher[_LoadedEntry] | None = None
+        self._prefetch_lock = threading.Lock()
+        if repair_on_open:
+            self.repair()
+        if prefetch:
+            self._prefetch_plan = self._plan_prefetch()
+            if not read_only:
+                weakref.finalize(
+                    self,
+                    write_trace,
+                    self.cache_dir,
+                    self._access_trace,
+                )
+        _open_caches.add(self)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Pickles as a handle: unpickling reuses a cache with the same
+        # directory and options already open in the process, or opens one.
+        return _reconnect_cache, (
+            os.path.abspath(self.cache_dir),
+            self._options,
+        )
 
     def checkpoint(
         self,
         name: str | None = None,
         exclude_args: Iterable[str] | None = None,
+        adaptive: bool | AdaptivePolicy = False,
+        max_concurrency: int | None = None,
+        rate: float | None = None,
+        ttl: float | None = None,
+        stale_while_revalidate: bool = False,
+        cache_exceptions: Iterable[type[BaseException]] = (),
+        exception_ttl: float | None = None,
+        version: str | int | None = None,
+        code_version: bool = False,
+        chunk_size: int | None = None,
     ) -> Callable[[Callable[P, R]], Callable[P, R]]:
+        if stale_while_revalidate and ttl is None:
+            raise ValueError("stale_while_revalidate requires a ttl.")
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1.")
+        cached_exception_types = tuple(cache_exceptions)
         if exclude_args is None:
             exclude_args = []
         excluded_arg_names = set(exclude_args)
+        options = {
+            "name": name,
+            "exclude_args": sorted(excluded_arg_names),
+            "adaptive": adaptive,
+            "max_concurrency": max_concurrency,
+            "rate": rate,
+            "ttl": ttl,
+            "stale_while_revalidate": stale_while_revalidate,
+            "cache_exceptions": cached_exception_types,
+            "exception_ttl": exception_ttl,
+            "version": version,
+            "code_version": code_version,
+            "chunk_size": chunk_size,
+        }
+        if adaptive is True:
+            adaptive = AdaptivePolicy()
+        throttle = (
+            Throttle(max_concurrency, rate)
+            if max_concurrency is not None or rate is not None
+            else None
+        )
 
         def decorator(func: Callable[P, R]) -> Callable[P, R]:
             checkpoint_name = name or _default_checkpoint_name(func)
             signature = inspect.signature(func)
-            varkw_name: str | None = None
-            for param_name, param in signature.parameters.items():
-                if param.kind == param.VAR_KEYWORD:
-                    varkw_name = param_name
-                    break
+            checkpoint_state = _CheckpointState(
+                name=checkpoint_name,
+                metrics=self._metrics_for(checkpoint_name),
+                signature=signature,
+                varkw_name=_varkw_name(signature),
+                excluded_arg_names=excluded_arg_names,
+                adaptive=(
+                    AdaptiveState(checkpoint_name, adaptive)
+                    if isinstance(adaptive, AdaptivePolicy)
+                    else None
+                ),
+                throttle=throttle,
+                ttl=ttl,
+                stale_while_revalidate=stale_while_revalidate,
+                cache_exceptions=cached_exception_types,
+                # Failures expire no later than results.
+                exception_ttl=ttl if exception_ttl is None else exception_ttl,
+                key_version=_key_version(func, version, code_version),
+                chunk_size=chunk_size,
+            )
+            self._checkpoints[checkpoint_name] = checkpoint_state
 
-            @wraps(func)
-            def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
-                # Map arguments to their names, including varargs and
-                # keyword-only args.
-                bound = signature.bind(*args, **kwargs)
-                bound.apply_defaults()
-                bound_args = bound.arguments
-
-                normalized_items: list[tuple[str, Any]] = []
-                normalized_varkw: tuple[tuple[str, Any], ...] | None = None
-                if varkw_name and varkw_name in bound_args:
-                    varkw = dict(bound_args[varkw_name])
-                    for arg in excluded_arg_names:
-                        varkw.pop(arg, None)
-                    normalized_varkw = tuple(sorted(varkw.items()))
-
-                for arg_name, value in bound_args.items():
-                    if arg_name in excluded_arg_names:
-                        continue
-                    if arg_name == varkw_name:
-                        value = normalized_varkw
-                    normalized_items.append((arg_name, value))
-
-                # Create a unique key based on the checkpoint name and filtered
-                # arguments.
-                key_input = (checkpoint_name, tuple(normalized_items))
-                key_payload = pickle.dumps(key_input)
-                key_hash = hashlib.md5(key_payload).hexdigest()
-                cache_filename = f"{checkpoint_name}__{key_hash}.pkl"
-                cache_path = os.path.join(self.cache_dir, cache_filename)
-
-                if os.path.exists(cache_path):
-                    try:
-                        with open(cache_path, "rb") as f:
-                            result = pickle.load(f)
-                    except (EOFError, pickle.UnpicklingError):
-                        os.remove(cache_path)
-                        result = self._compute_and_store(
+            if inspect.iscoroutinefunction(func):
+
+                @wraps(func)
+                async def async_wrapper(
+                    *args: P.args,
+                    **kwargs: P.kwargs,
+                ) -> Any:
+                    adaptive_state = checkpoint_state.adaptive
+                    if (
+                        adaptive_state is not None
+                        and adaptive_state.should_bypass()
+                    ):
+                        return await self._compute_async(
                             func,
                             args,
                             kwargs,
-                            checkpoint_name,
+                            checkpoint_state,
+                            None,
+                        )
+
+                    cache_path, outcome, result = self._lookup(
+                        checkpoint_state,
+                        args,
+                        kwargs,
+                    )
+                    if outcome == _MISS:
+                        result = await self._compute_async(
+                            func,
+                            args,
+                            kwargs,
+                            checkpoint_state,
                             cache_path,
                         )
-                    else:
-                        print(f"[{checkpoint_name}] Loaded result from cache.")
-                else:
-                    result = self._compute_and_store(
+                    elif outcome == _STALE:
+                        self._revalidate_async(
+                            func,
+                            args,
+                            kwargs,
+                            checkpoint_state,
+                            cache_path,
+                        )
+                    self._record_checkpoint(checkpoint_name)
+                    return result
+
+                return cast(Callable[P, R], async_wrapper)
+
+            @wraps(func)
+            def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+                adaptive_state = checkpoint_state.adaptive
+                if (
+                    adaptive_state is not None
+                    and adaptive_state.should_bypass()
+                ):
+                    return self._compute(
                         func,
                         args,
                         kwargs,
-                        checkpoint_name,
-                        cache_path,
+                        checkpoint_state,
+                        None,
                     )
 
+                cache_path, outcome, result = self._lookup(
+                    checkpoint_state,
+                    args,
+                    kwargs,
+                )
+                if outcome == _MISS:
+                    result = self._compute(
+                        func,
+                        args,
+                        kwargs,
+                        checkpoint_state,
+                        cache_path,
+                    )
+                elif outcome == _STALE:
+                    self._revalidate(
+                        func,
+                        args,
+                        kwargs,
+                        checkpoint_state,
+                        cache_path,
+                    )
                 self._record_checkpoint(checkpoint_name)
                 return cast(R, result)
 
-            return wrapper
+            return self._checkpoint_function(
+                wrapper,
+                func,
+                "checkpoint",
+                options,
+                checkpoint_name,
+            )
+
+        return decorator
+
+    def batch_checkpoint(
+        self,
+        name: str | None = None,
+        exclude_args: Iterable[str] | None = None,
+        items_arg: str | None = None,
+        max_batch_size: int | None = None,
+        version: str | int | None = None,
+        code_version: bool = False,
+    ) -> Callable[[Callable[P, list[T]]], Callable[P, list[T]]]:
+        """Cache a list-in, list-out function one element at a time.
+
+        The decorated function receives a list of items in ``items_arg`` (the
+        first parameter by default) and must return a list of results in the
+        same order. Each item is cached under its own key, built from the item
+        and the remaining non-excluded arguments. On a call, cached items are
+        filled from the cache and only the missing items are passed to the
+        function, in batches of at most ``max_batch_size`` items.
+        """
+        if max_batch_size is not None and max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1.")
+        excluded_arg_names = set(exclude_args or [])
+        options = {
+            "name": name,
+            "exclude_args": sorted(excluded_arg_names),
+            "items_arg": items_arg,
+            "max_batch_size": max_batch_size,
+            "version": version,
+            "code_version": code_version,
+        }
+
+        def decorator(func: Callable[P, list[T]]) -> Callable[P, list[T]]:
+            checkpoint_name = name or _default_checkpoint_name(func)
+            signature = inspect.signature(func)
+            varkw_name = _varkw_name(signature)
+            checkpoint_state = _CheckpointState(
+                name=checkpoint_name,
+                metrics=self._metrics_for(checkpoint_name),
+                signature=signature,
+                varkw_name=varkw_name,
+                key_version=_key_version(func, version, code_version),
+            )
+            self._checkpoints[checkpoint_name] = checkpoint_state
+            batch_arg = items_arg or next(iter(signature.parameters), "")
+            if batch_arg not in signature.parameters:
+                raise ValueError(
+                    f"{func.__qualname__} has no parameter named "
+                    f"'{batch_arg}' to batch over."
+                )
+            key_excluded_names = excluded_arg_names | {batch_arg}
+
+            @wraps(func)
+            def wrapper(*args: P.args, **kwargs: P.kwargs) -> list[T]:
+                with self._phase(hooks.BIND, checkpoint_name):
+                    bound = signature.bind(*args, **kwargs)
+                    bound.apply_defaults()
+                    items = list(bound.arguments[batch_arg])
+                    shared_items = _normalize_arguments(
+                        signature,
+                        varkw_name,
+                        key_excluded_names,
+                        args,
+                        kwargs,
+                    )
+
+                with self._phase(hooks.KEY, checkpoint_name):
+                    cache_paths = [
+                        self._cache_path(
+                            checkpoint_name,
+                            shared_items + ((batch_arg, item),),
+                            checkpoint_state.key_version,
+                        )
+                        for item in items
+                    ]
+
+                results: dict[str, Any] = {}
+                missing: dict[str, Any] = {}
+                for item, cache_path in zip(items, cache_paths):
+                    if cache_path in results or cache_path in missing:
+                        continue
+                    found, result = self._try_load_entry(
+                        cache_path,
+                        checkpoint_state,
+                    )
+                    if found:
+                        results[cache_path] = result
+                    else:
+                        missing[cache_path] = item
+
+                missing_paths = list(missing)
+                if missing_paths:
+                    self._check_miss_allowed(checkpoint_state)
+                batch_size = max_batch_size or len(missing_paths) or 1
+                for start in range(0, len(missing_paths), batch_size):
+                    batch_paths = missing_paths[start : start + batch_size]
+                    bound.arguments[batch_arg] = [
+                        missing[cache_path] for cache_path in batch_paths
+                    ]
+                    results.update(
+                        self._compute_and_store_batch(
+                            func,
+                            bound.args,
+                            bound.kwargs,
+                            checkpoint_state,
+                            batch_paths,
+                        )
+                    )
+
+                self._record_checkpoint(checkpoint_name)
+                return [results[cache_path] for cache_path in cache_paths]
+
+            return self._checkpoint_function(
+                wrapper,
+                func,
+                "batch_checkpoint",
+                options,
+                checkpoint_name,
+            )
+
+        return decorator
+
+    def append_checkpoint(
+        self,
+        name: str | None = None,
+        exclude_args: Iterable[str] | None = None,
+        compact_after: int = 64,
+    ) -> Callable[[Callable[..., Iterable[T]]], Callable[..., list[T]]]:
+        """Cache a list that grows by appending on every call.
+
+        The decorated function receives the items accumulated so far as its
+        first argument and returns the items to append; it must not modify
+        the list it receives. The remaining, non-excluded arguments form the
+        key. Each call replays the stored log, appends one record holding the
+        new items, and returns the whole list. A log that already holds
+        ``compact_after`` records is rewritten as a single record instead.
+        """
+        if compact_after < 1:
+            raise ValueError("compact_after must be at least 1.")
+        excluded_arg_names = set(exclude_args or [])
+        options = {
+            "name": name,
+            "exclude_args": sorted(excluded_arg_names),
+            "compact_after": compact_after,
+        }
+
+        def decorator(
+            func: Callable[..., Iterable[T]],
+        ) -> Callable[..., list[T]]:
+            checkpoint_name = name or _default_checkpoint_name(func)
+            signature = inspect.signature(func)
+            parameters = list(signature.parameters.values())
+            if not parameters:
+                raise ValueError(
+                    f"{func.__qualname__} must accept the accumulated items "
+                    "as its first parameter."
+                )
+            # The caller never passes the accumulated items, so the key is
+            # built from the signature without them.
+            key_signature = signature.replace(parameters=parameters[1:])
+            checkpoint_state = _CheckpointState(
+                name=checkpoint_name,
+                metrics=self._metrics_for(checkpoint_name),
+                signature=key_signature,
+                varkw_name=_varkw_name(key_signature),
+                excluded_arg_names=excluded_arg_names,
+            )
+            self._checkpoints[checkpoint_name] = checkpoint_state
+
+            @wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> list[T]:
+                with self._phase(hooks.BIND, checkpoint_name):
+                    normalized_items = _normalize_arguments(
+                        key_signature,
+                        checkpoint_state.varkw_name,
+                        excluded_arg_names,
+                        args,
+                        kwargs,
+                    )
+                with self._phase(hooks.KEY, checkpoint_name):
+                    cache_path = self._cache_path(
+                        checkpoint_name,
+                        normalized_items,
+                    )
+                with self._append_lock(cache_path):
+                    items = self._append(
+                        func,
+                        args,
+                        kwargs,
+                        checkpoint_state,
+                        cache_path,
+                        compact_after,
+                    )
+                self._record_checkpoint(checkpoint_name)
+                return items
+
+            return self._checkpoint_function(
+                wrapper,
+                func,
+                "append_checkpoint",
+                options,
+                checkpoint_name,
+            )
 
         return decorator
 
-    def truncate_cache(self, starting_from_checkpoint_name: str) -> bool:
+    def truncate_cache(
+        self,
+        starting_from_checkpoint_name: str,
+        jobs: int = DEFAULT_DELETE_JOBS,
+        progress: ProgressCallback | None = None,
+    ) -> bool:
+        """Remove a checkpoint's entries and every later checkpoint's entries.
+
+        Files are found in one directory scan and removed on up to ``jobs``
+        threads. ``progress(removed, total)`` is called from the calling
+        thread as removal advances.
+        """
+        self._check_writable()
         if not os.path.exists(self.manifest_path):
-            print("No manifest file found. Cannot determine checkpoint order.")
+            logger.warning(
+                "No manifest file found. Cannot determine checkpoint order."
+            )
             return False
         checkpoint_order = self._load_manifest()
         if starting_from_checkpoint_name not in checkpoint_order:
-            message = (
-                f"Checkpoint '{starting_from_checkpoint_name}' not found in "
-                "manifest."
+            logger.warning(
+                "Checkpoint '%s' not found in manifest.",
+                starting_from_checkpoint_name,
             )
-            print(message)
             return False
-        delete_flag = False
-        for checkpoint_name in checkpoint_order:
-            if checkpoint_name == starting_from_checkpoint_name:
-                delete_flag = True
-            if delete_flag:
-                # Delete all cache files associated with this checkpoint
-                files_to_delete = [
-                    fname
-                    for fname in os.listdir(self.cache_dir)
-                    if self._filename_belongs_to_checkpoint(
-                        fname,
-                        checkpoint_name,
-                    )
-                ]
-                for filename in files_to_delete:
-                    file_path = os.path.join(self.cache_dir, filename)
-                    os.remove(file_path)
-                    print(f"Removed cache file '{filename}'")
-        # Update the manifest by removing truncated checkpoints
         index = checkpoint_order.index(starting_from_checkpoint_name)
+        truncated = set(checkpoint_order[index:])
+        with os.scandir(self.cache_dir) as entries:
+            file_paths = [
+                dir_entry.path
+                for dir_entry in entries
+                if self._checkpoint_name_from_filename(dir_entry.name)
+                in truncated
+            ]
+        self._remove_files(file_paths, jobs, progress)
+        # Update the manifest by removing truncated checkpoints
+        self._stop_prefetch()
+        if self._hot_tier is not None:
+            self._hot_tier.clear()
+        for archive in self._archives:
+            archive.forgotten_checkpoints.update(truncated)
         checkpoint_order = checkpoint_order[:index]
         self._write_manifest(checkpoint_order)
         self.checkpoint_order = checkpoint_order
-        print(
-            f"Cache truncated from checkpoint "
-            f"'{starting_from_checkpoint_name}' onward."
+        self._sweep_blobs()
+        logger.info(
+            "Cache truncated from checkpoint '%s' onward.",
+            starting_from_checkpoint_name,
         )
         return True
 
-    def clear_cache(self) -> None:
-        # Remove all files except the manifest
-        for filename in os.listdir(self.cache_dir):
-            if filename == CACHE_MANIFEST_FILENAME:
-                continue
-            file_path = os.path.join(self.cache_dir, filename)
-            if os.path.isfile(file_path):
-                os.remove(file_path)
+    def clear_cache(
+        self,
+        jobs: int = DEFAULT_DELETE_JOBS,
+        progress: ProgressCallback | None = None,
+    ) -> None:
+        """Remove every file in the cache directory except the manifest.
+
+        ``jobs`` and ``progress`` behave as in :meth:`truncate_cache`.
+        """
+        self._check_writable()
+        with os.scandir(self.cache_dir) as entries:
+            file_paths = [
+                dir_entry.path
+                for dir_entry in entries
+                if dir_entry.name != CACHE_MANIFEST_FILENAME
+                and dir_entry.is_file()
+            ]
+        self._remove_files(file_paths, jobs, progress)
+        self._sweep_blobs()
+        self._stop_prefetch()
+        if self._hot_tier is not None:
+            self._hot_tier.remove()
+        for archive in self._archives:
+            archive.forgotten_checkpoints.update(archive.checkpoint_order)
         # Clear the manifest
         self.checkpoint_order = []
         self._write_manifest(self.checkpoint_order)
-        print("Cache directory cleared.")
+        logger.info("Cache directory cleared.")
+
+    def close(self) -> None:
+        """Record pending hits, and release the hot tier, prefetcher, and
+        mounted archives.
+
+        The cache keeps working afterwards, without them. Closing also happens
+        when the cache is garbage collected or the interpreter exits.
+        """
+        if self._usage is not None:
+            self._usage.flush()
+        self._stop_prefetch()
+        if self._hot_tier is not None:
+            self._hot_tier = None
+            self._close_hot_tier()
+        for archive in self._archives:
+            archive.close()
+        self._archives = []
+
+    def __enter__(self) -> Cache:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @property
+    def checkpoint_order(self) -> list[str]:
+        # Loaded on first use; many caches never need the manifest.
+        if self._checkpoint_order is None:
+            self._checkpoint_order = self._load_manifest()
+        return self._checkpoint_order
+
+    @checkpoint_order.setter
+    def checkpoint_order(self, checkpoint_order: list[str]) -> None:
+        self._checkpoint_order = checkpoint_order
 
     def list_checkpoints(self) -> list[str]:
-        # Return a copy of the checkpoint order
+        # Reload, since worker processes may have recorded checkpoints.
+        self.checkpoint_order = self._load_manifest()
         return list(self.checkpoint_order)
 
-    def _compute_and_store(
+    def pack(
+        self,
+        archive_path: str | os.PathLike[str],
+        checkpoints: Iterable[str] | None = None,
+    ) -> int:
+        """Bundle the manifest, entries, and their blobs into one archive.
+
+        ``checkpoints`` limits the archive to those checkpoints, kept in cache
+        order. Returns the number of entries packed.
+        """
+        from pickled_pipeline.archive import ARCHIVE_BLOB_PREFIX, write_archive
+
+        checkpoint_order = self._select_checkpoints(
+            self._load_manifest(),
+            checkpoints,
+        )
+        selected = set(checkpoint_order)
+        entry_members = []
+        digests = set()
+        with os.scandir(self.cache_dir) as entries:
+            for dir_entry in entries:
+                checkpoint_name = self._checkpoint_name_from_filename(
+                    dir_entry.name
+                )
+                if checkpoint_name not in selected:
+                    continue
+                entry_members.append((dir_entry.name, dir_entry.path))
+                digest = self._blob_digest(dir_entry.path)
+                if digest is not None:
+                    digests.add(digest)
+        blob_members = [
+            (f"{ARCHIVE_BLOB_PREFIX}{digest}.pkl", self._blob_path(digest))
+            for digest in sorted(digests)
+        ]
+        packed = write_archive(
+            os.fspath(archive_path),
+            checkpoint_order,
+            entry_members + blob_members,
+        )
+        entry_count = packed - len(blob_members)
+        logger.info(
+            "Packed %d cache entries into '%s'.",
+            entry_count,
+            os.fspath(archive_path),
+        )
+        return entry_count
+
+    def unpack(
+        self,
+        archive_path: str | os.PathLike[str],
+        checkpoints: Iterable[str] | None = None,
+    ) -> int:
+        """Extract entries from an archive made by :meth:`pack`.
+
+        Existing entries with the same key are replaced, and new checkpoints
+        are appended to the manifest in archive order. Returns the number of
+        entries extracted.
+        """
+        from pickled_pipeline.archive import CacheArchive
+
+        self._check_writable()
+        with CacheArchive(archive_path) as archive:
+            checkpoint_order = self._select_checkpoints(
+                archive.checkpoint_order,
+                checkpoints,
+            )
+            selected = set(checkpoint_order)
+            extracted = 0
+            digests = set()
+            for name in archive.entry_names():
+                if self._checkpoint_name_from_filename(name) not in selected:
+                    continue
+                final_path = os.path.join(self.cache_dir, name)
+                self._extract_member(archive, name, final_path)
+                extracted += 1
+                digest = self._blob_digest(final_path)
+                if digest is not None:
+                    digests.add(digest)
+            for digest in digests:
+                if archive.blob_name(digest) in archive.names:
+                    os.makedirs(self.blob_dir, exist_ok=True)
+                    self._extract_member(
+                        archive,
+                        archive.blob_name(digest),
+                        self._blob_path(digest),
+                    )
+        manifest = self._load_manifest()
+        manifest.extend(
+            checkpoint_name
+            for checkpoint_name in checkpoint_order
+            if checkpoint_name not in manifest
+        )
+        self._write_manifest(manifest)
+        self.checkpoint_order = manifest
+        logger.info(
+            "Unpacked %d cache entries from '%s'.",
+            extracted,
+            os.fspath(archive_path),
+        )
+        return extracted
+
+    def repair(
+        self,
+        max_temp_age: float = DEFAULT_TEMP_MAX_AGE,
+    ) -> RepairReport:
+        """Remove files left by crashed writers and restore the manifest.
+
+        One ``scandir`` pass removes temporary files whose writer has exited,
+        or that are older than ``max_temp_age`` seconds, and finds entries of
+        checkpoints missing from the manifest. Those checkpoints are appended
+        to the manifest, oldest entry first by header creation time.
+        Unreferenced blobs are swept.
+        """
+        self._check_writable()
+        now = time.time()
+        temp_files_removed = 0
+        known = set(self._load_manifest())
+        first_written: dict[str, float] = {}
+        with os.scandir(self.cache_dir) as entries:
+            for dir_entry in entries:
+                name = dir_entry.name
+                if name.startswith(TEMP_PREFIX):
+                    checkpoint_name = None
+                else:
+                    checkpoint_name = self._checkpoint_name_from_filename(name)
+                    # Only entries of unknown checkpoints need a stat.
+                    if checkpoint_name is None or checkpoint_name in known:
+                        continue
+                try:
+                    modified = dir_entry.stat().st_mtime
+                except FileNotFoundError:
+                    continue
+                if checkpoint_name is None:
+                    if is_orphaned_temp(name, now - modified, max_temp_age):
+                        self._remove_if_exists(dir_entry.path)
+                        temp_files_removed += 1
+                    continue
+                # Recorded hits rewrite the header in place and move the
+                # mtime, so only legacy entries are dated by it.
+                written = self._created_time(dir_entry.path, modified)
+                first_written[checkpoint_name] = min(
+                    written,
+                    first_written.get(checkpoint_name, written),
+                )
+        recovered = tuple(sorted(first_written, key=first_written.__getitem__))
+        if recovered:
+            # Reload so checkpoints recorded during the scan are kept.
+            checkpoint_order = self._load_manifest()
+            checkpoint_order.extend(
+                name for name in recovered if name not in checkpoint_order
+            )
+            self._write_manifest(checkpoint_order)
+            self.checkpoint_order = checkpoint_order
+        report = RepairReport(
+            temp_files_removed=temp_files_removed,
+            checkpoints_recovered=recovered,
+            blobs_removed=self._sweep_blobs(),
+            arenas_removed=reap_arenas(),
+        )
+        logger.info(
+            "Repaired cache: removed %d temporary files, %d blobs, and %d "
+            "hot tier arenas, recovered %d checkpoints.",
+            report.temp_files_removed,
+            report.blobs_removed,
+            report.arenas_removed,
+            len(report.checkpoints_recovered),
+        )
+        return report
+
+    def mount(self, archive_path: str | os.PathLike[str]) -> None:
+        """Serve hits from an archive without extracting it.
+
+        Mounted archives are read-only and consulted, in mount order, only
+        when the cache directory has no entry for a call. Misses are still
+        computed and written to the cache directory, which then shadows the
+        archive. Truncating or clearing the cache stops the archive from
+        serving the affected checkpoints.
+        """
+        from pickled_pipeline.archive import CacheArchive
+
+        self._archives.append(CacheArchive(archive_path))
+
+    def unmount(self, archive_path: str | os.PathLike[str]) -> None:
+        archive_path = os.fspath(archive_path)
+        for archive in list(self._archives):
+            if archive.path == archive_path:
+                self._archives.remove(archive)
+                archive.close()
+
+    def save_access_trace(self) -> None:
+        """Persist this run's access order for the next prefetching run.
+
+        The trace is also saved when the cache is garbage collected or the
+        interpreter exits.
+        """
+        if self.prefetch and not self.read_only:
+            write_trace(self.cache_dir, list(self._access_trace))
+
+    def wait_for_revalidation(self, timeout: float | None = None) -> bool:
+        """Wait for background stale-while-revalidate refreshes in threads.
+
+        Returns ``False`` if refreshes were still running when ``timeout``
+        elapsed. Async refreshes run as tasks on the caller's event loop and
+        are not awaited here.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._revalidation_lock:
+                threads = list(self._revalidation_threads)
+            if not threads:
+                return True
+            for thread in threads:
+                remaining = (
+                    None if deadline is None else deadline - time.monotonic()
+                )
+                if remaining is not None and remaining <= 0:
+                    return False
+                thread.join(remaining)
+                with self._revalidation_lock:
+                    self._revalidation_threads.discard(thread)
+
+    def add_hook(self, hook: hooks.PhaseHook) -> None:
+        """Wrap every phase of every checkpoint call in ``hook``.
+
+        ``hook(phase, checkpoint_name)`` must return a context manager; see
+        :mod:`pickled_pipeline.hooks` for the phase names.
+        """
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook: hooks.PhaseHook) -> None:
+        self._hooks.remove(hook)
+
+    def metrics(self) -> dict[str, CheckpointMetrics]:
+        """Return a snapshot of this process's per-checkpoint metrics."""
+        return {
+            checkpoint_name: checkpoint_metrics.snapshot()
+            for checkpoint_name, checkpoint_metrics in self._metrics.items()
+        }
+
+    def reset_metrics(self) -> None:
+        for checkpoint_metrics in self._metrics.values():
+            checkpoint_metrics.reset()
+
+    def stats(self) -> dict[str, CheckpointStats]:
+        """Summarize the persisted entry metadata for each checkpoint.
+
+        Only entry headers are read; no cached result is unpickled. Checkpoints
+        are reported in manifest order, followed by any checkpoints that still
+        have entries on disk but are missing from the manifest.
+        """
+        entry_headers: dict[str, list[tuple[int, entry.EntryHeader | None]]]
+        entry_headers = {
+            checkpoint_name: [] for checkpoint_name in self._load_manifest()
+        }
+        for checkpoint_name, _, stat_result, header in self._scan_headers():
+            entry_headers.setdefault(checkpoint_name, []).append(
+                (stat_result.st_size, header)
+            )
+        return {
+            checkpoint_name: CheckpointStats.from_entries(headers)
+            for checkpoint_name, headers in entry_headers.items()
+        }
+
+    def inspect(
+        self,
+        checkpoints: Iterable[str] | None = None,
+    ) -> list[EntryInfo]:
+        """Describe every entry, or the entries of ``checkpoints``.
+
+        Like :meth:`stats`, this reads only entry headers and filenames, never
+        payloads. Entries are grouped in manifest order and sorted by creation
+        time within each checkpoint.
+        """
+        selected = None if checkpoints is None else set(checkpoints)
+        entry_infos = [
+            EntryInfo.from_header(
+                checkpoint_name,
+                key,
+                stat_result.st_size,
+                stat_result.st_mtime,
+                header,
+            )
+            for checkpoint_name, key, stat_result, header in (
+                self._scan_headers()
+            )
+            if selected is None or checkpoint_name in selected
+        ]
+        positions = {
+            checkpoint_name: position
+            for position, checkpoint_name in enumerate(self._load_manifest())
+        }
+        entry_infos.sort(
+            key=lambda info: (
+                positions.get(info.checkpoint, len(positions)),
+                info.checkpoint,
+                info.created,
+            )
+        )
+        return entry_infos
+
+    def _created_time(self, cache_path: str, modified: float) -> float:
+        try:
+            with open(cache_path, "rb") as f:
+                header = entry.unpack_header(f.read(entry.HEADER_SIZE))
+        except (OSError, EOFError):
+            return modified
+        return modified if header is None else header.created
+
+    def _scan_headers(self) -> Iterator[_ScannedEntry]:
+        """Yield checkpoint, key, stat, and header for each entry file."""
+        # Headers then include the hits of every cache in this process.
+        for cache in list(_open_caches):
+            if cache._usage is not None:
+                cache._usage.flush()
+        with os.scandir(self.cache_dir) as entries:
+            for dir_entry in entries:
+                checkpoint_name = self._checkpoint_name_from_filename(
+                    dir_entry.name
+                )
+                if checkpoint_name is None:
+                    continue
+                try:
+                    stat_result = dir_entry.stat()
+                    with open(dir_entry.path, "rb") as f:
+                        header = entry.unpack_header(f.read(entry.HEADER_SIZE))
+                except (OSError, EOFError):
+                    continue
+                key = dir_entry.name.removesuffix(".pkl").rpartition("__")[2]
+                yield checkpoint_name, key, stat_result, header
+
+    def _phase(
+        self,
+        phase: str,
+        checkpoint_name: str,
+    ) -> AbstractContextManager[object]:
+        if not self._hooks:
+            return hooks.NO_HOOKS
+        return hooks.enter_hooks(self._hooks, phase, checkpoint_name)
+
+    def _cache_path(
+        self,
+        checkpoint_name: str,
+        normalized_items: tuple[tuple[str, Any], ...],
+        key_version: tuple[Any, ...] | None = None,
+    ) -> str:
+        # Create a unique key based on the checkpoint name and filtered
+        # arguments, plus the checkpoint's version when it has one.
+        key_input: tuple[Any, ...] = (checkpoint_name, normalized_items)
+        if key_version is not None:
+            key_input += (key_version,)
+        if self.canonical_keys:
+            key_payload = canonical_key(key_input)
+        else:
+            # Key a chunked hit passed downstream like the result it replaces.
+            key_payload = pickle.dumps(unchunk(key_input))
+        key_hash = hashlib.md5(key_payload).hexdigest()
+        cache_filename = f"{checkpoint_name}__{key_hash}.pkl"
+        return os.path.join(self.cache_dir, cache_filename)
+
+    def _lookup(
+        self,
+        checkpoint: _CheckpointState,
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+    ) -> tuple[str, str, Any]:
+        metrics = checkpoint.metrics
+        if metrics is not None:
+            key_started = time.perf_counter()
+
+        with self._phase(hooks.BIND, checkpoint.name):
+            normalized_items = _normalize_arguments(
+                checkpoint.signature,
+                checkpoint.varkw_name,
+                checkpoint.excluded_arg_names,
+                args,
+                kwargs,
+            )
+
+        with self._phase(hooks.KEY, checkpoint.name):
+            cache_path = self._cache_path(
+                checkpoint.name,
+                normalized_items,
+                checkpoint.key_version,
+            )
+
+        if metrics is not None:
+            metrics.record_key(time.perf_counter() - key_started)
+
+        if self.prefetch:
+            self._record_access(cache_path)
+
+        with self._phase(hooks.LOOKUP, checkpoint.name):
+            entry_exists, archive = self._locate(cache_path, checkpoint.name)
+        if not entry_exists:
+            return cache_path, _MISS, None
+
+        load_started = time.perf_counter()
+        try:
+            with self._phase(hooks.LOAD, checkpoint.name):
+                loaded = self._take_or_load_entry(
+                    cache_path,
+                    load_started,
+                    checkpoint,
+                    archive,
+                )
+                result, bytes_read, header, fresh = loaded
+        except (EOFError, pickle.UnpicklingError, FileNotFoundError):
+            self._discard_hot(cache_path)
+            if archive is None and not self.read_only:
+                self._remove_if_exists(cache_path)
+            return cache_path, _MISS, None
+
+        cached_exception = entry.is_exception(header)
+        if not fresh and (
+            cached_exception or not checkpoint.stale_while_revalidate
+        ):
+            logger.debug("[%s] Cached result expired.", checkpoint.name)
+            return cache_path, _MISS, None
+
+        load_seconds = time.perf_counter() - load_started
+        if metrics is not None:
+            metrics.record_hit(bytes_read, load_seconds)
+        if checkpoint.adaptive is not None:
+            checkpoint.adaptive.observe_load(
+                load_seconds,
+                header.compute_seconds if header else None,
+            )
+        if cached_exception:
+            logger.debug(
+                "[%s] Re-raising cached %s.",
+                checkpoint.name,
+                type(result).__name__,
+            )
+            raise result
+        if fresh:
+            logger.debug("[%s] Loaded result from cache.", checkpoint.name)
+            return cache_path, _HIT, result
+        logger.debug(
+            "[%s] Loaded expired result from cache; revalidating.",
+            checkpoint.name,
+        )
+        return cache_path, _STALE, result
+
+    def _compute(
         self,
         func: Callable[..., R],
         args: tuple[Any, ...],
         kwargs: dict[str, Any],
-        checkpoint_name: str,
-        cache_path: str,
+        checkpoint: _CheckpointState,
+        cache_path: str | None,
     ) -> R:
-        result = func(*args, **kwargs)
-        self._atomic_pickle_dump(result, cache_path)
-        print(f"[{checkpoint_name}] Computed result and saved to cache.")
+        if cache_path is not None:
+            self._check_miss_allowed(checkpoint)
+        with (
+            checkpoint.throttle.slot() if checkpoint.throttle else _NO_THROTTLE
+        ):
+            compute_started = time.perf_counter()
+            try:
+                with self._phase(hooks.COMPUTE, checkpoint.name):
+                    result = func(*args, **kwargs)
+            except checkpoint.cache_exceptions as error:
+                self._store_exception(
+                    error,
+                    time.perf_counter() - compute_started,
+                    checkpoint,
+                    cache_path,
+                )
+                raise
+            compute_seconds = time.perf_counter() - compute_started
+        self._finish_compute(result, compute_seconds, checkpoint, cache_path)
         return result
 
+    async def _compute_async(
+        self,
+        func: Callable[..., Awaitable[T]],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+        checkpoint: _CheckpointState,
+        cache_path: str | None,
+    ) -> T:
+        if cache_path is not None:
+            self._check_miss_allowed(checkpoint)
+        async with (
+            checkpoint.throttle.async_slot()
+            if checkpoint.throttle
+            else _NO_THROTTLE
+        ):
+            compute_started = time.perf_counter()
+            try:
+                with self._phase(hooks.COMPUTE, checkpoint.name):
+                    result = await func(*args, **kwargs)
+            except checkpoint.cache_exceptions as error:
+                self._store_exception(
+                    error,
+                    time.perf_counter() - compute_started,
+                    checkpoint,
+                    cache_path,
+                )
+                raise
+            compute_seconds = time.perf_counter() - compute_started
+        self._finish_compute(result, compute_seconds, checkpoint, cache_path)
+        return result
+
+    def _store_exception(
+        self,
+        error: BaseException,
+        compute_seconds: float,
+        checkpoint: _CheckpointState,
+        cache_path: str | None,
+    ) -> None:
+        if cache_path is None or self.read_only:
+            return
+        try:
+            # Exceptions whose __init__ needs arguments other than ``args``
+            # pickle fine but fail to unpickle; never cache those.
+            pickle.loads(pickle.dumps(error))
+            self._atomic_pickle_dump(
+                error,
+                cache_path,
+                compute_seconds,
+                checkpoint.name,
+                flags=entry.FLAG_EXCEPTION,
+            )
+            self._record_checkpoint(checkpoint.name)
+        except Exception:
+            logger.debug(
+                "[%s] Could not cache %s.",
+                checkpoint.name,
+                type(error).__name__,
+                exc_info=True,
+            )
+            return
+        logger.debug(
+            "[%s] Cached %s raised by the function.",
+            checkpoint.name,
+            type(error).__name__,
+        )
+
+    def _revalidate(
+        self,
+        func: Callable[..., Any],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+        checkpoint: _CheckpointState,
+        cache_path: str,
+    ) -> None:
+        if not self._start_revalidation(cache_path):
+            return
+
+        def refresh() -> None:
+            try:
+                self._compute(func, args, kwargs, checkpoint, cache_path)
+            except Exception:
+                logger.exception(
+                    "[%s] Background revalidation failed.",
+                    checkpoint.name,
+                )
+            finally:
+                self._finish_revalidation(cache_path)
+
+        thread = threading.Thread(
+            target=refresh,
+            name=f"pickled-pipeline-revalidate-{checkpoint.name}",
+            daemon=True,
+        )
+        with self._revalidation_lock:
+            self._revalidation_threads.add(thread)
+        thread.start()
+
+    def _revalidate_async(
+        self,
+        func: Callable[..., Awaitable[Any]],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+        checkpoint: _CheckpointState,
+        cache_path: str,
+    ) -> None:
+        if not self._start_revalidation(cache_path):
+            return
+
+        async def refresh() -> None:
+            try:
+                await self._compute_async(
+                    func,
+                    args,
+                    kwargs,
+                    checkpoint,
+                    cache_path,
+                )
+            except Exception:
+                logger.exception(
+                    "[%s] Background revalidation failed.",
+                    checkpoint.name,
+                )
+            finally:
+                self._finish_revalidation(cache_path)
+
+        import asyncio
+
+        task = asyncio.get_running_loop().create_task(refresh())
+        # The event loop only keeps weak references to tasks.
+        self._revalidation_tasks.add(task)
+        task.add_done_callback(self._revalidation_tasks.discard)
+
+    def _start_revalidation(self, cache_path: str) -> bool:
+        if self.read_only:
+            # A refresh could not be stored, so keep serving the stale entry.
+            return False
+        with self._revalidation_lock:
+            if cache_path in self._revalidating:
+                return False
+            self._revalidating.add(cache_path)
+            return True
+
+    def _finish_revalidation(self, cache_path: str) -> None:
+        with self._revalidation_lock:
+            self._revalidating.discard(cache_path)
+            self._revalidation_threads.discard(threading.current_thread())
+
+    def _finish_compute(
+        self,
+        result: Any,
+        compute_seconds: float,
+        checkpoint: _CheckpointState,
+        cache_path: str | None,
+    ) -> None:
+        # A missing cache path means the adaptive policy bypassed the cache.
+        if checkpoint.adaptive is not None:
+            checkpoint.adaptive.observe_compute(compute_seconds)
+        if cache_path is None:
+            if checkpoint.metrics is not None:
+                checkpoint.metrics.record_bypass(compute_seconds)
+            logger.debug("[%s] Bypassed cache.", checkpoint.name)
+            return
+        if self.read_only:
+            if checkpoint.metrics is not None:
+                checkpoint.metrics.record_miss(compute_seconds, 0, 0.0)
+            logger.debug(
+                "[%s] Computed result; read-only cache, not saved.",
+                checkpoint.name,
+            )
+            return
+
+        store_started = time.perf_counter()
+        bytes_written = self._atomic_pickle_dump(
+            result,
+            cache_path,
+            compute_seconds,
+            checkpoint.name,
+            chunk_size=checkpoint.chunk_size,
+        )
+        if checkpoint.metrics is not None:
+            checkpoint.metrics.record_miss(
+                compute_seconds,
+                bytes_written,
+                time.perf_counter() - store_started,
+            )
+        logger.debug(
+            "[%s] Computed result and saved to cache.",
+            checkpoint.name,
+        )
+
+    def _append(
+        self,
+        func: Callable[..., Iterable[T]],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+        checkpoint: _CheckpointState,
+        cache_path: str,
+        compact_after: int,
+    ) -> list[T]:
+        with self._phase(hooks.LOOKUP, checkpoint.name):
+            entry_exists, archive = self._locate(cache_path, checkpoint.name)
+        header: entry.EntryHeader | None = None
+        items: list[T] = []
+        records = 0
+        if entry_exists:
+            load_started = time.perf_counter()
+            try:
+                with self._phase(hooks.LOAD, checkpoint.name):
+                    header, items, records = self._read_log(
+                        cache_path,
+                        archive,
+                    )
+            except (EOFError, pickle.UnpicklingError, FileNotFoundError):
+                # Start over like any other corrupt entry; the rewrite below
+                # replaces the damaged log.
+                logger.warning(
+                    "[%s] Discarding unreadable append log.",
+                    checkpoint.name,
+                )
+                header, items, records = None, [], 0
+            else:
+                if checkpoint.metrics is not None:
+                    checkpoint.metrics.record_hit(
+                        entry.HEADER_SIZE + header.payload_size,
+                        time.perf_counter() - load_started,
+                    )
+        if header is None:
+            self._check_miss_allowed(checkpoint)
+
+        compute_started = time.perf_counter()
+        with self._phase(hooks.COMPUTE, checkpoint.name):
+            new_items = list(func(items, *args, **kwargs))
+        compute_seconds = time.perf_counter() - compute_started
+        items.extend(new_items)
+        if self.read_only or (header is not None and not new_items):
+            if checkpoint.metrics is not None:
+                checkpoint.metrics.record_miss(compute_seconds, 0, 0.0)
+            return items
+
+        store_started = time.perf_counter()
+        bytes_written = 0
+        if header is not None and archive is None and records < compact_after:
+            bytes_written = self._append_to_log(
+                new_items,
+                cache_path,
+                compute_seconds,
+                checkpoint.name,
+            )
+        if not bytes_written:
+            bytes_written = self._write_log(
+                items,
+                cache_path,
+                compute_seconds + (header.compute_seconds if header else 0.0),
+                checkpoint.name,
+            )
+        if checkpoint.metrics is not None:
+            checkpoint.metrics.record_miss(
+                compute_seconds,
+                bytes_written,
+                time.perf_counter() - store_started,
+            )
+        logger.debug(
+            "[%s] Appended %d items to the log.",
+            checkpoint.name,
+            len(new_items),
+        )
+        return items
+
+    def _read_log(
+        self,
+        cache_path: str,
+        archive: CacheArchive | None,
+    ) -> tuple[entry.EntryHeader, list[Any], int]:
+        opened: IO[bytes]
+        if archive is None:
+            opened = open(cache_path, "rb")
+        else:
+            opened = archive.open(os.path.basename(cache_path))
+        with opened as f:
+            header = entry.read_header(f)
+            if header is None or header.serializer != entry.SERIALIZER_LOG:
+                raise EOFError("Cache entry is not an append log.")
+            items, records = append_log.read_records(f, header.payload_size)
+        return header, items, records
+
+    def _append_to_log(
+        self,
+        new_items: list[Any],
+        cache_path: str,
+        compute_seconds: float,
+        checkpoint_name: str,
+    ) -> int:
+        """Append one record in place; 0 means the log must be rewritten."""
+        with self._phase(hooks.SERIALIZE, checkpoint_name):
+            record = append_log.encode_record(new_items)
+            try:
+                with open(cache_path, "r+b") as f:
+                    # Commit after whatever is committed now, in case another
+                    # process appended since the replay.
+                    header = entry.read_header(f)
+                    if header is None or (
+                        header.serializer != entry.SERIALIZER_LOG
+                    ):
+                        return 0
+                    append_log.append_record(
+                        f,
+                        header,
+                        record,
+                        compute_seconds,
+                        sync=self.durability == "fsync",
+                    )
+            except (EOFError, FileNotFoundError):
+                return 0
+        return len(record)
+
+    def _write_log(
+        self,
+        items: list[Any],
+        final_path: str,
+        compute_seconds: float,
+        checkpoint_name: str,
+    ) -> int:
+        temp_path = self._write_path(final_path, ".pkl")
+        try:
+            with self._phase(hooks.SERIALIZE, checkpoint_name):
+                record = append_log.encode_record(items)
+                with open(temp_path, "wb") as f:
+                    f.write(
+                        entry.pack_header(
+                            entry.EntryHeader(
+                                serializer=entry.SERIALIZER_LOG,
+                                flags=0,
+                                created=time.time(),
+                                compute_seconds=compute_seconds,
+                                payload_size=len(record),
+                            )
+                        )
+                    )
+                    f.write(record)
+                    self._sync(f)
+            with self._phase(hooks.RENAME, checkpoint_name):
+                self._commit(temp_path, final_path)
+        except Exception:
+            self._remove_if_exists(temp_path)
+            raise
+        return entry.HEADER_SIZE + len(record)
+
+    @contextmanager
+    def _append_lock(self, cache_path: str) -> Iterator[None]:
+        with self._append_locks_lock:
+            lock = self._append_locks.setdefault(cache_path, threading.Lock())
+        with lock:
+            yield
+
+    def _compute_and_store_batch(
+        self,
+        func: Callable[..., list[T]],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+        checkpoint: _CheckpointState,
+        cache_paths: list[str],
+    ) -> dict[str, T]:
+        compute_started = time.perf_counter()
+        with self._phase(hooks.COMPUTE, checkpoint.name):
+            batch_results = list(func(*args, **kwargs))
+        compute_seconds = time.perf_counter() - compute_started
+        if len(batch_results) != len(cache_paths):
+            raise ValueError(
+                f"[{checkpoint.name}] Batch function returned "
+                f"{len(batch_results)} results for {len(cache_paths)} items."
+            )
+        # Each stored item is charged an equal share of the batch call.
+        item_compute_seconds = compute_seconds / len(cache_paths)
+        if self.read_only:
+            if checkpoint.metrics is not None:
+                for _ in cache_paths:
+                    checkpoint.metrics.record_miss(
+                        item_compute_seconds,
+                        0,
+                        0.0,
+                    )
+            return dict(zip(cache_paths, batch_results))
+        for cache_path, result in zip(cache_paths, batch_results):
+            store_started = time.perf_counter()
+            bytes_written = self._atomic_pickle_dump(
+                result,
+                cache_path,
+                item_compute_seconds,
+                checkpoint.name,
+            )
+            if checkpoint.metrics is not None:
+                checkpoint.metrics.record_miss(
+                    item_compute_seconds,
+                    bytes_written,
+                    time.perf_counter() - store_started,
+                )
+        logger.debug(
+            "[%s] Computed %d batched results and saved to cache.",
+            checkpoint.name,
+            len(cache_paths),
+        )
+        return dict(zip(cache_paths, batch_results))
+
+    def _locate(
+        self,
+        cache_path: str,
+        checkpoint_name: str,
+    ) -> tuple[bool, CacheArchive | None]:
+        if self._index is not None:
+            if cache_path in self._index:
+                return True, None
+        elif os.path.exists(cache_path):
+            return True, None
+        filename = os.path.basename(cache_path)
+        for archive in self._archives:
+            if archive.serves(checkpoint_name, filename):
+                return True, archive
+        return False, None
+
+    def _plan_prefetch(self) -> list[str]:
+        # Entries of checkpoints truncated since the trace was written are
+        # not worth loading; the manifest says which checkpoints remain.
+        checkpoint_names = set(self.checkpoint_order)
+        return [
+            os.path.join(self.cache_dir, filename)
+            for filename in read_trace(self.cache_dir)
+            if self._checkpoint_name_from_filename(filename)
+            in checkpoint_names
+        ]
+
+    def _record_access(self, cache_path: str) -> None:
+        filename = os.path.basename(cache_path)
+        if filename not in self._traced:
+            self._traced.add(filename)
+            self._access_trace.append(filename)
+        if self._prefetch_plan and self._prefetcher is None:
+            with self._prefetch_lock:
+                # Start on the first call rather than in __init__ so the
+                # checkpoints the trace refers to have been decorated.
+                if self._prefetch_plan and self._prefetcher is None:
+                    self._prefetcher = Prefetcher(
+                        self._prefetch_plan,
+                        self._prefetch_entry,
+                        self.prefetch_depth,
+                    )
+
+    def _prefetch_entry(self, cache_path: str) -> _LoadedEntry | None:
+        checkpoint_name = self._checkpoint_name_from_filename(
+            os.path.basename(cache_path)
+        )
+        checkpoint = self._checkpoints.get(checkpoint_name or "")
+        if checkpoint is None:
+            return None
+        entry_exists, archive = self._locate(cache_path, checkpoint.name)
+        if not entry_exists:
+            return None
+        return self._load_entry(
+            cache_path,
+            time.perf_counter(),
+            checkpoint,
+            archive,
+        )
+
+    def _take_or_load_entry(
+        self,
+        cache_path: str,
+        load_started: float,
+        checkpoint: _CheckpointState,
+        archive: CacheArchive | None,
+    ) -> _LoadedEntry:
+        prefetcher = self._prefetcher
+        if prefetcher is not None:
+            loaded = prefetcher.take(cache_path)
+            if loaded is not None:
+                return loaded
+        return self._load_entry(cache_path, load_started, checkpoint, archive)
+
+    def _stop_prefetch(self) -> None:
+        with self._prefetch_lock:
+            self._prefetch_plan = []
+            if self._prefetcher is not None:
+                self._prefetcher.close()
+                self._prefetcher = None
+
+    def _load_entry(
+        self,
+        cache_path: str,
+        load_started: float,
+        checkpoint: _CheckpointState,
+        archive: CacheArchive | None = None,
+    ) -> _LoadedEntry:
+        hot = tier_data = None
+        hot_tier = self._hot_tier if archive is None else None
+        if hot_tier is not None:
+            hot = hot_tier.get(self._hot_tier_key(cache_path))
+            if hot is not None and hot[: _IDENTITY.size] != _identity(
+                os.stat(cache_path)
+            ):
+                # Rewritten, or hit, by a process without the tier.
+                hot = None
+        opened: IO[bytes]
+        if hot is not None:
+            opened = io.BytesIO(hot[_IDENTITY.size :])
+        elif archive is None:
+            opened = self._open_entry(cache_path)
+        else:
+            opened = archive.open(os.path.basename(cache_path))
+        with opened as f:
+            header = entry.read_header(f)
+            cached_exception = entry.is_exception(header)
+            ttl = checkpoint.ttl
+            if cached_exception:
+                ttl = checkpoint.exception_ttl
+            fresh = ttl is None or not self._is_expired(
+                f,
+                header,
+                ttl,
+                archive,
+            )
+            if not fresh and (
+                cached_exception or not checkpoint.stale_while_revalidate
+            ):
+                return None, 0, header, False
+            if entry.is_blob_reference(header):
+                result, blob_bytes = self._load_blob(f, header, archive)
+                bytes_read = f.tell() + blob_bytes
+            elif (
+                header is not None
+                and header.serializer == entry.SERIALIZER_CHUNKED
+            ):
+                result = self._open_chunked(f, header, cache_path, archive)
+                bytes_read = f.tell()
+            elif (
+                hot is None
+                and hot_tier is not None
+                and header is not None
+                and header.payload_size <= hot_tier.max_entry_bytes
+            ):
+                data = f.read(header.payload_size)
+                result = self._decode_payload(header, data)
+                bytes_read = f.tell()
+                tier_data = entry.pack_header(header) + data
+            else:
+                result = self._read_payload(f, header)
+                bytes_read = f.tell()
+            if hot_tier is not None and tier_data is not None:
+                hot_tier.put(
+                    self._hot_tier_key(cache_path),
+                    _identity(os.fstat(f.fileno())) + tier_data,
+                )
+        if header is not None and archive is None and self._usage is not None:
+            self._usage.add(
+                cache_path,
+                header.created,
+                time.perf_counter() - load_started,
+            )
+        return result, bytes_read, header, fresh
+
+    def _load_blob(
+        self,
+        f: IO[bytes],
+        header: entry.EntryHeader,
+        archive: CacheArchive | None = None,
+    ) -> tuple[Any, int]:
+        digest = entry.decode_digest(f.read(header.payload_size))
+        blob_path = None
+        try:
+            blob: IO[bytes]
+            if archive is not None and archive.blob_name(digest) in (
+                archive.names
+            ):
+                blob = archive.open(archive.blob_name(digest))
+            else:
+                blob_path = self._blob_path(digest)
+                blob = open(blob_path, "rb")
+            with blob:
+                if header.serializer == entry.SERIALIZER_PICKLE:
+                    return pickle.load(blob), blob.tell()
+                data = blob.read()
+                return entry.decode_raw(header.serializer, data), len(data)
+        except FileNotFoundError:
+            # A sweep removed the blob between its write and this reference;
+            # treat the reference like any other corrupt entry.
+            raise EOFError(f"Cache blob {digest} is missing.") from None
+        except (EOFError, pickle.UnpicklingError):
+            # Remove the corrupt blob too, or the next store of this result
+            # would find it and keep referencing it.
+            if blob_path is not None and not self.read_only:
+                self._remove_if_exists(blob_path)
+            raise
+
+    def _read_payload(
+        self,
+        f: IO[bytes],
+        header: entry.EntryHeader | None,
+    ) -> Any:
+        if header is None or header.serializer == entry.SERIALIZER_PICKLE:
+            return pickle.load(f)
+        # Raw payloads are read with one call sized from the header, straight
+        # into the bytes object that is returned or decoded.
+        return self._decode_payload(header, f.read(header.payload_size))
+
+    def _open_chunked(
+        self,
+        f: IO[bytes],
+        header: entry.EntryHeader,
+        cache_path: str,
+        archive: CacheArchive | None,
+    ) -> ChunkedSequence:
+        # The index only describes the chunks; a file cut short behind it is
+        # corrupt like any other entry.
+        if archive is None:
+            file_size = os.fstat(f.fileno()).st_size
+        else:
+            file_size = archive.size(os.path.basename(cache_path))
+        if file_size < entry.HEADER_SIZE + header.payload_size:
+            raise EOFError("Chunked payload is truncated.")
+        # The sequence reads chunks after this load returns, so it reopens
+        # the entry for each one instead of keeping a descriptor open.
+        reopen: Callable[[], IO[bytes]]
+        if archive is None:
+            # Hit counters change in place; the rest of the header is set
+            # once per write, and its creation time tells rewrites apart.
+            written = header._replace(hits=0, load_seconds=0.0)
+
+            def reopen() -> IO[bytes]:
+                handle = open(cache_path, "rb")
+                current = entry.read_header(handle)
+                if (
+                    current is None
+                    or current._replace(hits=0, load_seconds=0.0) != written
+                ):
+                    handle.close()
+                    raise FileNotFoundError(
+                        f"Entry '{cache_path}' was replaced after its "
+                        "chunked result was loaded."
+                    )
+                return handle
+
+        else:
+            name = os.path.basename(cache_path)
+
+            def reopen() -> IO[bytes]:
+                return archive.open(name)
+
+        return ChunkedSequence(
+            f,
+            header.payload_size,
+            reopen,
+            tuple if header.flags & entry.FLAG_TUPLE else list,
+        )
+
+    def _decode_payload(self, header: entry.EntryHeader, data: bytes) -> Any:
+        if len(data) != header.payload_size:
+            raise EOFError("Cache entry payload is truncated.")
+        if header.serializer == entry.SERIALIZER_PICKLE:
+            return pickle.loads(data)
+        return entry.decode_raw(header.serializer, data)
+
+    def _hot_tier_key(self, cache_path: str) -> bytes:
+        return hashlib.md5(os.path.basename(cache_path).encode()).digest()
+
+    def _discard_hot(self, cache_path: str) -> None:
+        if self._hot_tier is not None:
+            self._hot_tier.discard(self._hot_tier_key(cache_path))
+
+    def _is_expired(
+        self,
+        f: IO[bytes],
+        header: entry.EntryHeader | None,
+        ttl: float,
+        archive: CacheArchive | None = None,
+    ) -> bool:
+        # Legacy entries have no creation time; their modification time is
+        # equivalent because hits never rewrite them.
+        if header is not None:
+            created = header.created
+        elif archive is not None:
+            created = archive.modified_time(f.name)
+        else:
+            created = os.fstat(f.fileno()).st_mtime
+        return time.time() - created > ttl
+
+    def _try_load_entry(
+        self,
+        cache_path: str,
+        checkpoint: _CheckpointState,
+    ) -> tuple[bool, Any]:
+        if self.prefetch:
+            self._record_access(cache_path)
+        with self._phase(hooks.LOOKUP, checkpoint.name):
+            entry_exists, archive = self._locate(cache_path, checkpoint.name)
+        if not entry_exists:
+            return False, None
+        load_started = time.perf_counter()
+        try:
+            with self._phase(hooks.LOAD, checkpoint.name):
+                loaded = self._take_or_load_entry(
+                    cache_path,
+                    load_started,
+                    checkpoint,
+                    archive,
+                )
+                result, bytes_read, _, _ = loaded
+        except (EOFError, pickle.UnpicklingError, FileNotFoundError):
+            self._discard_hot(cache_path)
+            if archive is None and not self.read_only:
+                self._remove_if_exists(cache_path)
+            return False, None
+        if checkpoint.metrics is not None:
+            checkpoint.metrics.record_hit(
+                bytes_read,
+                time.perf_counter() - load_started,
+            )
+        return True, result
+
+    def _open_entry(self, cache_path: str) -> BinaryIO:
+        return open(cache_path, "rb")
+
+    def _checkpoint_function(
+        self,
+        wrapper: Callable[..., Any],
+        func: Callable[..., Any],
+        decorator: str,
+        options: dict[str, Any],
+        checkpoint_name: str,
+    ) -> Callable[..., Any]:
+        function = _CheckpointFunction(
+            wrapper,
+            func,
+            self,
+            decorator,
+            options,
+        )
+        self._functions[checkpoint_name] = function
+        return function
+
+    def _reset_after_fork(self) -> None:
+        # Threads do not survive a fork, so locks they held would never be
+        # released, and their revalidations and prefetches never finish.
+        self._revalidating = set()
+        self._revalidation_threads = set()
+        self._revalidation_tasks = set()
+        self._revalidation_lock = threading.Lock()
+        self._append_locks = {}
+        self._append_locks_lock = threading.Lock()
+        self._prefetch_plan = []
+        self._prefetcher = None
+        self._prefetch_lock = threading.Lock()
+        for metrics in self._metrics.values():
+            metrics._lock = threading.Lock()
+        if self._usage is not None:
+            self._usage.reset_after_fork()
+
+    def _metrics_for(self, checkpoint_name: str) -> CheckpointMetrics | None:
+        if not self.collect_metrics:
+            return None
+        return self._metrics.setdefault(checkpoint_name, CheckpointMetrics())
+
+    def _build_index(self) -> frozenset[str]:
+        with os.scandir(self.cache_dir) as entries:
+            return frozenset(
+                os.path.join(self.cache_dir, dir_entry.name)
+                for dir_entry in entries
+                if self._checkpoint_name_from_filename(dir_entry.name)
+                is not None
+            )
+
+    def _check_writable(self) -> None:
+        if self.read_only:
+            raise PermissionError(f"Cache '{self.cache_dir}' is read-only.")
+
+    def _check_miss_allowed(self, checkpoint: _CheckpointState) -> None:
+        if self.read_only and self.on_miss == "raise":
+            raise CacheMissError(checkpoint.name, self.cache_dir)
+
     def _record_checkpoint(self, checkpoint_name: str) -> None:
+        if self.read_only:
+            return
         checkpoint_order = self._load_manifest()
         if checkpoint_name not in checkpoint_order:
             checkpoint_order.append(checkpoint_name)
@@ -203,42 +2258,210 @@ class Cache:
     def _write_manifest(self, checkpoint_order: list[str]) -> None:
         self._atomic_json_dump(checkpoint_order, self.manifest_path)
 
-    def _atomic_pickle_dump(self, value: Any, final_path: str) -> None:
-        temp_path = self._temporary_path(".pkl")
+    def _atomic_pickle_dump(
+        self,
+        value: Any,
+        final_path: str,
+        compute_seconds: float,
+        checkpoint_name: str,
+        flags: int = 0,
+        chunk_size: int | None = None,
+    ) -> int:
+        temp_path = self._write_path(final_path, ".pkl")
+        try:
+            with self._phase(hooks.SERIALIZE, checkpoint_name):
+                # Subclasses such as named tuples keep their type pickled.
+                chunked = chunk_size is not None and type(value) in (
+                    list,
+                    tuple,
+                )
+                if chunked:
+                    serializer, raw = entry.SERIALIZER_CHUNKED, None
+                    if type(value) is tuple:
+                        flags |= entry.FLAG_TUPLE
+                else:
+                    serializer, raw = entry.encode_raw(value)
+                blob_bytes = 0
+                # Chunked entries stay whole so hits can seek into them.
+                if self.deduplicate and not chunked:
+                    payload = raw if raw is not None else pickle.dumps(value)
+                    digest = hashlib.sha256(payload).hexdigest()
+                    blob_bytes = self._store_blob(digest, payload)
+                    flags |= entry.FLAG_BLOB
+                with open(temp_path, "wb") as f:
+                    f.seek(entry.HEADER_SIZE)
+                    if flags & entry.FLAG_BLOB:
+                        f.write(digest.encode("ascii"))
+                    elif raw is not None:
+                        f.write(raw)
+                    elif chunked:
+                        write_chunks(f, value, cast(int, chunk_size))
+                    else:
+                        pickle.dump(value, f)
+                    bytes_written = f.tell()
+                    f.seek(0)
+                    f.write(
+                        entry.pack_header(
+                            entry.EntryHeader(
+                                serializer=serializer,
+                                flags=flags,
+                                created=time.time(),
+                                compute_seconds=compute_seconds,
+                                payload_size=(
+                                    bytes_written - entry.HEADER_SIZE
+                                ),
+                            )
+                        )
+                    )
+                    self._sync(f)
+            with self._phase(hooks.RENAME, checkpoint_name):
+                self._commit(temp_path, final_path)
+            self._discard_hot(final_path)
+        except Exception:
+            self._remove_if_exists(temp_path)
+            raise
+        return bytes_written + blob_bytes
+
+    def _store_blob(self, digest: str, payload: bytes) -> int:
+        """Write ``payload`` to the blob store unless it is already there.
+
+        Returns the number of bytes written, which is zero for a duplicate.
+        A blob of the wrong size, left corrupt, is written again.
+        """
+        blob_path = self._blob_path(digest)
+        try:
+            if os.stat(blob_path).st_size == len(payload):
+                return 0
+        except FileNotFoundError:
+            pass
+        os.makedirs(self.blob_dir, exist_ok=True)
+        # Blobs are always written atomically, whatever the durability: an
+        # existing blob is never rewritten, so a partial one would stay
+        # corrupt.
+        temp_path = self._temporary_path(".blob")
         try:
             with open(temp_path, "wb") as f:
-                pickle.dump(value, f)
-            os.replace(temp_path, final_path)
+                f.write(payload)
+                self._sync(f)
+            self._commit(temp_path, blob_path)
         except Exception:
             self._remove_if_exists(temp_path)
             raise
+        return len(payload)
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.blob_dir, f"{digest}.pkl")
+
+    def _blob_digest(self, path: str) -> str | None:
+        try:
+            with open(path, "rb") as f:
+                return entry.read_blob_digest(f)
+        except (OSError, EOFError):
+            return None
+
+    def _select_checkpoints(
+        self,
+        checkpoint_order: list[str],
+        checkpoints: Iterable[str] | None,
+    ) -> list[str]:
+        if checkpoints is None:
+            return list(checkpoint_order)
+        requested = set(checkpoints)
+        for checkpoint_name in requested.difference(checkpoint_order):
+            raise ValueError(
+                f"Checkpoint '{checkpoint_name}' not found in manifest."
+            )
+        return [
+            checkpoint_name
+            for checkpoint_name in checkpoint_order
+            if checkpoint_name in requested
+        ]
+
+    def _extract_member(
+        self,
+        archive: CacheArchive,
+        name: str,
+        final_path: str,
+    ) -> None:
+        temp_path = self._write_path(final_path, ".pkl")
+        try:
+            with archive.open(name) as src, open(temp_path, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+                self._sync(dst)
+            self._commit(temp_path, final_path)
+            self._discard_hot(final_path)
+        except Exception:
+            self._remove_if_exists(temp_path)
+            raise
+
+    def _sweep_blobs(self) -> int:
+        """Remove blobs that no remaining entry references.
+
+        Blob references are counted from the entry headers at sweep time rather
+        than persisted, so concurrent writers never contend on shared counters.
+        """
+        try:
+            blob_names = os.listdir(self.blob_dir)
+        except FileNotFoundError:
+            return 0
+        referenced = set()
+        with os.scandir(self.cache_dir) as entries:
+            for dir_entry in entries:
+                if self._checkpoint_name_from_filename(dir_entry.name) is None:
+                    continue
+                referenced.add(self._blob_digest(dir_entry.path))
+        removed = 0
+        for blob_name in blob_names:
+            if blob_name.removesuffix(".pkl") in referenced:
+                continue
+            self._remove_if_exists(os.path.join(self.blob_dir, blob_name))
+            removed += 1
+        if removed:
+            logger.debug("Removed %d unreferenced cache blobs.", removed)
+        return removed
 
     def _atomic_json_dump(self, value: Any, final_path: str) -> None:
         temp_path = self._temporary_path(".json")
         try:
             with open(temp_path, "w", encoding="utf-8") as f:
                 json.dump(value, f)
-            os.replace(temp_path, final_path)
+                self._sync(f)
+            self._commit(temp_path, final_path)
         except Exception:
             self._remove_if_exists(temp_path)
             raise
 
+    def _write_path(self, final_path: str, suffix: str) -> str:
+        """Return where to write an entry before committing it.
+
+        With ``durability="none"`` entries are written straight to
+        ``final_path``; otherwise to a temporary file in the cache directory.
+        """
+        if self.durability == "none":
+            return final_path
+        return self._temporary_path(suffix)
+
+    def _sync(self, f: IO[Any]) -> None:
+        if self.durability == "fsync":
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _commit(self, written_path: str, final_path: str) -> None:
+        if written_path == final_path:
+            return
+        os.replace(written_path, final_path)
+        if self.durability == "fsync":
+            _fsync_directory(os.path.dirname(final_path))
+
     def _temporary_path(self, suffix: str) -> str:
         fd, temp_path = tempfile.mkstemp(
-            prefix=".pickled-pipeline-",
+            prefix=temp_prefix(),
             suffix=suffix,
             dir=self.cache_dir,
         )
         os.close(fd)
         return temp_path
 
-    def _filename_belongs_to_checkpoint(
-        self,
-        filename: str,
-        checkpoint_name: str,
-    ) -> bool:
-        return self._checkpoint_name_from_filename(filename) == checkpoint_name
-
     def _checkpoint_name_from_filename(self, filename: str) -> str | None:
         if not filename.endswith(".pkl"):
             return None
@@ -252,6 +2475,48 @@ class Cache:
             return None
         return checkpoint_name
 
+    def _remove_files(
+        self,
+        file_paths: list[str],
+        jobs: int,
+        progress: ProgressCallback | None,
+    ) -> None:
+        if jobs < 1:
+            raise ValueError("jobs must be at least 1.")
+        total = len(file_paths)
+        if progress is not None:
+            progress(0, total)
+        batches = [
+            file_paths[start : start + _DELETE_BATCH_SIZE]
+            for start in range(0, total, _DELETE_BATCH_SIZE)
+        ]
+        removed = 0
+        if jobs == 1 or len(batches) <= 1:
+            for batch in batches:
+                removed += self._remove_batch(batch)
+                if progress is not None:
+                    progress(removed, total)
+            return
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(
+            max_workers=min(jobs, len(batches)),
+            thread_name_prefix="pickled-pipeline-remove",
+        ) as executor:
+            for batch_size in executor.map(self._remove_batch, batches):
+                removed += batch_size
+                if progress is not None:
+                    progress(removed, total)
+
+    def _remove_batch(self, file_paths: list[str]) -> int:
+        for file_path in file_paths:
+            self._remove_if_exists(file_path)
+            logger.debug(
+                "Removed cache file '%s'",
+                os.path.basename(file_path),
+            )
+        return len(file_paths)
+
     def _remove_if_exists(self, path: str) -> None:
         try:
             os.remove(path)
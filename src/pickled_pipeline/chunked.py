@@ -0,0 +1,175 @@
+"""Chunked storage for list results, loaded lazily on access.
+
+A chunked payload is an index followed by independently pickled chunks::
+
+    length      Q   number of items
+    chunk_size  Q   items per chunk (the last chunk may be shorter)
+    offsets     Q   one per chunk plus an end offset, from the payload start
+    chunks          one pickled list per chunk
+
+A hit reads only the index. :class:`ChunkedSequence` then loads a chunk the
+first time an item in it is touched, from a handle opened for that load.
+
+Keys are built from the list or tuple a sequence stands for, via
+:func:`unchunk`, so a downstream step keys a hit like the miss before it.
+"""
+
+from __future__ import annotations
+
+import pickle
+import struct
+import threading
+import weakref
+from collections.abc import Callable, Iterator, Sequence
+from typing import IO, Any, overload
+
+_COUNTS = struct.Struct("<QQ")
+_OFFSET = struct.Struct("<Q")
+
+# Sequences alive in this process, by id; while there are none, keys never
+# need to be searched for them.
+_live: weakref.WeakValueDictionary[int, ChunkedSequence] = (
+    weakref.WeakValueDictionary()
+)
+
+
+def write_chunks(
+    f: IO[bytes],
+    items: Sequence[Any],
+    chunk_size: int,
+) -> None:
+    """Write ``items`` as a chunked payload at the position of ``f``."""
+    start = f.tell()
+    chunk_count = -(-len(items) // chunk_size)
+    f.write(_COUNTS.pack(len(items), chunk_size))
+    index_position = f.tell()
+    f.seek(_OFFSET.size * (chunk_count + 1), 1)
+    offsets = []
+    for first in range(0, len(items), chunk_size):
+        offsets.append(f.tell() - start)
+        pickle.dump(list(items[first : first + chunk_size]), f)
+    offsets.append(f.tell() - start)
+    end = f.tell()
+    f.seek(index_position)
+    f.write(b"".join(_OFFSET.pack(offset) for offset in offsets))
+    f.seek(end)
+
+
+class ChunkedSequence(Sequence[Any]):
+    """Read-only sequence over a chunked payload in an entry file.
+
+    The index is read from ``f`` at its current position. Each chunk is read
+    the first time it is touched, through a handle from ``reopen`` that is
+    closed again right after, and then kept, so no file stays open between
+    loads. ``reopen`` raises if the entry has been replaced since.
+    """
+
+    def __init__(
+        self,
+        f: IO[bytes],
+        payload_size: int,
+        reopen: Callable[[], IO[bytes]],
+        kind: type[list[Any]] | type[tuple[Any, ...]] = list,
+    ):
+        self._reopen = reopen
+        self._kind = kind
+        self._start = f.tell()
+        counts = f.read(_COUNTS.size)
+        if len(counts) != _COUNTS.size:
+            raise EOFError("Chunked payload index is truncated.")
+        self._length: int
+        self._chunk_size: int
+        self._length, self._chunk_size = _COUNTS.unpack(counts)
+        if not self._chunk_size:
+            raise EOFError("Chunked payload index is malformed.")
+        chunk_count = -(-self._length // self._chunk_size)
+        data = f.read(_OFFSET.size * (chunk_count + 1))
+        if len(data) != _OFFSET.size * (chunk_count + 1):
+            raise EOFError("Chunked payload index is truncated.")
+        self._offsets = [offset for (offset,) in _OFFSET.iter_unpack(data)]
+        if self._offsets[-1] != payload_size:
+            raise EOFError("Chunked payload is truncated.")
+        self._chunks: dict[int, list[Any]] = {}
+        self._lock = threading.Lock()
+        _live[id(self)] = self
+
+    @property
+    def chunk_size(self) -> int:
+        return self._chunk_size
+
+    @property
+    def loaded_chunks(self) -> int:
+        return len(self._chunks)
+
+    def __len__(self) -> int:
+        return self._length
+
+    @overload
+    def __getitem__(self, index: int) -> Any: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Any]: ...
+
+    def __getitem__(self, index: int | slice) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        position = index + self._length if index < 0 else index
+        if not 0 <= position < self._length:
+            raise IndexError("ChunkedSequence index out of range")
+        chunk_index, offset = divmod(position, self._chunk_size)
+        return self._chunk(chunk_index)[offset]
+
+    def __iter__(self) -> Iterator[Any]:
+        for chunk_index in range(len(self._offsets) - 1):
+            yield from self._chunk(chunk_index)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, (list, tuple, ChunkedSequence)):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            a == b for a, b in zip(self, other)
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return (
+            f"ChunkedSequence(len={self._length}, "
+            f"chunk_size={self._chunk_size})"
+        )
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return self._kind, (list(self),)
+
+    def _chunk(self, chunk_index: int) -> list[Any]:
+        with self._lock:
+            chunk = self._chunks.get(chunk_index)
+            if chunk is None:
+                with self._reopen() as f:
+                    f.seek(self._start + self._offsets[chunk_index])
+                    chunk = pickle.load(f)
+                self._chunks[chunk_index] = chunk
+            return chunk
+
+
+def unchunk(value: Any) -> Any:
+    """Replace chunked sequences in ``value`` with what they stand for.
+
+    Sequences are searched for in lists, tuples, and dict values, and turned
+    into the list or tuple they were stored from, which loads all of their
+    chunks. Other values are returned as they are.
+    """
+    if not _live:
+        return value
+    return _unchunk(value)
+
+
+def _unchunk(value: Any) -> Any:
+    kind = type(value)
+    if kind is ChunkedSequence:
+        return value._kind(value)
+    if kind is list or kind is tuple:
+        return kind(_unchunk(item) for item in value)
+    if kind is dict:
+        return {key: _unchunk(item) for key, item in value.items()}
+    return value
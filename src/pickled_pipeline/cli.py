@@ -1,11 +1,66 @@
+import logging
+import sys
+from collections import Counter
+from datetime import datetime
+
 import click
-from .cache import Cache
+from .cache import DEFAULT_DELETE_JOBS, Cache
+from .metrics import EntryInfo
+from .recovery import DEFAULT_TEMP_MAX_AGE
+
+
+class _ClickEchoHandler(logging.Handler):
+    """Route ``pickled_pipeline`` log records to the Click error stream."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            click.echo(self.format(record), err=True)
+        except Exception:
+            self.handleError(record)
+
+
+_VERBOSITY_LEVELS = [logging.WARNING, logging.INFO, logging.DEBUG]
 
 
 @click.group()
-def cli():
+@click.option(
+    "-v",
+    "--verbose",
+    count=True,
+    help="Report more cache activity (repeat for per-file detail).",
+)
+@click.pass_context
+def cli(ctx, verbose):
     """CLI for managing pickled_pipeline cache."""
-    pass
+    package_logger = logging.getLogger("pickled_pipeline")
+    handler = _ClickEchoHandler()
+    previous_level = package_logger.level
+    package_logger.addHandler(handler)
+    package_logger.setLevel(
+        _VERBOSITY_LEVELS[min(verbose, len(_VERBOSITY_LEVELS) - 1)]
+    )
+
+    def restore_logging():
+        package_logger.removeHandler(handler)
+        package_logger.setLevel(previous_level)
+
+    ctx.call_on_close(restore_logging)
+
+
+_jobs_option = click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=DEFAULT_DELETE_JOBS,
+    show_default=True,
+    help="Number of files to delete concurrently.",
+)
+_quiet_option = click.option(
+    "--quiet",
+    "-q",
+    is_flag=True,
+    help="Do not report progress or a summary.",
+)
 
 
 @cli.command()
@@ -15,10 +70,14 @@ def cli():
     default="pipeline_cache",
     help="Cache directory path.",
 )
-def truncate(checkpoint_name, cache_dir):
+@_jobs_option
+@_quiet_option
+def truncate(checkpoint_name, cache_dir, jobs, quiet):
     """Truncate cache from a specific checkpoint."""
     cache = Cache(cache_dir=cache_dir)
-    if cache.truncate_cache(checkpoint_name):
+    with _RemovalProgress(quiet) as progress:
+        truncated = cache.truncate_cache(checkpoint_name, jobs, progress)
+    if truncated and not quiet:
         click.echo(f"Cache truncated from checkpoint '{checkpoint_name}'.")
 
 
@@ -28,11 +87,44 @@ def truncate(checkpoint_name, cache_dir):
     default="pipeline_cache",
     help="Cache directory path.",
 )
-def clear(cache_dir):
+@_jobs_option
+@_quiet_option
+def clear(cache_dir, jobs, quiet):
     """Clear the entire cache."""
     cache = Cache(cache_dir=cache_dir)
-    cache.clear_cache()
-    click.echo("Entire cache has been cleared.")
+    with _RemovalProgress(quiet) as progress:
+        cache.clear_cache(jobs, progress)
+    if not quiet:
+        click.echo("Entire cache has been cleared.")
+
+
+class _RemovalProgress:
+    """Progress bar on stderr for file removal, created on the first report.
+
+    Nothing is shown when ``quiet`` is set or there is nothing to remove.
+    """
+
+    def __init__(self, quiet):
+        self.quiet = quiet
+        self._bar = None
+
+    def __enter__(self):
+        return None if self.quiet else self
+
+    def __exit__(self, *exc_info):
+        if self._bar is not None:
+            self._bar.render_finish()
+
+    def __call__(self, removed, total):
+        if total == 0:
+            return
+        if self._bar is None:
+            self._bar = click.progressbar(
+                length=total,
+                label="Removing cache files",
+                file=sys.stderr,
+            )
+        self._bar.update(removed - self._bar.pos)
 
 
 @cli.command("list")
@@ -51,3 +143,196 @@ def list_checkpoints(cache_dir):
             click.echo(f"- {checkpoint}")
     else:
         click.echo("No checkpoints found in cache.")
+
+
+@cli.command()
+@click.option(
+    "--cache-dir",
+    default="pipeline_cache",
+    help="Cache directory path.",
+)
+def stats(cache_dir):
+    """Report time saved, hit ratio, and disk cost per checkpoint."""
+    cache = Cache(cache_dir=cache_dir)
+    checkpoint_stats = cache.stats()
+    if not checkpoint_stats:
+        click.echo("No checkpoints found in cache.")
+        return
+    click.echo(
+        f"{'checkpoint':<40} {'entries':>8} {'hits':>8} {'hit %':>6} "
+        f"{'compute s':>10} {'load s':>10} {'saved s':>10} {'disk':>10}"
+    )
+    for checkpoint, entry_stats in checkpoint_stats.items():
+        click.echo(
+            f"{checkpoint:<40} {entry_stats.entries:>8} "
+            f"{entry_stats.hits:>8} {entry_stats.hit_ratio:>6.0%} "
+            f"{entry_stats.mean_compute_seconds:>10.4f} "
+            f"{entry_stats.mean_load_seconds:>10.4f} "
+            f"{entry_stats.time_saved_seconds:>10.2f} "
+            f"{_format_bytes(entry_stats.disk_bytes):>10}"
+        )
+
+
+@cli.command()
+@click.argument("archive_path", type=click.Path(dir_okay=False))
+@click.option(
+    "--checkpoint",
+    "checkpoints",
+    multiple=True,
+    help="Only pack this checkpoint (repeatable).",
+)
+@click.option(
+    "--cache-dir",
+    default="pipeline_cache",
+    help="Cache directory path.",
+)
+def pack(archive_path, checkpoints, cache_dir):
+    """Bundle the cache into a single archive file."""
+    cache = Cache(cache_dir=cache_dir)
+    try:
+        packed = cache.pack(archive_path, checkpoints or None)
+    except ValueError as error:
+        raise click.ClickException(str(error)) from error
+    click.echo(f"Packed {packed} entries into '{archive_path}'.")
+
+
+@cli.command()
+@click.argument("archive_path", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--checkpoint",
+    "checkpoints",
+    multiple=True,
+    help="Only unpack this checkpoint (repeatable).",
+)
+@click.option(
+    "--cache-dir",
+    default="pipeline_cache",
+    help="Cache directory path.",
+)
+def unpack(archive_path, checkpoints, cache_dir):
+    """Extract an archive made by `pack` into the cache."""
+    cache = Cache(cache_dir=cache_dir)
+    try:
+        unpacked = cache.unpack(archive_path, checkpoints or None)
+    except ValueError as error:
+        raise click.ClickException(str(error)) from error
+    click.echo(f"Unpacked {unpacked} entries from '{archive_path}'.")
+
+
+@cli.command()
+@click.option(
+    "--checkpoint",
+    "checkpoints",
+    multiple=True,
+    help="Only inspect this checkpoint (repeatable).",
+)
+@click.option(
+    "--entries",
+    "show_entries",
+    is_flag=True,
+    help="List every entry instead of a per-checkpoint summary.",
+)
+@click.option(
+    "--cache-dir",
+    default="pipeline_cache",
+    help="Cache directory path.",
+)
+def inspect(checkpoints, show_entries, cache_dir):
+    """Describe cache entries from their headers, without unpickling."""
+    cache = Cache(cache_dir=cache_dir)
+    entry_infos = cache.inspect(checkpoints or None)
+    if not entry_infos:
+        click.echo("No entries found in cache.")
+        return
+    if show_entries:
+        click.echo(
+            f"{'checkpoint':<40} {'key':<32} {'created':<19} "
+            f"{'serializer':<10} {'payload':>10} {'compute s':>10} "
+            f"{'hits':>6} flags"
+        )
+        for info in entry_infos:
+            flags = ",".join(
+                flag
+                for flag, is_set in (
+                    ("exception", info.cached_exception),
+                    ("dedup", info.deduplicated),
+                )
+                if is_set
+            )
+            compute = (
+                "-"
+                if info.compute_seconds is None
+                else f"{info.compute_seconds:.4f}"
+            )
+            click.echo(
+                f"{info.checkpoint:<40} {info.key:<32} "
+                f"{_format_time(info.created):<19} {info.serializer:<10} "
+                f"{_format_bytes(info.payload_bytes):>10} {compute:>10} "
+                f"{info.hits:>6} {flags}".rstrip()
+            )
+        return
+    summaries: dict[str, list[EntryInfo]] = {}
+    for info in entry_infos:
+        summaries.setdefault(info.checkpoint, []).append(info)
+    click.echo(
+        f"{'checkpoint':<40} {'entries':>8} {'payload':>10} {'disk':>10} "
+        f"{'oldest':<19} {'newest':<19} serializers"
+    )
+    for checkpoint, infos in summaries.items():
+        serializer_counts = Counter(info.serializer for info in infos)
+        click.echo(
+            f"{checkpoint:<40} {len(infos):>8} "
+            f"{_format_bytes(sum(i.payload_bytes for i in infos)):>10} "
+            f"{_format_bytes(sum(i.disk_bytes for i in infos)):>10} "
+            f"{_format_time(min(i.created for i in infos)):<19} "
+            f"{_format_time(max(i.created for i in infos)):<19} "
+            + ", ".join(
+                f"{serializer} {count}"
+                for serializer, count in serializer_counts.items()
+            )
+        )
+
+
+@cli.command()
+@click.option(
+    "--max-temp-age",
+    type=click.FloatRange(min=0),
+    default=DEFAULT_TEMP_MAX_AGE,
+    show_default=True,
+    help="Seconds after which any temporary file counts as orphaned.",
+)
+@click.option(
+    "--cache-dir",
+    default="pipeline_cache",
+    help="Cache directory path.",
+)
+def repair(max_temp_age, cache_dir):
+    """Remove files left by crashed writers and restore the manifest."""
+    cache = Cache(cache_dir=cache_dir)
+    report = cache.repair(max_temp_age)
+    click.echo(f"Removed {report.temp_files_removed} orphaned temporary files.")
+    if report.checkpoints_recovered:
+        click.echo(
+            "Recovered checkpoints: "
+            + ", ".join(report.checkpoints_recovered)
+        )
+    if report.blobs_removed:
+        click.echo(f"Removed {report.blobs_removed} unreferenced blobs.")
+    if report.arenas_removed:
+        click.echo(
+            f"Removed {report.arenas_removed} orphaned hot tier arenas."
+        )
+
+
+def _format_time(timestamp):
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _format_bytes(size):
+    if size < 1024:
+        return f"{size} B"
+    for unit in ["KiB", "MiB", "GiB"]:
+        size /= 1024
+        if size < 1024:
+            break
+    return f"{size:.1f} {unit}"
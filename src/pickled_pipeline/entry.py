@@ -0,0 +1,168 @@
+"""Fixed-size metadata header stored at the start of every cache entry.
+
+Layout (little endian, 48 bytes)::
+
+    magic            4s  b"PPLE"
+    version          B
+    serializer       B   0 pickle, 1 UTF-8 str, 2 raw bytes, 3 chunked list,
+                         4 append log
+    flags            H
+    created          d   Unix timestamp of the write
+    compute_seconds  d   time spent in the decorated function
+    payload_size     Q   serialized result size, excluding this header
+    hits             Q   loads served from this entry
+    load_seconds     d   cumulative time spent serving those loads
+
+``hits`` and ``load_seconds`` are the trailing fields so a hit can update both
+with one small in-place write. Files that do not start with the magic bytes are
+legacy entries holding a bare pickle.
+"""
+
+from __future__ import annotations
+
+import struct
+from typing import IO, NamedTuple, TypeGuard
+
+MAGIC = b"PPLE"
+FORMAT_VERSION = 1
+SERIALIZER_PICKLE = 0
+SERIALIZER_UTF8 = 1
+SERIALIZER_BYTES = 2
+SERIALIZER_CHUNKED = 3
+SERIALIZER_LOG = 4
+SERIALIZER_NAMES = {
+    SERIALIZER_PICKLE: "pickle",
+    SERIALIZER_UTF8: "utf8",
+    SERIALIZER_BYTES: "bytes",
+    SERIALIZER_CHUNKED: "chunked",
+    SERIALIZER_LOG: "log",
+}
+
+FLAG_EXCEPTION = 1 << 0
+"""The payload is an exception raised by the function, cached on purpose."""
+FLAG_BLOB = 1 << 1
+"""The payload is the hex digest of a shared blob holding the pickle."""
+FLAG_TUPLE = 1 << 2
+"""The chunked payload holds the items of a tuple rather than a list."""
+
+_HEADER = struct.Struct("<4sBBHddQQd")
+_USAGE = struct.Struct("<Qd")
+HEADER_SIZE = _HEADER.size
+USAGE_OFFSET = HEADER_SIZE - _USAGE.size
+
+
+class EntryHeader(NamedTuple):
+    serializer: int
+    flags: int
+    created: float
+    compute_seconds: float
+    payload_size: int
+    hits: int = 0
+    load_seconds: float = 0.0
+
+
+def is_exception(header: EntryHeader | None) -> TypeGuard[EntryHeader]:
+    return header is not None and bool(header.flags & FLAG_EXCEPTION)
+
+
+def is_blob_reference(
+    header: EntryHeader | None,
+) -> TypeGuard[EntryHeader]:
+    return header is not None and bool(header.flags & FLAG_BLOB)
+
+
+def encode_raw(value: object) -> tuple[int, bytes | None]:
+    """Pick the serializer for ``value``; ``None`` data means pickle it.
+
+    Only exact ``str`` and ``bytes`` are stored raw, so subclasses keep their
+    type through pickle. Strings with lone surrogates, such as undecodable
+    file names from ``os.fsdecode``, are not valid UTF-8 and are pickled too.
+    """
+    if type(value) is str:
+        try:
+            return SERIALIZER_UTF8, value.encode("utf-8")
+        except UnicodeEncodeError:
+            return SERIALIZER_PICKLE, None
+    if type(value) is bytes:
+        return SERIALIZER_BYTES, value
+    return SERIALIZER_PICKLE, None
+
+
+def decode_raw(serializer: int, data: bytes) -> str | bytes:
+    if serializer == SERIALIZER_UTF8:
+        return data.decode("utf-8")
+    if serializer == SERIALIZER_BYTES:
+        return data
+    raise EOFError(f"Unsupported cache entry serializer {serializer}.")
+
+
+def pack_header(header: EntryHeader) -> bytes:
+    return _HEADER.pack(MAGIC, FORMAT_VERSION, *header)
+
+
+def unpack_header(data: bytes) -> EntryHeader | None:
+    """Parse a header, returning ``None`` for legacy bare-pickle entries.
+
+    Raises ``EOFError`` for a truncated header so callers can treat it like
+    any other corrupt entry.
+    """
+    if data[: len(MAGIC)] != MAGIC:
+        return None
+    if len(data) < HEADER_SIZE:
+        raise EOFError("Cache entry header is truncated.")
+    _, version, *fields = _HEADER.unpack_from(data)
+    if version != FORMAT_VERSION:
+        raise EOFError(f"Unsupported cache entry format version {version}.")
+    return EntryHeader(*fields)
+
+
+def read_header(f: IO[bytes]) -> EntryHeader | None:
+    """Read a header from ``f``, leaving it positioned at the payload.
+
+    Legacy entries rewind ``f`` so the bare pickle can be read from the start.
+    """
+    header = unpack_header(f.read(HEADER_SIZE))
+    if header is None:
+        f.seek(0)
+    return header
+
+
+def read_blob_digest(f: IO[bytes]) -> str | None:
+    """Return the blob digest referenced by the entry in ``f``, if any."""
+    header = read_header(f)
+    if not is_blob_reference(header):
+        return None
+    return decode_digest(f.read(header.payload_size))
+
+
+def decode_digest(data: bytes) -> str:
+    """Validate a blob reference payload so it can never name another path."""
+    if len(data) != 64 or not all(
+        character in b"0123456789abcdef" for character in data
+    ):
+        raise EOFError("Cache blob reference is malformed.")
+    return data.decode("ascii")
+
+
+def add_usage(
+    path: str,
+    created: float,
+    hits: int,
+    load_seconds: float,
+) -> None:
+    """Add to the usage counters of the entry at ``path`` in place.
+
+    Nothing is written if the entry has been rewritten since the hits, which
+    its creation time tells.
+    """
+    with open(path, "r+b") as f:
+        header = read_header(f)
+        if header is None or header.created != created:
+            return
+        f.seek(USAGE_OFFSET)
+        f.write(
+            _USAGE.pack(
+                header.hits + hits,
+                header.load_seconds + load_seconds,
+            )
+        )
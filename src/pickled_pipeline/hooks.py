@@ -0,0 +1,54 @@
+"""Profiling hooks that wrap the phases of a checkpoint call.
+
+A hook is any callable taking ``(phase, checkpoint_name)`` and returning a
+context manager. The context manager is entered when the phase starts and
+exited when it ends, including when the phase raises. This matches APIs such as
+OpenTelemetry's ``tracer.start_as_current_span`` directly::
+
+    cache.add_hook(
+        lambda phase, name: tracer.start_as_current_span(f"{name}.{phase}")
+    )
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from contextlib import AbstractContextManager, ExitStack, nullcontext
+
+PhaseHook = Callable[[str, str], AbstractContextManager[object]]
+
+BIND = "bind"
+"""Binding call arguments to the signature and normalizing them."""
+KEY = "key"
+"""Serializing the normalized arguments and hashing them into a cache path."""
+LOOKUP = "lookup"
+"""Checking whether an entry exists for the key."""
+LOAD = "load"
+"""Reading and deserializing an existing entry."""
+COMPUTE = "compute"
+"""Running the decorated function."""
+SERIALIZE = "serialize"
+"""Writing the header and serialized result to a temporary file."""
+RENAME = "rename"
+"""Atomically moving the temporary file into place."""
+
+PHASES = (BIND, KEY, LOOKUP, LOAD, COMPUTE, SERIALIZE, RENAME)
+
+NO_HOOKS: AbstractContextManager[object] = nullcontext()
+
+
+def enter_hooks(
+    hooks: list[PhaseHook],
+    phase: str,
+    checkpoint_name: str,
+) -> AbstractContextManager[object]:
+    if len(hooks) == 1:
+        return hooks[0](phase, checkpoint_name)
+    stack = ExitStack()
+    try:
+        for hook in hooks:
+            stack.enter_context(hook(phase, checkpoint_name))
+    except BaseException:
+        stack.close()
+        raise
+    return stack
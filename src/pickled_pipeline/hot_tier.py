@@ -0,0 +1,333 @@
+"""Host-local shared-memory tier for hot cache entries.
+
+Worker processes on one host that share a cache directory can also share an
+arena file memory-mapped from ``/dev/shm`` (or the temporary directory). The
+arena holds serialized entries (header plus payload), so a hit that another
+worker already loaded skips opening and reading the entry file.
+
+Layout::
+
+    header   64 bytes   magic, slot count, data size, ring cursor
+    slots    40 bytes   each: key digest, sequence, ring position, length
+    data     ring buffer of entry bytes
+
+Slots are direct-mapped by key, so a new entry replaces whatever shared its
+slot. Data is appended at a monotonically increasing ring position; an entry
+is valid while its position is within ``data size`` bytes of the cursor, so
+old entries are evicted first-in, first-out as the ring wraps.
+
+Processes coordinate with ``flock`` on the arena file: shared for reads,
+exclusive for writes. The kernel releases those locks when a process dies. A
+writer marks a slot with an odd sequence number while filling it, so a slot
+left half-written by a crash reads as empty until it is reused. Deleting the
+arena file at any time is safe; processes that still map it keep working on the
+old inode and new processes start a fresh one.
+
+Every process with the arena open also holds a shared ``flock`` on a sibling
+``.lock`` file. The last holder to close removes both files, and
+:func:`reap_arenas` removes arenas whose holders all died without closing.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import threading
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+_MAGIC = b"PPLHOT01"
+_HEADER = struct.Struct("<8sQQQ")
+_CURSOR_OFFSET = 24
+_HEADER_SIZE = 64
+_SLOT = struct.Struct("<16sQQQ")
+_CURSOR = struct.Struct("<Q")
+
+# One slot per 4 KiB of data keeps the slot table under 1% of the arena.
+_BYTES_PER_SLOT = 4096
+_MIN_SLOTS = 64
+
+
+_ARENA_PREFIX = "pickled-pipeline-"
+_ARENA_SUFFIX = ".arena"
+_LOCK_SUFFIX = ".lock"
+
+
+def arena_path(cache_dir: str) -> str:
+    """Return the host-local arena path for ``cache_dir``."""
+    digest = hashlib.sha256(
+        os.path.realpath(cache_dir).encode("utf-8")
+    ).hexdigest()[:16]
+    return os.path.join(
+        _arena_directory(),
+        f"{_ARENA_PREFIX}{digest}{_ARENA_SUFFIX}",
+    )
+
+
+def reap_arenas() -> int:
+    """Remove the arenas on this host that no process holds open.
+
+    Returns the number removed. Arenas in use are left alone.
+    """
+    if fcntl is None:
+        return 0
+    directory = _arena_directory()
+    removed = 0
+    with os.scandir(directory) as entries:
+        names = [
+            dir_entry.name
+            for dir_entry in entries
+            if dir_entry.name.startswith(_ARENA_PREFIX)
+            and dir_entry.name.endswith(_ARENA_SUFFIX)
+        ]
+    for name in names:
+        if _remove_if_unheld(os.path.join(directory, name)):
+            removed += 1
+    return removed
+
+
+def _arena_directory() -> str:
+    return "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+
+def _hold(lock_path: str) -> int:
+    # A remover unlinks the lock file while holding it exclusively, so a
+    # shared hold only counts once it is on the file still at lock_path.
+    while True:
+        fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_SH)
+            if os.fstat(fd).st_ino == os.stat(lock_path).st_ino:
+                return fd
+        except FileNotFoundError:
+            pass
+        except BaseException:
+            os.close(fd)
+            raise
+        os.close(fd)
+
+
+def _remove_if_unheld(path: str) -> bool:
+    # Creating a missing lock file makes a process opening the arena
+    # meanwhile wait for the removal, then hold the arena it recreates.
+    lock_path = path + _LOCK_SUFFIX
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            if os.fstat(fd).st_ino != os.stat(lock_path).st_ino:
+                # Another remover got here first.
+                return False
+        except (BlockingIOError, FileNotFoundError):
+            return False
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            return False
+        finally:
+            os.remove(lock_path)
+        return True
+    finally:
+        os.close(fd)
+
+
+class HotTier:
+    """Shared, size-bounded map from entry key digests to entry bytes."""
+
+    def __init__(self, path: str, size: int):
+        if fcntl is None:
+            raise RuntimeError("The shared hot tier requires a POSIX system.")
+        if size < _MIN_SLOTS * _BYTES_PER_SLOT:
+            raise ValueError(
+                f"hot tier size must be at least "
+                f"{_MIN_SLOTS * _BYTES_PER_SLOT} bytes."
+            )
+        self.path = path
+        self.size = size
+        self._closed = False
+        self._open()
+
+    @property
+    def max_entry_bytes(self) -> int:
+        # Larger entries would evict too much of the ring at once.
+        return self._data_size // 4
+
+    def get(self, key: bytes) -> bytes | None:
+        self._check_pid()
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_SH)
+            try:
+                slot_offset = self._slot_offset(key)
+                slot_key, sequence, position, length = _SLOT.unpack_from(
+                    self._map,
+                    slot_offset,
+                )
+                if slot_key != key or sequence & 1 or not length:
+                    return None
+                (cursor,) = _CURSOR.unpack_from(self._map, _CURSOR_OFFSET)
+                if position + self._data_size < cursor:
+                    return None
+                start = self._data_start + position % self._data_size
+                return self._map[start : start + length]
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def put(self, key: bytes, data: bytes) -> bool:
+        if len(data) > self.max_entry_bytes:
+            return False
+        self._check_pid()
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                (cursor,) = _CURSOR.unpack_from(self._map, _CURSOR_OFFSET)
+                # Entries never wrap; skip the tail of the current lap instead.
+                if cursor % self._data_size + len(data) > self._data_size:
+                    cursor += self._data_size - cursor % self._data_size
+                slot_offset = self._slot_offset(key)
+                _, sequence, _, _ = _SLOT.unpack_from(self._map, slot_offset)
+                sequence |= 1
+                _SLOT.pack_into(self._map, slot_offset, key, sequence, 0, 0)
+                start = self._data_start + cursor % self._data_size
+                self._map[start : start + len(data)] = data
+                _CURSOR.pack_into(
+                    self._map,
+                    _CURSOR_OFFSET,
+                    cursor + len(data),
+                )
+                _SLOT.pack_into(
+                    self._map,
+                    slot_offset,
+                    key,
+                    sequence + 1,
+                    cursor,
+                    len(data),
+                )
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        return True
+
+    def discard(self, key: bytes) -> None:
+        self._check_pid()
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                slot_offset = self._slot_offset(key)
+                slot_key, sequence, _, _ = _SLOT.unpack_from(
+                    self._map,
+                    slot_offset,
+                )
+                if slot_key == key:
+                    _SLOT.pack_into(
+                        self._map,
+                        slot_offset,
+                        bytes(16),
+                        (sequence | 1) + 1,
+                        0,
+                        0,
+                    )
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def clear(self) -> None:
+        self._check_pid()
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                self._map[_HEADER_SIZE : self._data_start] = bytes(
+                    self._data_start - _HEADER_SIZE
+                )
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def remove(self) -> None:
+        """Empty and unlink the arena, then continue on a fresh one.
+
+        Other processes that have it open keep the emptied old arena until
+        they close.
+        """
+        self.clear()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        self._release()
+        self._open()
+
+    def close(self) -> None:
+        """Unmap the arena, removing it if no other process holds it."""
+        if self._closed:
+            return
+        self._closed = True
+        self._release()
+        _remove_if_unheld(self.path)
+
+    def _release(self) -> None:
+        self._map.close()
+        os.close(self._fd)
+        os.close(self._holder_fd)
+
+    def _open(self) -> None:
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._holder_fd = _hold(self.path + _LOCK_SUFFIX)
+        try:
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        except BaseException:
+            os.close(self._holder_fd)
+            raise
+        try:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                slot_count, data_size = self._read_or_init_geometry()
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            self._map = mmap.mmap(self._fd, os.fstat(self._fd).st_size)
+        except BaseException:
+            os.close(self._fd)
+            os.close(self._holder_fd)
+            raise
+        self._slot_count = slot_count
+        self._data_size = data_size
+        self._data_start = _HEADER_SIZE + slot_count * _SLOT.size
+
+    def _read_or_init_geometry(self) -> tuple[int, int]:
+        # The first process to open the arena sets its geometry; later
+        # processes adopt it even if they asked for a different size.
+        header = os.pread(self._fd, _HEADER.size, 0)
+        if len(header) == _HEADER.size:
+            magic, slot_count, data_size, _ = _HEADER.unpack(header)
+            file_size = os.fstat(self._fd).st_size
+            if magic == _MAGIC and file_size == (
+                _HEADER_SIZE + slot_count * _SLOT.size + data_size
+            ):
+                return slot_count, data_size
+        slot_count = max(_MIN_SLOTS, self.size // _BYTES_PER_SLOT)
+        data_size = self.size
+        os.ftruncate(self._fd, 0)
+        os.ftruncate(
+            self._fd,
+            _HEADER_SIZE + slot_count * _SLOT.size + data_size,
+        )
+        os.pwrite(
+            self._fd,
+            _HEADER.pack(_MAGIC, slot_count, data_size, 0),
+            0,
+        )
+        return slot_count, data_size
+
+    def _check_pid(self) -> None:
+        # A forked child shares the parent's open file description, and with
+        # it the parent's flock state, so it needs its own descriptor.
+        if self._pid != os.getpid():
+            self._release()
+            self._open()
+
+    def _slot_offset(self, key: bytes) -> int:
+        index = int.from_bytes(key[:8], "little") % self._slot_count
+        return _HEADER_SIZE + index * _SLOT.size
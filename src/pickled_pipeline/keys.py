@@ -0,0 +1,134 @@
+"""Canonical byte encoding of cache key inputs.
+
+Equal arguments should produce equal keys even when their representations
+differ. :func:`canonical_key` rewrites the common built-in types into one
+canonical form before pickling:
+
+- ``dict`` items and ``set``/``frozenset`` members are sorted, so insertion
+  order does not matter;
+- ``list``, ``tuple``, and ``ChunkedSequence`` encode alike, as do ``bytes``
+  and ``bytearray``;
+- a ``float`` with an integral value encodes as the equal ``int``.
+
+``bool`` stays distinct from ``int`` because functions commonly branch on it.
+Other objects, including subclasses of the types above, are pickled as they
+are. The pickler runs without its memo, so the bytes depend only on values,
+never on which equal objects happen to be shared.
+"""
+
+from __future__ import annotations
+
+import io
+import operator
+import pickle
+import threading
+from typing import Any
+
+from pickled_pipeline.chunked import ChunkedSequence
+
+_PROTOCOL = 5
+
+# Values of these types are already canonical, so containers holding only
+# them are copied in C without visiting each item from Python.
+_ATOMIC_TYPES = frozenset({str, int, bool, type(None), bytes})
+
+_first = operator.itemgetter(0)
+_local = threading.local()
+
+
+class _Set:
+    """Canonical form of a set: its sorted members, hashable so sets can be
+    dict keys, and neither equal nor ordered against any other value."""
+
+    __slots__ = ("members",)
+
+    def __init__(self, members: tuple[Any, ...]):
+        self.members = members
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return _Set, (self.members,)
+
+    def __hash__(self) -> int:
+        return hash(self.members)
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not _Set:
+            return NotImplemented
+        return self.members == other.members
+
+    def __lt__(self, other: object) -> bool:
+        if type(other) is not _Set:
+            return NotImplemented
+        return self.members < other.members
+
+
+def canonical_key(value: Any) -> bytes:
+    try:
+        return _dumps(_canonical(value))
+    except (RecursionError, ValueError):
+        # Cyclic values need the memo: containers recurse without end, and
+        # the memo-less pickler rejects other objects with ValueError. Key
+        # them, like deeply nested values, by plain pickle.
+        return b"p" + pickle.dumps(value, protocol=_PROTOCOL)
+
+
+def _dumps(value: Any) -> bytes:
+    # Creating a pickler costs more than pickling a small key, so each
+    # thread reuses one.
+    state = getattr(_local, "pickler", None)
+    if state is None:
+        buffer = io.BytesIO()
+        pickler = pickle.Pickler(buffer, protocol=_PROTOCOL)
+        pickler.fast = True
+        state = _local.pickler = (buffer, pickler)
+    buffer, pickler = state
+    buffer.seek(0)
+    buffer.truncate()
+    pickler.dump(value)
+    return b"c" + buffer.getvalue()
+
+
+def _canonical(value: Any) -> Any:
+    # Canonical values use tuples for sequences and _Set for sets, so none
+    # of them collides with another kind.
+    kind = type(value)
+    if kind in _ATOMIC_TYPES:
+        return value
+    if kind is tuple or kind is list or kind is ChunkedSequence:
+        return _canonical_items(value)
+    if kind is dict:
+        pairs = list(
+            zip(_canonical_items(value), _canonical_items(value.values()))
+        )
+        try:
+            pairs.sort(key=_first)
+        except TypeError:
+            pairs.sort(key=_dumped_key)
+        try:
+            # Dicts pickle in insertion order, which is now sorted.
+            return dict(pairs)
+        except TypeError:
+            # A key whose canonical form is unhashable; keep the original.
+            return value
+    if kind is float:
+        return int(value) if value.is_integer() else value
+    if kind is set or kind is frozenset:
+        members = list(_canonical_items(value))
+        try:
+            members.sort()
+        except TypeError:
+            members.sort(key=_dumps)
+        return _Set(tuple(members))
+    if kind is bytearray:
+        return bytes(value)
+    return value
+
+
+def _canonical_items(values: Any) -> tuple[Any, ...]:
+    if _ATOMIC_TYPES.issuperset(map(type, values)):
+        return tuple(values)
+    return tuple(map(_canonical, values))
+
+
+def _dumped_key(pair: tuple[Any, Any]) -> bytes:
+    return _dumps(pair[0])
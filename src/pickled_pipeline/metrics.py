@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass, field, fields
+
+from pickled_pipeline import entry
+from pickled_pipeline.entry import EntryHeader
+
+
+@dataclass
+class CheckpointMetrics:
+    """In-process counters and cumulative timings for one checkpoint.
+
+    Timings are wall-clock seconds measured with ``time.perf_counter``. The
+    counters only describe calls made by the current process; they are not
+    persisted to the cache directory.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    bypasses: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+    key_seconds: float = 0.0
+    load_seconds: float = 0.0
+    compute_seconds: float = 0.0
+    store_seconds: float = 0.0
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock,
+        init=False,
+        repr=False,
+        compare=False,
+    )
+
+    def record_key(self, seconds: float) -> None:
+        with self._lock:
+            self.key_seconds += seconds
+
+    def record_hit(self, bytes_read: int, load_seconds: float) -> None:
+        with self._lock:
+            self.hits += 1
+            self.bytes_read += bytes_read
+            self.load_seconds += load_seconds
+
+    def record_miss(
+        self,
+        compute_seconds: float,
+        bytes_written: int,
+        store_seconds: float,
+    ) -> None:
+        with self._lock:
+            self.misses += 1
+            self.compute_seconds += compute_seconds
+            self.bytes_written += bytes_written
+            self.store_seconds += store_seconds
+
+    def record_bypass(self, compute_seconds: float) -> None:
+        with self._lock:
+            self.bypasses += 1
+            self.compute_seconds += compute_seconds
+
+    def snapshot(self) -> CheckpointMetrics:
+        with self._lock:
+            return CheckpointMetrics(
+                **{
+                    metric.name: getattr(self, metric.name)
+                    for metric in fields(self)
+                    if metric.init
+                }
+            )
+
+    def reset(self) -> None:
+        with self._lock:
+            for metric in fields(self):
+                if metric.init:
+                    setattr(self, metric.name, metric.default)
+
+
+@dataclass(frozen=True)
+class CheckpointStats:
+    """Persisted cost and benefit of one checkpoint, read from entry headers.
+
+    Every entry was created by exactly one miss, so ``entries`` doubles as the
+    miss count when computing the hit ratio. Entries written before headers
+    existed only contribute to ``entries`` and ``disk_bytes``.
+    """
+
+    entries: int = 0
+    hits: int = 0
+    disk_bytes: int = 0
+    payload_bytes: int = 0
+    compute_seconds: float = 0.0
+    load_seconds: float = 0.0
+    time_saved_seconds: float = 0.0
+
+    @classmethod
+    def from_entries(
+        cls,
+        entries: Iterable[tuple[int, EntryHeader | None]],
+    ) -> CheckpointStats:
+        count = hits = disk_bytes = payload_bytes = 0
+        compute_seconds = load_seconds = time_saved_seconds = 0.0
+        for entry_disk_bytes, header in entries:
+            count += 1
+            disk_bytes += entry_disk_bytes
+            if header is None:
+                continue
+            hits += header.hits
+            payload_bytes += header.payload_size
+            compute_seconds += header.compute_seconds
+            load_seconds += header.load_seconds
+            time_saved_seconds += (
+                header.hits * header.compute_seconds - header.load_seconds
+            )
+        return cls(
+            entries=count,
+            hits=hits,
+            disk_bytes=disk_bytes,
+            payload_bytes=payload_bytes,
+            compute_seconds=compute_seconds,
+            load_seconds=load_seconds,
+            time_saved_seconds=time_saved_seconds,
+        )
+
+    @property
+    def hit_ratio(self) -> float:
+        calls = self.hits + self.entries
+        return self.hits / calls if calls else 0.0
+
+    @property
+    def mean_compute_seconds(self) -> float:
+        return self.compute_seconds / self.entries if self.entries else 0.0
+
+    @property
+    def mean_load_seconds(self) -> float:
+        return self.load_seconds / self.hits if self.hits else 0.0
+
+
+@dataclass(frozen=True)
+class EntryInfo:
+    """Metadata of one cache entry, read from its header and filename.
+
+    Entries written before headers existed report ``"pickle"`` as their
+    serializer, their file size and modification time, and no compute time.
+    """
+
+    checkpoint: str
+    key: str
+    created: float
+    payload_bytes: int
+    disk_bytes: int
+    serializer: str
+    compute_seconds: float | None
+    hits: int
+    cached_exception: bool = False
+    deduplicated: bool = False
+
+    @classmethod
+    def from_header(
+        cls,
+        checkpoint: str,
+        key: str,
+        disk_bytes: int,
+        modified: float,
+        header: EntryHeader | None,
+    ) -> EntryInfo:
+        if header is None:
+            return cls(
+                checkpoint=checkpoint,
+                key=key,
+                created=modified,
+                payload_bytes=disk_bytes,
+                disk_bytes=disk_bytes,
+                serializer=entry.SERIALIZER_NAMES[entry.SERIALIZER_PICKLE],
+                compute_seconds=None,
+                hits=0,
+            )
+        return cls(
+            checkpoint=checkpoint,
+            key=key,
+            created=header.created,
+            payload_bytes=header.payload_size,
+            disk_bytes=disk_bytes,
+            serializer=entry.SERIALIZER_NAMES.get(
+                header.serializer,
+                f"unknown({header.serializer})",
+            ),
+            compute_seconds=header.compute_seconds,
+            hits=header.hits,
+            cached_exception=entry.is_exception(header),
+            deduplicated=entry.is_blob_reference(header),
+        )
@@ -0,0 +1,146 @@
+"""Predictive prefetch of cache entries from a previous run's access trace.
+
+A run with prefetching enabled records the first access to each entry. The
+next run replays that trace on a background thread, loading entries a few
+steps ahead of the pipeline so hits are already deserialized when requested.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections.abc import Callable
+from typing import Generic, TypeVar
+
+from pickled_pipeline.recovery import temp_prefix
+
+ACCESS_TRACE_FILENAME = "access_trace.json"
+
+logger = logging.getLogger(__name__)
+
+V = TypeVar("V")
+
+
+def read_trace(cache_dir: str) -> list[str]:
+    try:
+        with open(
+            os.path.join(cache_dir, ACCESS_TRACE_FILENAME),
+            encoding="utf-8",
+        ) as f:
+            trace = json.load(f)
+    except (OSError, ValueError):
+        return []
+    if not isinstance(trace, list):
+        return []
+    return [filename for filename in trace if isinstance(filename, str)]
+
+
+def write_trace(cache_dir: str, trace: list[str]) -> None:
+    """Atomically replace the access trace; a no-op for an empty trace."""
+    if not trace or not os.path.isdir(cache_dir):
+        return
+    fd, temp_path = tempfile.mkstemp(
+        prefix=temp_prefix(),
+        suffix=".json",
+        dir=cache_dir,
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(trace, f)
+        os.replace(temp_path, os.path.join(cache_dir, ACCESS_TRACE_FILENAME))
+    except OSError:
+        logger.debug("Could not save the access trace.", exc_info=True)
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+
+
+class Prefetcher(Generic[V]):
+    """Loads planned entries on a daemon thread, at most ``depth`` ahead.
+
+    The caller reports each requested path through :meth:`take`, which moves
+    the window forward. Entries the caller has passed are dropped, so memory
+    stays bounded by ``depth`` loaded values.
+    """
+
+    def __init__(
+        self,
+        plan: list[str],
+        load: Callable[[str], V | None],
+        depth: int,
+    ):
+        self._plan = plan
+        self._positions = {path: index for index, path in enumerate(plan)}
+        self._load = load
+        self._depth = depth
+        self._ready: dict[str, V] = {}
+        self._loading: str | None = None
+        self._cursor = 0
+        self._next = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="pickled-pipeline-prefetch",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def take(self, path: str) -> V | None:
+        """Return the prefetched value for ``path``, or ``None``."""
+        with self._condition:
+            index = self._positions.get(path)
+            if index is None:
+                return None
+            self._cursor = max(self._cursor, index + 1)
+            while self._loading == path:
+                self._condition.wait()
+            value = self._ready.pop(path, None)
+            for passed in [
+                ready_path
+                for ready_path in self._ready
+                if self._positions[ready_path] < self._cursor
+            ]:
+                del self._ready[passed]
+            self._condition.notify_all()
+            return value
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._ready.clear()
+            self._condition.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._closed and (
+                    self._next < len(self._plan)
+                    and self._next >= self._cursor + self._depth
+                ):
+                    self._condition.wait()
+                if self._closed or self._next >= len(self._plan):
+                    return
+                index = self._next
+                self._next += 1
+                if index < self._cursor:
+                    continue
+                path = self._plan[index]
+                self._loading = path
+            try:
+                value = self._load(path)
+            except Exception:
+                # The caller loads the entry itself and handles any error.
+                logger.debug("Prefetching '%s' failed.", path, exc_info=True)
+                value = None
+            with self._condition:
+                self._loading = None
+                # A value the caller has already passed is dropped by the
+                # next take(); keeping it here lets a waiting take() claim it.
+                if value is not None and not self._closed:
+                    self._ready[path] = value
+                self._condition.notify_all()
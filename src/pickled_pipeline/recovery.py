@@ -0,0 +1,71 @@
+"""Temporary file naming and recovery after crashed writers.
+
+Every temporary file starts with :data:`TEMP_PREFIX` followed by the writer's
+process id and host, as in ``.pickled-pipeline-1234@build-07@k2x9q1ab.pkl``.
+A repair pass can then tell an orphan of a dead process from a write still in
+progress.
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+import re
+from dataclasses import dataclass
+
+TEMP_PREFIX = ".pickled-pipeline-"
+DEFAULT_TEMP_MAX_AGE = 3600.0
+
+
+@dataclass(frozen=True)
+class RepairReport:
+    """What a :meth:`Cache.repair` pass changed."""
+
+    temp_files_removed: int
+    checkpoints_recovered: tuple[str, ...]
+    blobs_removed: int
+    arenas_removed: int = 0
+
+
+def temp_prefix() -> str:
+    return f"{TEMP_PREFIX}{os.getpid()}@{_host()}@"
+
+
+def is_orphaned_temp(name: str, age: float, max_age: float) -> bool:
+    """Whether the temporary file ``name`` can no longer be committed.
+
+    A file is orphaned once it is older than ``max_age`` seconds, or as soon
+    as the process on this host that created it has exited. Files from
+    other hosts, and from before owners were recorded, are judged by age
+    alone.
+    """
+    if not name.startswith(TEMP_PREFIX):
+        return False
+    if age > max_age:
+        return True
+    owner, separator, rest = name[len(TEMP_PREFIX) :].partition("@")
+    host = rest.partition("@")[0]
+    if not separator or not owner.isdigit() or host != _host():
+        return False
+    return not _process_exists(int(owner))
+
+
+@functools.cache
+def _host() -> str:
+    # socket is slow to import and only needed once a temporary file is named.
+    import socket
+
+    return re.sub(r"[^A-Za-z0-9.-]", "", socket.gethostname()) or "localhost"
+
+
+def _process_exists(pid: int) -> bool:
+    # On Windows os.kill(pid, 0) terminates the process instead of probing it.
+    if os.name == "nt":
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import threading
+import time
+import weakref
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from typing import TYPE_CHECKING
+
+# Only async callers need asyncio, and by then it is already imported.
+if TYPE_CHECKING:
+    import asyncio
+
+
+class TokenBucket:
+    """Thread-safe token bucket that admits ``rate`` calls per second.
+
+    The bucket holds up to ``capacity`` tokens (one second's worth by default,
+    and never less than one). Callers reserve a token under a lock and then
+    sleep outside it until their reservation matures, so sync and async
+    callers share one bucket without polling.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive.")
+        self.rate = rate
+        self.capacity = max(1.0, rate if capacity is None else capacity)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token and return how long to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity,
+                self._tokens + (now - self._updated) * self.rate,
+            )
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self) -> None:
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        import asyncio
+
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+
+class Throttle:
+    """Concurrency limit and rate limit applied around checkpoint misses."""
+
+    def __init__(
+        self,
+        max_concurrency: int | None = None,
+        rate: float | None = None,
+    ):
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+        self.max_concurrency = max_concurrency
+        self.bucket = TokenBucket(rate) if rate is not None else None
+        self._semaphore = (
+            threading.BoundedSemaphore(max_concurrency)
+            if max_concurrency is not None
+            else None
+        )
+        # asyncio primitives belong to one event loop, so each loop that
+        # calls the checkpoint gets its own semaphore.
+        self._async_semaphores: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop,
+            asyncio.Semaphore,
+        ] = weakref.WeakKeyDictionary()
+        self._async_lock = threading.Lock()
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        if self._semaphore is not None:
+            self._semaphore.acquire()
+        try:
+            if self.bucket is not None:
+                self.bucket.acquire()
+            yield
+        finally:
+            if self._semaphore is not None:
+                self._semaphore.release()
+
+    @asynccontextmanager
+    async def async_slot(self) -> AsyncIterator[None]:
+        semaphore = self._async_semaphore()
+        if semaphore is not None:
+            await semaphore.acquire()
+        try:
+            if self.bucket is not None:
+                await self.bucket.acquire_async()
+            yield
+        finally:
+            if semaphore is not None:
+                semaphore.release()
+
+    def _async_semaphore(self) -> asyncio.Semaphore | None:
+        import asyncio
+
+        if self.max_concurrency is None:
+            return None
+        loop = asyncio.get_running_loop()
+        with self._async_lock:
+            semaphore = self._async_semaphores.get(loop)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self.max_concurrency)
+                self._async_semaphores[loop] = semaphore
+            return semaphore
@@ -0,0 +1,87 @@
+"""
+Tests for adaptive bypass of checkpoints that are cheaper to recompute than to
+load from the cache.
+"""
+
+import os
+import time
+
+import pytest
+
+from pickled_pipeline import AdaptivePolicy
+
+
+def _payload_files(cache):
+    return [
+        filename
+        for filename in os.listdir(cache.cache_dir)
+        if filename != "cache_manifest.json"
+    ]
+
+
+def test_cheap_checkpoint_is_bypassed_after_enough_load_samples(cache):
+    calls = {"count": 0}
+    policy = AdaptivePolicy(min_samples=2, reevaluate_every=1000, margin=0.0)
+
+    @cache.checkpoint(name="cheap", adaptive=policy)
+    def cheap(x):
+        calls["count"] += 1
+        return x
+
+    cheap(1)
+    cheap(1)
+    cheap(1)
+    assert calls["count"] == 1
+
+    # The load samples now exceed the (zero-margin) compute cost, so further
+    # calls run the function and skip the cache entirely.
+    cheap(1)
+    cheap(2)
+    assert calls["count"] == 3
+    assert len(_payload_files(cache)) == 1
+    assert cache.metrics()["cheap"].bypasses == 2
+
+
+def test_expensive_checkpoint_keeps_using_the_cache(cache):
+    calls = {"count": 0}
+
+    @cache.checkpoint(name="expensive", adaptive=True)
+    def expensive(x):
+        calls["count"] += 1
+        # Sleep so computing is clearly slower than loading a small pickle.
+        time.sleep(0.01)
+        return x
+
+    for _ in range(10):
+        expensive(1)
+
+    assert calls["count"] == 1
+    assert cache.metrics()["expensive"].bypasses == 0
+
+
+def test_bypassed_checkpoint_is_periodically_reevaluated(cache):
+    calls = {"count": 0}
+    policy = AdaptivePolicy(min_samples=1, reevaluate_every=3, margin=0.0)
+
+    @cache.checkpoint(name="cheap", adaptive=policy)
+    def cheap():
+        calls["count"] += 1
+        return "value"
+
+    cheap()
+    cheap()
+    assert calls["count"] == 1
+
+    for _ in range(6):
+        cheap()
+
+    # Two of the six calls probe the cache and are served from it.
+    assert calls["count"] == 5
+    assert cache.metrics()["cheap"].hits == 3
+
+
+def test_adaptive_policy_rejects_invalid_settings():
+    with pytest.raises(ValueError):
+        AdaptivePolicy(min_samples=0)
+    with pytest.raises(ValueError):
+        AdaptivePolicy(reevaluate_every=0)
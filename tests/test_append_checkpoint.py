@@ -0,0 +1,106 @@
+"""
+Tests for append checkpoints backed by an append-only log.
+"""
+
+import os
+
+import pytest
+from pickled_pipeline import Cache, entry
+
+
+def _log_header(cache):
+    (filename,) = [
+        name for name in os.listdir(cache.cache_dir) if name.endswith(".pkl")
+    ]
+    with open(os.path.join(cache.cache_dir, filename), "rb") as f:
+        header = entry.read_header(f)
+    assert header is not None
+    return header, os.path.join(cache.cache_dir, filename)
+
+
+def _corpus(cache, seen_batches, compact_after=64):
+    @cache.append_checkpoint(
+        name="corpus",
+        exclude_args=["batch"],
+        compact_after=compact_after,
+    )
+    def corpus(existing, batch):
+        seen_batches.append(list(existing))
+        return [doc for doc in batch if doc not in existing]
+
+    return corpus
+
+
+def test_calls_append_only_new_items(cache):
+    seen: list[list[str]] = []
+    corpus = _corpus(cache, seen)
+
+    assert corpus(["a", "b"]) == ["a", "b"]
+    header, _ = _log_header(cache)
+    first_size = header.payload_size
+
+    assert corpus(["b", "c"]) == ["a", "b", "c"]
+    header, _ = _log_header(cache)
+    assert header.serializer == entry.SERIALIZER_LOG
+    assert header.payload_size < 2 * first_size + 8
+
+    reopened = Cache(cache_dir=cache.cache_dir)
+    assert _corpus(reopened, seen)(["d"]) == ["a", "b", "c", "d"]
+    assert seen == [[], ["a", "b"], ["a", "b", "c"]]
+    assert reopened.list_checkpoints() == ["corpus"]
+
+
+def test_log_is_compacted_after_enough_records(cache):
+    corpus = _corpus(cache, [], compact_after=3)
+    for doc in "abc":
+        corpus([doc])
+    header, _ = _log_header(cache)
+    appended_size = header.payload_size
+
+    assert corpus(["d"]) == ["a", "b", "c", "d"]
+    header, _ = _log_header(cache)
+    assert header.payload_size < appended_size
+    assert corpus(["e"]) == ["a", "b", "c", "d", "e"]
+
+
+def test_uncommitted_tail_is_ignored(cache):
+    corpus = _corpus(cache, [])
+    corpus(["a"])
+    _, path = _log_header(cache)
+    with open(path, "ab") as f:
+        f.write(b"\x99" * 13)
+
+    assert corpus(["b"]) == ["a", "b"]
+    assert corpus([]) == ["a", "b"]
+
+
+def test_corrupt_log_starts_over(cache):
+    corpus = _corpus(cache, [])
+    corpus(["a"])
+    _, path = _log_header(cache)
+    with open(path, "r+b") as f:
+        f.truncate(entry.HEADER_SIZE + 4)
+
+    assert corpus(["b"]) == ["b"]
+
+
+def test_key_uses_remaining_arguments(cache):
+    @cache.append_checkpoint(name="events", exclude_args=["count"])
+    def events(existing, source, count):
+        return [f"{source}-{len(existing) + i}" for i in range(count)]
+
+    assert events("x", 2) == ["x-0", "x-1"]
+    assert events("y", 1) == ["y-0"]
+    assert events("x", 1) == ["x-0", "x-1", "x-2"]
+
+
+def test_truncation_removes_logs(cache):
+    corpus = _corpus(cache, [])
+    corpus(["a"])
+    cache.truncate_cache("corpus")
+    assert corpus(["b"]) == ["b"]
+
+
+def test_function_needs_an_items_parameter(cache):
+    with pytest.raises(ValueError):
+        cache.append_checkpoint()(lambda: [])
@@ -0,0 +1,154 @@
+"""
+Tests for packing caches into archives, unpacking them, and mounting them.
+"""
+
+import os
+import zipfile
+
+import pytest
+from pickled_pipeline import Cache
+
+
+def _build_cache(cache_dir, **cache_options):
+    cache = Cache(cache_dir=cache_dir, **cache_options)
+
+    @cache.checkpoint(name="load")
+    def load(x):
+        return {"rows": list(range(x))}
+
+    @cache.checkpoint(name="summarize")
+    def summarize(x):
+        return f"summary-{x}"
+
+    for x in range(3):
+        load(x)
+        summarize(x)
+    return cache
+
+
+def _strict_cache(cache_dir):
+    cache = Cache(cache_dir=cache_dir)
+
+    @cache.checkpoint(name="load")
+    def load(x):
+        raise AssertionError("load should have been a hit")
+
+    @cache.checkpoint(name="summarize")
+    def summarize(x):
+        raise AssertionError("summarize should have been a hit")
+
+    return cache, load, summarize
+
+
+def test_pack_and_unpack_round_trip(tmp_path):
+    source = _build_cache(tmp_path / "source")
+    archive_path = tmp_path / "cache.zip"
+
+    assert source.pack(archive_path) == 6
+    with zipfile.ZipFile(archive_path) as archive:
+        assert all(
+            info.compress_type == zipfile.ZIP_STORED
+            for info in archive.infolist()
+        )
+
+    target, load, summarize = _strict_cache(tmp_path / "target")
+    assert target.unpack(archive_path) == 6
+    assert target.list_checkpoints() == ["load", "summarize"]
+    assert load(2) == {"rows": [0, 1]}
+    assert summarize(1) == "summary-1"
+
+
+def test_pack_selects_checkpoints(tmp_path):
+    source = _build_cache(tmp_path / "source")
+    archive_path = tmp_path / "cache.zip"
+
+    assert source.pack(archive_path, ["summarize"]) == 3
+
+    target = Cache(cache_dir=tmp_path / "target")
+    assert target.unpack(archive_path) == 3
+    assert target.list_checkpoints() == ["summarize"]
+
+    with pytest.raises(ValueError, match="'missing' not found"):
+        source.pack(archive_path, ["missing"])
+
+
+def test_unpack_selects_checkpoints_and_merges_manifest(tmp_path):
+    source = _build_cache(tmp_path / "source")
+    archive_path = tmp_path / "cache.zip"
+    source.pack(archive_path)
+
+    target = Cache(cache_dir=tmp_path / "target")
+
+    @target.checkpoint(name="local")
+    def local():
+        return 1
+
+    local()
+    assert target.unpack(archive_path, ["load"]) == 3
+    assert target.list_checkpoints() == ["local", "load"]
+
+
+def test_deduplicated_blobs_travel_with_the_archive(tmp_path):
+    source = _build_cache(tmp_path / "source", deduplicate=True)
+    archive_path = tmp_path / "cache.zip"
+    source.pack(archive_path)
+
+    target, load, summarize = _strict_cache(tmp_path / "target")
+    target.unpack(archive_path)
+    assert len(os.listdir(target.blob_dir)) == 6
+    assert load(1) == {"rows": [0]}
+
+    mounted, load, summarize = _strict_cache(tmp_path / "mounted")
+    mounted.mount(archive_path)
+    assert summarize(2) == "summary-2"
+
+
+def test_mounted_archive_serves_hits_without_extracting(tmp_path):
+    source = _build_cache(tmp_path / "source")
+    archive_path = tmp_path / "cache.zip"
+    source.pack(archive_path)
+
+    target, load, summarize = _strict_cache(tmp_path / "target")
+    target.mount(archive_path)
+
+    assert load(2) == {"rows": [0, 1]}
+    assert summarize(0) == "summary-0"
+    assert not any(
+        name.endswith(".pkl") for name in os.listdir(target.cache_dir)
+    )
+    assert target.metrics()["load"].hits == 1
+    target.unmount(archive_path)
+
+
+def test_truncate_stops_mounted_archive_from_serving(tmp_path):
+    source = _build_cache(tmp_path / "source")
+    archive_path = tmp_path / "cache.zip"
+    source.pack(archive_path)
+
+    target = Cache(cache_dir=tmp_path / "target")
+    target.mount(archive_path)
+    calls = {"count": 0}
+
+    @target.checkpoint(name="load")
+    def load(x):
+        calls["count"] += 1
+        return "fresh"
+
+    assert load(1) == {"rows": [0]}
+    target.truncate_cache("load")
+    assert load(1) == "fresh"
+    assert calls["count"] == 1
+
+
+def test_unpack_ignores_members_outside_the_cache(tmp_path):
+    archive_path = tmp_path / "cache.zip"
+    with zipfile.ZipFile(archive_path, "w") as archive:
+        archive.writestr("cache_manifest.json", '["step"]')
+        archive.writestr(
+            "../step__" + "0" * 32 + ".pkl",
+            b"not an entry",
+        )
+
+    target = Cache(cache_dir=tmp_path / "target")
+    assert target.unpack(archive_path) == 0
+    assert not (tmp_path / ("step__" + "0" * 32 + ".pkl")).exists()
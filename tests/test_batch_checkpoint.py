@@ -0,0 +1,114 @@
+"""
+Tests for batch_checkpoint, which caches list-in, list-out functions per item
+and only passes cache misses to the wrapped function.
+"""
+
+import os
+
+import pytest
+
+
+def _payload_files(cache):
+    return [
+        filename
+        for filename in os.listdir(cache.cache_dir)
+        if filename != "cache_manifest.json"
+    ]
+
+
+def test_only_missing_items_are_passed_to_the_function(cache):
+    batches = []
+
+    @cache.batch_checkpoint(name="embed")
+    def embed(texts):
+        batches.append(list(texts))
+        return [text.upper() for text in texts]
+
+    assert embed(["a", "b"]) == ["A", "B"]
+    assert embed(["b", "c", "a", "d"]) == ["B", "C", "A", "D"]
+
+    assert batches == [["a", "b"], ["c", "d"]]
+    assert len(_payload_files(cache)) == 4
+    assert cache.list_checkpoints() == ["embed"]
+
+
+def test_fully_cached_call_does_not_invoke_the_function(cache):
+    batches = []
+
+    @cache.batch_checkpoint(name="embed")
+    def embed(texts):
+        batches.append(list(texts))
+        return [len(text) for text in texts]
+
+    embed(["one", "three"])
+    assert embed(["three", "one", "three"]) == [5, 3, 5]
+    assert len(batches) == 1
+
+
+def test_missing_items_are_split_by_max_batch_size(cache):
+    batches = []
+
+    @cache.batch_checkpoint(name="embed", max_batch_size=2)
+    def embed(texts):
+        batches.append(list(texts))
+        return texts
+
+    assert embed([1, 2, 3, 4, 5]) == [1, 2, 3, 4, 5]
+    assert batches == [[1, 2], [3, 4], [5]]
+
+
+def test_duplicate_missing_items_are_computed_once(cache):
+    batches = []
+
+    @cache.batch_checkpoint(name="embed")
+    def embed(texts):
+        batches.append(list(texts))
+        return [text * 2 for text in texts]
+
+    assert embed(["x", "y", "x"]) == ["xx", "yy", "xx"]
+    assert batches == [["x", "y"]]
+
+
+def test_other_arguments_are_part_of_each_item_key(cache):
+    batches = []
+
+    @cache.batch_checkpoint(
+        name="translate",
+        exclude_args=["client"],
+        items_arg="texts",
+    )
+    def translate(client, texts, language):
+        batches.append((language, list(texts)))
+        return [f"{language}:{text}" for text in texts]
+
+    assert translate(object(), ["hi"], "fr") == ["fr:hi"]
+    assert translate(object(), ["hi"], "de") == ["de:hi"]
+    assert translate(object(), ["hi"], "fr") == ["fr:hi"]
+    assert batches == [("fr", ["hi"]), ("de", ["hi"])]
+
+
+def test_items_arg_defaults_to_first_parameter_and_can_be_named(cache):
+    @cache.batch_checkpoint(name="scale", items_arg="values")
+    def scale(factor, values):
+        return [factor * value for value in values]
+
+    assert scale(3, [1, 2]) == [3, 6]
+
+
+def test_result_count_mismatch_raises_and_stores_nothing(cache):
+    @cache.batch_checkpoint(name="broken")
+    def broken(items):
+        return items[:-1]
+
+    with pytest.raises(ValueError, match="returned 1 results for 2 items"):
+        broken(["a", "b"])
+
+    assert _payload_files(cache) == []
+
+
+def test_unknown_items_arg_is_rejected_at_decoration(cache):
+    with pytest.raises(ValueError, match="no parameter named 'missing'"):
+
+        @cache.batch_checkpoint(items_arg="missing")
+        def step(items):
+            return items
@@ -0,0 +1,97 @@
+"""
+Tests for canonical key encoding of equivalent arguments.
+"""
+
+import pickle
+from collections import OrderedDict
+
+import pytest
+from pickled_pipeline import Cache
+from pickled_pipeline.keys import canonical_key
+
+
+@pytest.mark.parametrize(
+    ("first", "second"),
+    [
+        ({"a": 1, "b": 2}, {"b": 2, "a": 1}),
+        ({3, "x", 1.5}, {1.5, "x", 3}),
+        (frozenset({1, 2}), {2, 1}),
+        ([1, 2, 3], (1, 2, 3)),
+        (b"raw", bytearray(b"raw")),
+        (2.0, 2),
+        ({"rows": [{"id": 1.0}]}, {"rows": ({"id": 1},)}),
+        ({1: "int", "1": "str"}, {"1": "str", 1: "int"}),
+        ({frozenset({1}): 1, "k": 2}, {"k": 2, frozenset({1}): 1}),
+        (
+            {frozenset({"a", "b"}): 1, (1,): 2},
+            {(1,): 2, frozenset({"b", "a"}): 1},
+        ),
+    ],
+)
+def test_equal_values_have_equal_keys(first, second):
+    assert canonical_key(first) == canonical_key(second)
+
+
+@pytest.mark.parametrize(
+    ("first", "second"),
+    [
+        (True, 1),
+        (None, 0),
+        ("1", 1),
+        ({1, 2}, [1, 2]),
+        ({"a": 1}, [("a", 1)]),
+        ({1, 2}, (1, 2)),
+        ({frozenset({1}): 1}, {(1,): 1}),
+        (2.5, 2),
+        (OrderedDict(a=1, b=2), OrderedDict(b=2, a=1)),
+    ],
+)
+def test_different_values_have_different_keys(first, second):
+    assert canonical_key(first) != canonical_key(second)
+
+
+def test_shared_references_do_not_change_the_key():
+    text = "abc" * 3
+    copy = "".join(["abc"] * 3)
+    assert pickle.dumps([text, text]) != pickle.dumps([text, copy])
+    assert canonical_key([text, text]) == canonical_key([text, copy])
+
+
+def test_self_referencing_values_fall_back_to_pickle():
+    value: list[object] = [1]
+    value.append(value)
+    assert canonical_key(value) == canonical_key(value)
+
+
+class Node:
+    def __init__(self, name):
+        self.name = name
+        self.parent = self
+
+
+def test_self_referencing_objects_fall_back_to_pickle():
+    key = canonical_key(Node("root"))
+    assert key.startswith(b"p")
+    assert key == canonical_key(Node("root"))
+
+
+def test_opt_in_cache_hits_on_equivalent_arguments(tmp_path):
+    calls = []
+
+    def build(cache):
+        @cache.checkpoint(name="configure")
+        def configure(options, tags):
+            calls.append(options)
+            return sorted(options)
+
+        return configure
+
+    canonical = build(Cache(tmp_path / "canonical", canonical_keys=True))
+    canonical({"model": "a", "temperature": 0}, ["x", "y"])
+    canonical({"temperature": 0.0, "model": "a"}, ("x", "y"))
+    assert len(calls) == 1
+
+    default = build(Cache(tmp_path / "default"))
+    default({"model": "a", "temperature": 0}, ["x", "y"])
+    default({"temperature": 0.0, "model": "a"}, ("x", "y"))
+    assert len(calls) == 3
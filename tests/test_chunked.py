@@ -0,0 +1,193 @@
+"""
+Tests for chunked storage of list results.
+"""
+
+import os
+import pickle
+
+import pytest
+from pickled_pipeline import Cache, ChunkedSequence, entry
+
+
+def _documents(cache, calls, chunk_size=10):
+    @cache.checkpoint(name="documents", chunk_size=chunk_size)
+    def documents(count):
+        calls.append(count)
+        return [f"document {i}" for i in range(count)]
+
+    return documents
+
+
+def test_hit_returns_lazy_sequence_loading_touched_chunks(cache):
+    calls: list[int] = []
+    documents = _documents(cache, calls)
+    expected = documents(95)
+
+    loaded = documents(95)
+    assert calls == [95]
+    assert isinstance(loaded, ChunkedSequence)
+    assert len(loaded) == 95
+    assert loaded.loaded_chunks == 0
+
+    assert loaded[42] == "document 42"
+    assert loaded[-1] == "document 94"
+    assert loaded[38:43] == expected[38:43]
+    assert loaded.loaded_chunks == 3
+    assert loaded[::10] == expected[::10]
+    assert loaded == expected
+    with pytest.raises(IndexError):
+        loaded[95]
+
+
+def test_entry_header_records_chunked_serializer(cache):
+    _documents(cache, [])(5)
+    (filename,) = [
+        name for name in os.listdir(cache.cache_dir) if name.endswith(".pkl")
+    ]
+    with open(os.path.join(cache.cache_dir, filename), "rb") as f:
+        header = entry.read_header(f)
+    assert header is not None
+    assert header.serializer == entry.SERIALIZER_CHUNKED
+    assert cache.inspect()[0].serializer == "chunked"
+
+
+def test_empty_list_and_non_list_results(cache):
+    @cache.checkpoint(name="produce", chunk_size=4)
+    def produce(value):
+        return value
+
+    produce([])
+    produce({"not": "a list"})
+    assert list(produce([])) == []
+    assert produce({"not": "a list"}) == {"not": "a list"}
+
+
+def test_sequence_refuses_chunks_of_a_replaced_entry(cache):
+    documents = _documents(cache, [], chunk_size=2)
+    documents(6)
+    loaded = documents(6)
+    assert loaded[0] == "document 0"
+    cache.clear_cache()
+    documents(7)
+    documents(6)
+
+    assert loaded[1] == "document 1"
+    with pytest.raises(FileNotFoundError):
+        loaded[2]
+
+
+def test_tuple_hit_returns_sequence_of_its_items(cache):
+    @cache.checkpoint(name="pair", chunk_size=1)
+    def pair():
+        return ("a", "b")
+
+    assert pair() == ("a", "b")
+    loaded = pair()
+    assert isinstance(loaded, ChunkedSequence)
+    assert tuple(loaded) == ("a", "b")
+
+
+def test_downstream_key_matches_the_original_list(cache):
+    calls: list[int] = []
+    documents = _documents(cache, [])
+
+    @cache.checkpoint(name="count_words")
+    def count_words(docs):
+        calls.append(len(docs))
+        return sum(len(doc.split()) for doc in docs)
+
+    assert count_words(documents(20)) == 40
+    assert count_words(documents(20)) == 40
+    assert calls == [20]
+
+
+def _run_pipeline(cache_dir, calls, make_call, canonical_keys=False):
+    cache = Cache(cache_dir=cache_dir, canonical_keys=canonical_keys)
+
+    @cache.checkpoint(name="pair", chunk_size=1)
+    def pair():
+        return ("a", "b")
+
+    @cache.checkpoint(name="documents", chunk_size=2)
+    def documents():
+        return ["x", "y", "z"]
+
+    @cache.checkpoint(name="down")
+    def down(*args, **kwargs):
+        calls.append((args, kwargs))
+        return len(calls)
+
+    return make_call(down, pair(), documents())
+
+
+@pytest.mark.parametrize("canonical_keys", [False, True])
+@pytest.mark.parametrize(
+    "make_call",
+    [
+        pytest.param(lambda down, pair, docs: down(pair), id="tuple"),
+        pytest.param(
+            lambda down, pair, docs: down({"docs": docs}), id="nested"
+        ),
+        pytest.param(lambda down, pair, docs: down(docs=docs), id="kwargs"),
+    ],
+)
+def test_downstream_hit_survives_chunked_upstream_hit(
+    tmp_path, make_call, canonical_keys
+):
+    calls: list[object] = []
+    runs = [
+        _run_pipeline(tmp_path / "cache", calls, make_call, canonical_keys)
+        for _ in range(3)
+    ]
+
+    assert runs == [1, 1, 1]
+    assert len(calls) == 1
+
+
+def test_chunked_tuple_pickles_as_a_tuple(cache):
+    @cache.checkpoint(name="pair", chunk_size=1)
+    def pair():
+        return ("a", "b")
+
+    pair()
+    loaded = pair()
+    assert isinstance(loaded, ChunkedSequence)
+    assert pickle.loads(pickle.dumps(loaded)) == ("a", "b")
+    assert type(pickle.loads(pickle.dumps(loaded))) is tuple
+
+
+def test_corrupt_chunk_index_is_a_miss(tmp_path):
+    cache = Cache(cache_dir=tmp_path / "pipeline_cache")
+    calls: list[int] = []
+    documents = _documents(cache, calls)
+    documents(30)
+    (filename,) = [
+        name for name in os.listdir(cache.cache_dir) if name.endswith(".pkl")
+    ]
+    path = os.path.join(cache.cache_dir, filename)
+    with open(path, "r+b") as f:
+        f.truncate(entry.HEADER_SIZE + 20)
+
+    assert list(documents(30))[0] == "document 0"
+    assert calls == [30, 30]
+
+
+def test_truncated_chunks_are_a_miss(cache):
+    calls: list[int] = []
+    documents = _documents(cache, calls)
+    documents(30)
+    (filename,) = [
+        name for name in os.listdir(cache.cache_dir) if name.endswith(".pkl")
+    ]
+    path = os.path.join(cache.cache_dir, filename)
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 10)
+
+    assert documents(30)[25] == "document 25"
+    assert documents(30)[25] == "document 25"
+    assert calls == [30, 30]
+
+
+def test_chunk_size_must_be_positive(cache):
+    with pytest.raises(ValueError):
+        cache.checkpoint(chunk_size=0)
@@ -1,3 +1,5 @@
+import os
+
 from click.testing import CliRunner
 
 from pickled_pipeline import Cache
@@ -35,3 +37,160 @@ def test_cli_truncate_unknown_checkpoint(tmp_path):
     assert result.exit_code == 0
     assert "Cache truncated from checkpoint" not in result.output
     assert "Checkpoint 'missing_step' not found in manifest." in result.output
+
+
+def test_cli_verbose_reports_removed_files(tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache = Cache(cache_dir=str(cache_dir))
+
+    @cache.checkpoint(name="step")
+    def step():
+        return "ok"
+
+    step()
+
+    runner = CliRunner()
+    quiet_result = runner.invoke(cli, ["clear", "--cache-dir", str(cache_dir)])
+    assert "Cache directory cleared." not in quiet_result.output
+
+    step()
+    result = runner.invoke(
+        cli, ["-vv", "truncate", "step", "--cache-dir", str(cache_dir)]
+    )
+
+    assert result.exit_code == 0
+    assert "Removed cache file 'step__" in result.output
+    assert "Cache truncated from checkpoint 'step' onward." in result.output
+
+
+def test_cli_pack_and_unpack(tmp_path):
+    source_dir = tmp_path / "source"
+    cache = Cache(cache_dir=str(source_dir))
+
+    @cache.checkpoint(name="step")
+    def step(x):
+        return x * 2
+
+    step(1)
+    step(2)
+
+    runner = CliRunner()
+    archive_path = str(tmp_path / "cache.zip")
+    result = runner.invoke(
+        cli, ["pack", archive_path, "--cache-dir", str(source_dir)]
+    )
+    assert result.exit_code == 0
+    assert "Packed 2 entries" in result.output
+
+    target_dir = tmp_path / "target"
+    result = runner.invoke(
+        cli,
+        [
+            "unpack",
+            archive_path,
+            "--checkpoint",
+            "step",
+            "--cache-dir",
+            str(target_dir),
+        ],
+    )
+    assert result.exit_code == 0
+    assert "Unpacked 2 entries" in result.output
+    assert Cache(cache_dir=str(target_dir)).list_checkpoints() == ["step"]
+
+    result = runner.invoke(
+        cli,
+        [
+            "pack",
+            archive_path,
+            "--checkpoint",
+            "missing",
+            "--cache-dir",
+            str(source_dir),
+        ],
+    )
+    assert result.exit_code != 0
+    assert "Checkpoint 'missing' not found in manifest." in result.output
+
+
+def test_cli_clear_quiet_with_jobs(tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache = Cache(cache_dir=str(cache_dir))
+
+    @cache.checkpoint(name="step")
+    def step(x):
+        return x
+
+    for x in range(300):
+        step(x)
+
+    runner = CliRunner()
+    result = runner.invoke(
+        cli,
+        ["clear", "--jobs", "4", "--quiet", "--cache-dir", str(cache_dir)],
+    )
+
+    assert result.exit_code == 0
+    assert result.output == ""
+    assert os.listdir(cache_dir) == ["cache_manifest.json"]
+
+    result = runner.invoke(
+        cli, ["clear", "--jobs", "0", "--cache-dir", str(cache_dir)]
+    )
+    assert result.exit_code != 0
+
+
+def test_cli_inspect_summary_and_entries(tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache = Cache(cache_dir=str(cache_dir))
+
+    @cache.checkpoint(name="step")
+    def step(x):
+        return str(x)
+
+    step(1)
+    step(2)
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ["inspect", "--cache-dir", str(cache_dir)])
+    assert result.exit_code == 0
+    summary_line = result.output.splitlines()[1]
+    assert summary_line.split()[:2] == ["step", "2"]
+    assert "utf8 2" in summary_line
+
+    result = runner.invoke(
+        cli, ["inspect", "--entries", "--cache-dir", str(cache_dir)]
+    )
+    assert result.exit_code == 0
+    assert len(result.output.splitlines()) == 3
+
+    result = runner.invoke(
+        cli,
+        ["inspect", "--checkpoint", "other", "--cache-dir", str(cache_dir)],
+    )
+    assert "No entries found in cache." in result.output
+
+
+def test_cli_repair_reports_changes(tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache = Cache(cache_dir=str(cache_dir))
+
+    @cache.checkpoint(name="step")
+    def step():
+        return "ok"
+
+    step()
+    os.remove(cache.manifest_path)
+    orphan = os.path.join(cache_dir, ".pickled-pipeline-k2x9q1ab.pkl")
+    with open(orphan, "wb"):
+        pass
+
+    result = CliRunner().invoke(
+        cli,
+        ["repair", "--max-temp-age", "0", "--cache-dir", str(cache_dir)],
+    )
+
+    assert result.exit_code == 0
+    assert "Removed 1 orphaned temporary files." in result.output
+    assert "Recovered checkpoints: step" in result.output
+    assert not os.path.exists(orphan)
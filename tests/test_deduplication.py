@@ -0,0 +1,140 @@
+"""
+Tests for content-addressed deduplication of identical results.
+"""
+
+import os
+
+import pytest
+from pickled_pipeline import Cache
+
+
+@pytest.fixture
+def dedup_cache(tmp_path):
+    return Cache(cache_dir=tmp_path / "pipeline_cache", deduplicate=True)
+
+
+def _blobs(cache):
+    if not os.path.isdir(cache.blob_dir):
+        return []
+    return sorted(os.listdir(cache.blob_dir))
+
+
+def test_identical_results_share_one_blob(dedup_cache):
+    @dedup_cache.checkpoint(name="empty")
+    def empty(x):
+        return []
+
+    @dedup_cache.checkpoint(name="other")
+    def other(x):
+        return []
+
+    assert empty(1) == []
+    assert empty(2) == []
+    assert other(3) == []
+    assert len(_blobs(dedup_cache)) == 1
+
+    metrics = dedup_cache.metrics()
+    # Only the first write paid for the payload.
+    assert metrics["empty"].bytes_written > metrics["other"].bytes_written
+
+    calls = {"count": 0}
+
+    @dedup_cache.checkpoint(name="empty")
+    def empty_again(x):
+        calls["count"] += 1
+        return None
+
+    assert empty_again(1) == []
+    assert calls["count"] == 0
+
+
+def test_plain_cache_reads_deduplicated_entries(dedup_cache):
+    @dedup_cache.checkpoint(name="step")
+    def step(x):
+        return {"value": x}
+
+    step(1)
+
+    plain_cache = Cache(cache_dir=dedup_cache.cache_dir)
+
+    @plain_cache.checkpoint(name="step")
+    def step_again(x):
+        raise AssertionError("should have been a hit")
+
+    assert step_again(1) == {"value": 1}
+
+
+def test_truncate_sweeps_only_unreferenced_blobs(dedup_cache):
+    @dedup_cache.checkpoint(name="first")
+    def first(x):
+        return f"first-{x}"
+
+    @dedup_cache.checkpoint(name="second")
+    def second(x):
+        return f"first-{x}" if x == 1 else "second-only"
+
+    first(1)
+    second(1)
+    second(2)
+    assert len(_blobs(dedup_cache)) == 2
+
+    dedup_cache.truncate_cache("second")
+    assert len(_blobs(dedup_cache)) == 1
+    assert first(1) == "first-1"
+
+    dedup_cache.clear_cache()
+    assert _blobs(dedup_cache) == []
+
+
+def test_missing_blob_is_recomputed(dedup_cache):
+    calls = {"count": 0}
+
+    @dedup_cache.checkpoint(name="step")
+    def step():
+        calls["count"] += 1
+        return "value"
+
+    step()
+    for blob_name in _blobs(dedup_cache):
+        os.remove(os.path.join(dedup_cache.blob_dir, blob_name))
+
+    assert step() == "value"
+    assert calls["count"] == 2
+    assert step() == "value"
+    assert calls["count"] == 2
+
+
+def test_corrupt_blob_is_replaced(dedup_cache):
+    calls = {"count": 0}
+
+    @dedup_cache.checkpoint(name="step")
+    def step():
+        calls["count"] += 1
+        return list(range(100))
+
+    step()
+    [blob_name] = _blobs(dedup_cache)
+    blob_path = os.path.join(dedup_cache.blob_dir, blob_name)
+    with open(blob_path, "r+b") as f:
+        f.truncate(os.path.getsize(blob_path) - 5)
+
+    for _ in range(4):
+        assert step() == list(range(100))
+    assert calls["count"] == 2
+
+
+def test_blob_of_the_wrong_size_is_rewritten(dedup_cache):
+    @dedup_cache.checkpoint(name="step")
+    def step(x):
+        return list(range(100))
+
+    step(1)
+    [blob_name] = _blobs(dedup_cache)
+    blob_path = os.path.join(dedup_cache.blob_dir, blob_name)
+    size = os.path.getsize(blob_path)
+    with open(blob_path, "r+b") as f:
+        f.truncate(size - 5)
+
+    step(2)
+    assert os.path.getsize(blob_path) == size
+    assert step(1) == list(range(100))
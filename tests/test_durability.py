@@ -0,0 +1,94 @@
+"""
+Tests for the durability levels of entry writes.
+"""
+
+import os
+
+import pytest
+from pickled_pipeline import Cache
+
+
+def _produce(cache):
+    @cache.checkpoint(name="produce")
+    def produce(value):
+        return value
+
+    return produce
+
+
+def _entry_files(cache):
+    return [
+        name
+        for name in os.listdir(cache.cache_dir)
+        if name != "cache_manifest.json"
+    ]
+
+
+def _count_calls(monkeypatch, target, name):
+    calls = []
+    original = getattr(target, name)
+
+    def counting(*args, **kwargs):
+        calls.append(args)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(target, name, counting)
+    return calls
+
+
+@pytest.mark.parametrize("durability", ["none", "atomic", "fsync"])
+def test_every_level_round_trips(tmp_path, durability):
+    cache = Cache(cache_dir=tmp_path / "cache", durability=durability)
+    produce = _produce(cache)
+    assert produce([1, 2]) == [1, 2]
+    assert produce([1, 2]) == [1, 2]
+    assert cache.metrics()["produce"].hits == 1
+    assert len(_entry_files(cache)) == 1
+
+
+def test_none_writes_entries_without_temporary_files(tmp_path, monkeypatch):
+    cache = Cache(cache_dir=tmp_path / "cache", durability="none")
+    calls = _count_calls(monkeypatch, cache, "_temporary_path")
+    _produce(cache)("value")
+    # Only the manifest still goes through a temporary file.
+    assert [args[0] for args in calls] == [".json"]
+
+
+def test_none_removes_a_partial_entry_on_failure(tmp_path):
+    cache = Cache(cache_dir=tmp_path / "cache", durability="none")
+    with pytest.raises(Exception):
+        _produce(cache)(lambda: None)
+    assert _entry_files(cache) == []
+
+
+def test_fsync_syncs_files_and_directory(tmp_path, monkeypatch):
+    calls = _count_calls(monkeypatch, os, "fsync")
+    atomic = Cache(cache_dir=tmp_path / "atomic")
+    _produce(atomic)("value")
+    assert calls == []
+
+    durable = Cache(cache_dir=tmp_path / "durable", durability="fsync")
+    _produce(durable)("value")
+    # The entry and the manifest, each followed by the directory.
+    assert len(calls) == 4
+
+
+def test_fsync_appends_sync_record_and_header(tmp_path, monkeypatch):
+    cache = Cache(cache_dir=tmp_path / "cache", durability="fsync")
+
+    @cache.append_checkpoint(name="log", exclude_args=["new"])
+    def log(existing, new):
+        return new
+
+    log(["a"])
+    calls = _count_calls(monkeypatch, os, "fsync")
+    assert log(["b"]) == ["a", "b"]
+    assert len(calls) == 2
+
+
+def test_unknown_durability_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        Cache(
+            cache_dir=tmp_path / "cache",
+            durability="paranoid",  # type: ignore[arg-type]
+        )
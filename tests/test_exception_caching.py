@@ -0,0 +1,142 @@
+"""
+Tests for caching exceptions raised by checkpointed functions.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+
+def test_listed_exception_is_cached_and_reraised(cache):
+    calls = {"count": 0}
+
+    @cache.checkpoint(name="parse", cache_exceptions=(ValueError,))
+    def parse(raw):
+        calls["count"] += 1
+        raise ValueError(f"bad record: {raw}")
+
+    for _ in range(3):
+        with pytest.raises(ValueError, match="bad record: x"):
+            parse("x")
+
+    assert calls["count"] == 1
+    assert cache.list_checkpoints() == ["parse"]
+    assert cache.metrics()["parse"].hits == 2
+
+
+def test_unlisted_exception_is_not_cached(cache):
+    calls = {"count": 0}
+
+    @cache.checkpoint(name="parse", cache_exceptions=(ValueError,))
+    def parse(raw):
+        calls["count"] += 1
+        raise KeyError(raw)
+
+    for _ in range(2):
+        with pytest.raises(KeyError):
+            parse("x")
+
+    assert calls["count"] == 2
+    assert cache.list_checkpoints() == []
+
+
+def test_exception_ttl_expires_cached_failures(cache):
+    calls = {"count": 0}
+
+    @cache.checkpoint(
+        name="flaky",
+        ttl=60,
+        cache_exceptions=(RuntimeError,),
+        exception_ttl=0.05,
+    )
+    def flaky():
+        calls["count"] += 1
+        if calls["count"] == 1:
+            raise RuntimeError("transient")
+        return calls["count"]
+
+    with pytest.raises(RuntimeError):
+        flaky()
+    with pytest.raises(RuntimeError):
+        flaky()
+
+    time.sleep(0.1)
+
+    assert flaky() == 2
+    assert flaky() == 2
+
+
+def test_cached_failures_expire_with_ttl_by_default(cache):
+    calls = {"count": 0}
+
+    @cache.checkpoint(name="flaky", ttl=0.05, cache_exceptions=(ValueError,))
+    def flaky():
+        calls["count"] += 1
+        raise ValueError("transient")
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            flaky()
+    assert calls["count"] == 1
+
+    time.sleep(0.1)
+
+    with pytest.raises(ValueError):
+        flaky()
+    assert calls["count"] == 2
+
+
+class _UnpicklableError(Exception):
+    def __init__(self, code, detail):
+        super().__init__(f"{code}: {detail}")
+
+
+def test_exception_that_cannot_round_trip_is_not_cached(cache):
+    calls = {"count": 0}
+
+    @cache.checkpoint(name="strict", cache_exceptions=(Exception,))
+    def strict():
+        calls["count"] += 1
+        raise _UnpicklableError(400, "rejected")
+
+    for _ in range(2):
+        with pytest.raises(_UnpicklableError):
+            strict()
+
+    assert calls["count"] == 2
+    assert cache.list_checkpoints() == []
+
+
+def test_async_checkpoint_caches_exceptions(cache):
+    calls = {"count": 0}
+
+    @cache.checkpoint(name="fetch", cache_exceptions=(LookupError,))
+    async def fetch(key):
+        calls["count"] += 1
+        raise LookupError(key)
+
+    async def run():
+        for _ in range(2):
+            with pytest.raises(LookupError):
+                await fetch("missing")
+
+    asyncio.run(run())
+    assert calls["count"] == 1
+
+
+def test_truncate_removes_cached_exceptions(cache):
+    calls = {"count": 0}
+
+    @cache.checkpoint(name="parse", cache_exceptions=(ValueError,))
+    def parse():
+        calls["count"] += 1
+        raise ValueError("bad")
+
+    with pytest.raises(ValueError):
+        parse()
+    cache.truncate_cache("parse")
+    with pytest.raises(ValueError):
+        parse()
+
+    assert calls["count"] == 2
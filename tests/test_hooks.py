@@ -0,0 +1,94 @@
+"""
+Tests for the profiling hooks that wrap each phase of a checkpoint call.
+"""
+
+from contextlib import contextmanager
+
+import pytest
+
+from pickled_pipeline import hooks
+
+
+def _recording_hook(events):
+    @contextmanager
+    def hook(phase, checkpoint_name):
+        events.append(("enter", phase, checkpoint_name))
+        try:
+            yield
+        finally:
+            events.append(("exit", phase, checkpoint_name))
+
+    return hook
+
+
+def _entered_phases(events):
+    return [phase for kind, phase, _ in events if kind == "enter"]
+
+
+def test_hooks_wrap_each_phase_of_a_miss_and_a_hit(cache):
+    events: list[tuple[str, str, str]] = []
+    cache.add_hook(_recording_hook(events))
+
+    @cache.checkpoint(name="step")
+    def step(x):
+        return x
+
+    step(1)
+    assert _entered_phases(events) == [
+        hooks.BIND,
+        hooks.KEY,
+        hooks.LOOKUP,
+        hooks.COMPUTE,
+        hooks.SERIALIZE,
+        hooks.RENAME,
+    ]
+    assert {name for _, _, name in events} == {"step"}
+    assert [kind for kind, _, _ in events] == ["enter", "exit"] * 6
+
+    events.clear()
+    step(1)
+    assert _entered_phases(events) == [
+        hooks.BIND,
+        hooks.KEY,
+        hooks.LOOKUP,
+        hooks.LOAD,
+    ]
+
+
+def test_hook_sees_exit_when_the_function_raises(cache):
+    events: list[tuple[str, str, str]] = []
+    cache.add_hook(_recording_hook(events))
+
+    @cache.checkpoint(name="failing")
+    def failing():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        failing()
+
+    assert events[-2:] == [
+        ("enter", hooks.COMPUTE, "failing"),
+        ("exit", hooks.COMPUTE, "failing"),
+    ]
+
+
+def test_multiple_hooks_nest_and_can_be_removed(cache):
+    outer_events: list[tuple[str, str, str]] = []
+    inner_events: list[tuple[str, str, str]] = []
+    outer = _recording_hook(outer_events)
+    inner = _recording_hook(inner_events)
+    cache.add_hook(outer)
+    cache.add_hook(inner)
+
+    @cache.checkpoint(name="step")
+    def step():
+        return "value"
+
+    step()
+    assert _entered_phases(outer_events) == _entered_phases(inner_events)
+
+    cache.remove_hook(outer)
+    cache.remove_hook(inner)
+    outer_events.clear()
+    step()
+    assert outer_events == []
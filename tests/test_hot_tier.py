@@ -0,0 +1,222 @@
+"""
+Tests for the host-local shared-memory hot tier.
+"""
+
+import gc
+import multiprocessing
+import os
+import sys
+import time
+
+import pytest
+
+from pickled_pipeline import Cache
+from pickled_pipeline.hot_tier import HotTier, arena_path
+
+pytestmark = pytest.mark.skipif(
+    sys.platform == "win32",
+    reason="The hot tier requires a POSIX system.",
+)
+
+SIZE = 256 * 1024
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    cache_dir = tmp_path / "pipeline_cache"
+    yield cache_dir
+    # Collecting the test's caches removes the arena they shared.
+    gc.collect()
+    path = arena_path(str(cache_dir))
+    assert not os.path.exists(path)
+    assert not os.path.exists(path + ".lock")
+
+
+def _key(number):
+    return number.to_bytes(16, "little")
+
+
+def test_put_get_discard_and_clear(tmp_path):
+    tier = HotTier(str(tmp_path / "arena"), SIZE)
+    assert tier.get(_key(1)) is None
+    assert tier.put(_key(1), b"one")
+    assert tier.put(_key(2), b"two")
+    assert tier.get(_key(1)) == b"one"
+
+    tier.discard(_key(1))
+    assert tier.get(_key(1)) is None
+    assert tier.get(_key(2)) == b"two"
+
+    tier.clear()
+    assert tier.get(_key(2)) is None
+
+
+def test_ring_evicts_oldest_entries(tmp_path):
+    tier = HotTier(str(tmp_path / "arena"), SIZE)
+    chunk = bytes(tier.max_entry_bytes)
+    assert not tier.put(_key(0), chunk + b"x")
+    for number in range(6):
+        assert tier.put(_key(number), chunk)
+
+    assert tier.get(_key(0)) is None
+    assert tier.get(_key(5)) == chunk
+
+
+def test_processes_share_the_arena_geometry(tmp_path):
+    path = str(tmp_path / "arena")
+    first = HotTier(path, SIZE)
+    first.put(_key(1), b"shared")
+
+    second = HotTier(path, 2 * SIZE)
+    assert second.max_entry_bytes == first.max_entry_bytes
+    assert second.get(_key(1)) == b"shared"
+
+
+def test_half_written_slot_reads_as_empty(tmp_path):
+    tier = HotTier(str(tmp_path / "arena"), SIZE)
+    tier.put(_key(1), b"value")
+    # Simulate a writer that died after marking the slot busy.
+    offset = tier._slot_offset(_key(1)) + 16
+    tier._map[offset] |= 1
+
+    assert tier.get(_key(1)) is None
+    assert tier.put(_key(1), b"again")
+    assert tier.get(_key(1)) == b"again"
+
+
+def test_second_worker_is_served_from_the_tier(cache_dir, monkeypatch):
+    calls = []
+
+    def build(cache):
+        @cache.checkpoint(name="square")
+        def square(x):
+            calls.append(x)
+            return x * x
+
+        return square
+
+    first = Cache(cache_dir=cache_dir, hot_tier_size=SIZE)
+    assert build(first)(4) == 16
+    assert build(first)(4) == 16
+
+    second = Cache(cache_dir=cache_dir, hot_tier_size=SIZE)
+
+    def fail_open(cache_path):
+        raise AssertionError("entry file was opened")
+
+    monkeypatch.setattr(second, "_open_entry", fail_open)
+    assert build(second)(4) == 16
+    assert calls == [4]
+
+
+def test_rewritten_entry_is_not_served_from_the_tier(cache_dir, monkeypatch):
+    cache = Cache(cache_dir=cache_dir, hot_tier_size=SIZE)
+    results = iter(["old", "new"])
+
+    @cache.checkpoint(name="step", ttl=60)
+    def step():
+        return next(results)
+
+    assert step() == "old"
+    assert step() == "old"
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 120)
+    assert step() == "new"
+    monkeypatch.undo()
+    assert step() == "new"
+
+
+def test_entry_rewritten_without_the_tier_is_not_served(cache_dir):
+    tiered = Cache(cache_dir=cache_dir, hot_tier_size=SIZE)
+    plain = Cache(cache_dir=cache_dir, durability="none")
+    results = iter(["old", "new"])
+
+    def build(cache):
+        return cache.checkpoint(name="step")(lambda: next(results))
+
+    assert build(tiered)() == "old"
+    assert build(tiered)() == "old"
+    plain.truncate_cache("step")
+    assert build(plain)() == "new"
+    assert build(tiered)() == "new"
+
+
+def test_truncation_clears_the_tier(cache_dir):
+    cache = Cache(cache_dir=cache_dir, hot_tier_size=SIZE)
+    calls = []
+
+    @cache.checkpoint(name="step")
+    def step(x):
+        calls.append(x)
+        return x
+
+    step(1)
+    step(1)
+    cache.truncate_cache("step")
+    step(1)
+    assert calls == [1, 1]
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="fork is not available.",
+)
+def test_forked_child_reopens_the_arena(tmp_path):
+    path = str(tmp_path / "arena")
+    tier = HotTier(path, SIZE)
+    tier.put(_key(1), b"from parent")
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+
+    def child():
+        queue.put(tier.get(_key(1)))
+        tier.put(_key(2), b"from child")
+
+    process = context.Process(target=child)
+    process.start()
+    process.join(10)
+
+    assert process.exitcode == 0
+    assert queue.get(timeout=1) == b"from parent"
+    assert tier.get(_key(2)) == b"from child"
+
+
+def test_clearing_the_cache_replaces_the_arena(cache_dir):
+    cache = Cache(cache_dir=cache_dir, hot_tier_size=SIZE)
+    path = arena_path(str(cache_dir))
+    before = os.stat(path).st_ino
+    stale = HotTier(path, SIZE)
+    stale.put(_key(1), b"stale")
+
+    cache.clear_cache()
+    assert os.stat(path).st_ino != before
+    assert stale.get(_key(1)) is None
+    stale.close()
+    assert os.path.exists(path)
+
+
+def test_last_holder_removes_the_arena_on_close(cache_dir):
+    path = arena_path(str(cache_dir))
+    with Cache(cache_dir=cache_dir, hot_tier_size=SIZE) as first:
+        second = Cache(cache_dir=cache_dir, hot_tier_size=SIZE)
+        second.close()
+        second.close()
+        assert os.path.exists(path)
+        assert first.list_checkpoints() == []
+    assert not os.path.exists(path)
+    assert not os.path.exists(path + ".lock")
+
+
+def test_repair_reaps_orphaned_arenas(cache_dir, tmp_path):
+    orphan = arena_path(str(tmp_path / "gone"))
+    for name in (orphan, orphan + ".lock"):
+        with open(name, "wb") as f:
+            f.write(b"left by a killed process")
+    cache = Cache(cache_dir=cache_dir, hot_tier_size=SIZE)
+
+    report = cache.repair()
+
+    assert report.arenas_removed >= 1
+    assert not os.path.exists(orphan)
+    assert not os.path.exists(orphan + ".lock")
+    assert os.path.exists(arena_path(str(cache_dir)))
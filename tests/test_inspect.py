@@ -0,0 +1,91 @@
+"""
+Tests for describing cache entries from their headers without unpickling.
+"""
+
+import os
+import pickle
+import time
+
+from pickled_pipeline import Cache, EntryInfo
+
+
+class _Unloadable:
+    def __reduce__(self):
+        return (_fail_on_load, ())
+
+
+def _fail_on_load():
+    raise AssertionError("inspect must not unpickle payloads")
+
+
+def test_inspect_reads_headers_only(cache):
+    @cache.checkpoint(name="text")
+    def text(x):
+        return "value" * x
+
+    @cache.checkpoint(name="opaque", cache_exceptions=(ValueError,))
+    def opaque(x):
+        if x < 0:
+            raise ValueError(x)
+        return _Unloadable()
+
+    text(1)
+    text(2)
+    opaque(1)
+    try:
+        opaque(-1)
+    except ValueError:
+        pass
+
+    infos = cache.inspect()
+    assert [info.checkpoint for info in infos] == [
+        "text",
+        "text",
+        "opaque",
+        "opaque",
+    ]
+    assert all(isinstance(info, EntryInfo) for info in infos)
+    assert [info.serializer for info in infos] == [
+        "utf8",
+        "utf8",
+        "pickle",
+        "pickle",
+    ]
+    assert infos[0].created <= infos[1].created
+    assert sorted(info.payload_bytes for info in infos[:2]) == [5, 10]
+    assert [info.cached_exception for info in infos[2:]].count(True) == 1
+    for info in infos:
+        assert len(info.key) == 32
+        assert info.disk_bytes > info.payload_bytes
+
+    assert {info.checkpoint for info in cache.inspect(["opaque"])} == {
+        "opaque"
+    }
+
+
+def test_inspect_reports_legacy_entries_from_the_file(cache):
+    path = os.path.join(cache.cache_dir, "legacy__" + "a" * 32 + ".pkl")
+    with open(path, "wb") as f:
+        pickle.dump({"old": True}, f)
+    modified = time.time() - 60
+    os.utime(path, (modified, modified))
+
+    (info,) = cache.inspect()
+    assert info.checkpoint == "legacy"
+    assert info.serializer == "pickle"
+    assert info.compute_seconds is None
+    assert info.payload_bytes == info.disk_bytes == os.path.getsize(path)
+    assert abs(info.created - modified) < 1
+
+
+def test_inspect_marks_deduplicated_entries(tmp_path):
+    cache = Cache(cache_dir=tmp_path / "pipeline_cache", deduplicate=True)
+
+    @cache.checkpoint(name="step")
+    def step():
+        return b"payload"
+
+    step()
+    (info,) = cache.inspect()
+    assert info.deduplicated
+    assert info.serializer == "bytes"
@@ -0,0 +1,86 @@
+"""
+Tests for the logging event stream and in-process metrics of
+pickled_pipeline.Cache.
+"""
+
+import logging
+
+from pickled_pipeline import Cache
+
+
+def test_metrics_count_hits_misses_and_bytes(cache):
+    @cache.checkpoint(name="square")
+    def square(x):
+        return x * x
+
+    square(2)
+    square(2)
+    square(3)
+
+    metrics = cache.metrics()["square"]
+    assert metrics.misses == 2
+    assert metrics.hits == 1
+    assert metrics.bytes_written > 0
+    assert metrics.bytes_read > 0
+    assert metrics.key_seconds > 0
+    assert metrics.compute_seconds > 0
+    assert metrics.store_seconds > 0
+    assert metrics.load_seconds > 0
+
+
+def test_metrics_snapshot_is_detached_and_resettable(cache):
+    @cache.checkpoint(name="step")
+    def step():
+        return "value"
+
+    step()
+    snapshot = cache.metrics()["step"]
+
+    step()
+    assert snapshot.hits == 0
+    assert cache.metrics()["step"].hits == 1
+
+    cache.reset_metrics()
+    assert cache.metrics()["step"].hits == 0
+    assert cache.metrics()["step"].misses == 0
+
+
+def test_metrics_can_be_disabled(tmp_path):
+    cache = Cache(cache_dir=tmp_path / "cache", collect_metrics=False)
+
+    @cache.checkpoint(name="step")
+    def step():
+        return "value"
+
+    step()
+    step()
+
+    assert cache.metrics() == {}
+
+
+def test_hits_and_misses_are_logged_at_debug_level(cache, caplog):
+    @cache.checkpoint(name="step")
+    def step():
+        return "value"
+
+    with caplog.at_level(logging.DEBUG, logger="pickled_pipeline"):
+        step()
+        step()
+
+    assert [record.getMessage() for record in caplog.records] == [
+        "[step] Computed result and saved to cache.",
+        "[step] Loaded result from cache.",
+    ]
+
+
+def test_checkpoint_calls_are_silent_by_default(cache, capsys, caplog):
+    @cache.checkpoint(name="step")
+    def step():
+        return "value"
+
+    with caplog.at_level(logging.INFO, logger="pickled_pipeline"):
+        step()
+        step()
+
+    assert caplog.records == []
+    assert capsys.readouterr().out == ""
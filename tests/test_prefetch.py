@@ -0,0 +1,103 @@
+"""
+Tests for access-trace recording and predictive prefetching.
+"""
+
+import json
+import os
+import threading
+import time
+
+from pickled_pipeline import Cache
+from pickled_pipeline.prefetch import ACCESS_TRACE_FILENAME, Prefetcher
+
+
+def _run_pipeline(cache, calls):
+    @cache.checkpoint(name="load")
+    def load(x):
+        calls.append(("load", x))
+        return list(range(x))
+
+    @cache.checkpoint(name="total")
+    def total(x):
+        calls.append(("total", x))
+        return sum(load(x))
+
+    return [total(x) for x in (3, 1, 2)]
+
+
+def _trace(cache_dir):
+    with open(os.path.join(cache_dir, ACCESS_TRACE_FILENAME)) as f:
+        return json.load(f)
+
+
+def test_access_trace_records_first_access_order(tmp_path):
+    cache_dir = tmp_path / "pipeline_cache"
+    cache = Cache(cache_dir=cache_dir, prefetch=True)
+    calls: list[tuple[str, int]] = []
+    _run_pipeline(cache, calls)
+    _run_pipeline(cache, calls)
+    cache.save_access_trace()
+
+    trace = _trace(cache_dir)
+    assert len(trace) == 6
+    assert [name.split("__")[0] for name in trace] == [
+        "total",
+        "load",
+    ] * 3
+
+
+def test_next_run_is_served_from_prefetched_entries(tmp_path):
+    cache_dir = tmp_path / "pipeline_cache"
+    first = Cache(cache_dir=cache_dir, prefetch=True)
+    calls: list[tuple[str, int]] = []
+    assert _run_pipeline(first, calls) == [3, 0, 1]
+    first.save_access_trace()
+
+    second = Cache(cache_dir=cache_dir, prefetch=True, prefetch_depth=2)
+    calls.clear()
+    assert _run_pipeline(second, calls) == [3, 0, 1]
+    assert calls == []
+    assert second.metrics()["total"].hits == 3
+
+
+def test_prefetch_plan_skips_truncated_checkpoints(tmp_path):
+    cache_dir = tmp_path / "pipeline_cache"
+    first = Cache(cache_dir=cache_dir, prefetch=True)
+    _run_pipeline(first, [])
+    first.save_access_trace()
+    first.truncate_cache("total")
+
+    second = Cache(cache_dir=cache_dir, prefetch=True)
+    assert len(second._prefetch_plan) == 3
+    assert all("load__" in path for path in second._prefetch_plan)
+
+
+def test_prefetcher_stays_within_depth_of_the_caller():
+    loaded = []
+    progress = threading.Condition()
+
+    def load(path):
+        with progress:
+            loaded.append(path)
+            progress.notify_all()
+        return path.upper()
+
+    def wait_for(path):
+        with progress:
+            assert progress.wait_for(lambda: path in loaded, timeout=5)
+
+    prefetcher = Prefetcher(["a", "b", "c", "d", "e"], load, depth=2)
+    wait_for("b")
+    time.sleep(0.05)
+    assert loaded == ["a", "b"]
+
+    assert prefetcher.take("a") == "A"
+    wait_for("c")
+    assert prefetcher.take("b") == "B"
+    # Skipping ahead drops "c" and moves the window past it.
+    assert prefetcher.take("d") in ("D", None)
+    assert prefetcher.take("c") is None
+    assert prefetcher.take("unknown") is None
+    wait_for("e")
+    assert prefetcher.take("e") == "E"
+    prefetcher.close()
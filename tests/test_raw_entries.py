@@ -0,0 +1,92 @@
+"""
+Tests for storing str and bytes results without pickle.
+"""
+
+import os
+import pickle
+
+import pytest
+from pickled_pipeline import Cache, entry
+
+
+class _Label(str):
+    pass
+
+
+def _only_entry(cache):
+    (filename,) = [
+        name for name in os.listdir(cache.cache_dir) if name.endswith(".pkl")
+    ]
+    with open(os.path.join(cache.cache_dir, filename), "rb") as f:
+        return entry.read_header(f), f.read()
+
+
+@pytest.mark.parametrize(
+    ("value", "serializer"),
+    [
+        ("completion ✓", entry.SERIALIZER_UTF8),
+        (b"\x00\xffraw", entry.SERIALIZER_BYTES),
+        (_Label("subclass"), entry.SERIALIZER_PICKLE),
+        ("caf\udce9.txt", entry.SERIALIZER_PICKLE),  # as from os.fsdecode
+        (["not", "raw"], entry.SERIALIZER_PICKLE),
+    ],
+)
+def test_results_round_trip_with_expected_serializer(cache, value, serializer):
+    @cache.checkpoint(name="produce")
+    def produce():
+        return value
+
+    produce()
+    header, payload = _only_entry(cache)
+    assert header.serializer == serializer
+    assert header.payload_size == len(payload)
+    if serializer == entry.SERIALIZER_PICKLE:
+        assert pickle.loads(payload) == value
+    else:
+        assert payload == (value.encode() if isinstance(value, str) else value)
+
+    @cache.checkpoint(name="produce")
+    def produce_again():
+        raise AssertionError("should have been a hit")
+
+    result = produce_again()
+    assert result == value
+    assert type(result) is type(value)
+
+
+def test_truncated_raw_entry_is_recomputed(cache):
+    calls = {"count": 0}
+
+    @cache.checkpoint(name="produce")
+    def produce():
+        calls["count"] += 1
+        return "x" * 100
+
+    produce()
+    (filename,) = [
+        name for name in os.listdir(cache.cache_dir) if name.endswith(".pkl")
+    ]
+    path = os.path.join(cache.cache_dir, filename)
+    with open(path, "r+b") as f:
+        f.truncate(entry.HEADER_SIZE + 10)
+
+    assert produce() == "x" * 100
+    assert calls["count"] == 2
+
+
+def test_deduplicated_raw_results_share_blobs_across_types(tmp_path):
+    cache = Cache(cache_dir=tmp_path / "pipeline_cache", deduplicate=True)
+
+    @cache.checkpoint(name="text")
+    def text():
+        return "same"
+
+    @cache.checkpoint(name="data")
+    def data():
+        return b"same"
+
+    assert text() == "same"
+    assert data() == b"same"
+    assert len(os.listdir(cache.blob_dir)) == 1
+    assert text() == "same"
+    assert data() == b"same"
@@ -0,0 +1,131 @@
+"""
+Tests for read-only caches that serve a prebuilt cache directory.
+"""
+
+import asyncio
+import os
+import pickle
+
+import pytest
+from pickled_pipeline import Cache, CacheMissError
+
+
+def _prebuilt(cache_dir):
+    cache = Cache(cache_dir=cache_dir)
+
+    @cache.checkpoint(name="step")
+    def step(x):
+        return x * 10
+
+    step(1)
+    step(2)
+    return cache
+
+
+def _snapshot(cache_dir):
+    return {
+        name: os.stat(os.path.join(cache_dir, name)).st_mtime_ns
+        for name in os.listdir(cache_dir)
+    }
+
+
+def test_read_only_cache_serves_hits_without_writing(tmp_path):
+    cache_dir = tmp_path / "pipeline_cache"
+    _prebuilt(cache_dir)
+    before = _snapshot(cache_dir)
+    with open(os.path.join(cache_dir, "cache_manifest.json"), "rb") as f:
+        manifest = f.read()
+
+    cache = Cache(cache_dir=cache_dir, read_only=True)
+    calls = {"count": 0}
+
+    @cache.checkpoint(name="step")
+    def step(x):
+        calls["count"] += 1
+        return -x
+
+    assert step(1) == 10
+    assert step(2) == 20
+    assert step(3) == -3
+    assert step(3) == -3
+    assert calls["count"] == 2
+    assert cache.list_checkpoints() == ["step"]
+    assert cache.metrics()["step"].bytes_written == 0
+
+    assert _snapshot(cache_dir) == before
+    with open(os.path.join(cache_dir, "cache_manifest.json"), "rb") as f:
+        assert f.read() == manifest
+    stats = Cache(cache_dir=cache_dir, read_only=True).stats()
+    assert stats["step"].hits == 0
+
+
+def test_read_only_cache_can_raise_on_miss(tmp_path):
+    cache_dir = tmp_path / "pipeline_cache"
+    _prebuilt(cache_dir)
+    cache = Cache(cache_dir=cache_dir, read_only=True, on_miss="raise")
+
+    @cache.checkpoint(name="step")
+    def step(x):
+        return -x
+
+    @cache.checkpoint(name="fetch")
+    async def fetch(x):
+        return -x
+
+    @cache.batch_checkpoint(name="step")
+    def step_batch(x):
+        return [-item for item in x]
+
+    assert step(2) == 20
+    assert step_batch([1, 2]) == [10, 20]
+    with pytest.raises(CacheMissError, match=r"\[step\] No cached result"):
+        step(3)
+    with pytest.raises(CacheMissError):
+        asyncio.run(fetch(1))
+    with pytest.raises(CacheMissError):
+        step_batch([1, 3])
+
+
+def test_cache_miss_error_pickles():
+    error = pickle.loads(pickle.dumps(CacheMissError("step", "cache")))
+    assert error.checkpoint_name == "step"
+    assert str(error) == "[step] No cached result in read-only cache 'cache'."
+
+
+def test_read_only_index_is_fixed_at_startup(tmp_path):
+    cache_dir = tmp_path / "pipeline_cache"
+    writer = _prebuilt(cache_dir)
+    reader = Cache(cache_dir=cache_dir, read_only=True, on_miss="raise")
+
+    @writer.checkpoint(name="step")
+    def step(x):
+        return x * 10
+
+    @reader.checkpoint(name="step")
+    def read_step(x):
+        return -x
+
+    step(3)
+    with pytest.raises(CacheMissError):
+        read_step(3)
+
+    writer.clear_cache()
+    with pytest.raises(CacheMissError):
+        read_step(1)
+
+
+def test_read_only_cache_rejects_mutations(tmp_path):
+    cache_dir = tmp_path / "pipeline_cache"
+    _prebuilt(cache_dir)
+    cache = Cache(cache_dir=cache_dir, read_only=True)
+
+    with pytest.raises(PermissionError):
+        cache.truncate_cache("step")
+    with pytest.raises(PermissionError):
+        cache.clear_cache()
+    assert Cache(cache_dir=cache_dir).list_checkpoints() == ["step"]
+
+
+def test_on_miss_is_validated(tmp_path):
+    with pytest.raises(ValueError, match="on_miss"):
+        Cache(cache_dir=tmp_path, on_miss="ignore")  # type: ignore[arg-type]
@@ -0,0 +1,131 @@
+"""
+Tests for removing crash orphans and restoring the manifest.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+from pickled_pipeline import Cache, RepairReport
+from pickled_pipeline.recovery import is_orphaned_temp, temp_prefix
+
+
+def _dead_pid():
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def _touch(path, age=0.0):
+    with open(path, "wb") as f:
+        f.write(b"partial")
+    if age:
+        modified = time.time() - age
+        os.utime(path, (modified, modified))
+
+
+def test_temp_names_record_the_writer(cache):
+    assert temp_prefix().startswith(f".pickled-pipeline-{os.getpid()}@")
+    path = cache._temporary_path(".pkl")
+    assert os.path.basename(path).startswith(temp_prefix())
+    assert not is_orphaned_temp(os.path.basename(path), 0.0, 3600.0)
+
+
+def test_repair_removes_orphans_and_keeps_live_writes(cache):
+    cache_dir = cache.cache_dir
+    host_prefix = temp_prefix().split("@", 1)[1]
+    dead = os.path.join(
+        cache_dir,
+        f".pickled-pipeline-{_dead_pid()}@{host_prefix}abc123.pkl",
+    )
+    live = cache._temporary_path(".pkl")
+    old_legacy = os.path.join(cache_dir, ".pickled-pipeline-k2x9q1ab.json")
+    new_legacy = os.path.join(cache_dir, ".pickled-pipeline-a1b2c3d4.json")
+    _touch(dead)
+    _touch(old_legacy, age=7200)
+    _touch(new_legacy)
+
+    report = cache.repair()
+
+    assert report == RepairReport(
+        temp_files_removed=2,
+        checkpoints_recovered=(),
+        blobs_removed=0,
+    )
+    assert not os.path.exists(dead)
+    assert not os.path.exists(old_legacy)
+    assert os.path.exists(live)
+    assert os.path.exists(new_legacy)
+
+    assert cache.repair(max_temp_age=0).temp_files_removed == 2
+
+
+def test_repair_restores_checkpoints_missing_from_manifest(tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache = Cache(cache_dir=cache_dir)
+
+    @cache.checkpoint(name="first")
+    def first():
+        return 1
+
+    @cache.checkpoint(name="second")
+    def second():
+        return 2
+
+    first()
+    second()
+    paths = sorted(
+        os.path.join(cache_dir, name)
+        for name in os.listdir(cache_dir)
+        if name.endswith(".pkl")
+    )
+    for age, path in zip((20, 10), paths):
+        modified = time.time() - age
+        os.utime(path, (modified, modified))
+    with open(cache.manifest_path, "w") as f:
+        json.dump([], f)
+
+    repaired = Cache(cache_dir=cache_dir, repair_on_open=True)
+
+    assert repaired.list_checkpoints() == ["first", "second"]
+    with open(cache.manifest_path) as f:
+        assert json.load(f) == ["first", "second"]
+
+
+def test_repair_orders_checkpoints_by_creation_not_last_hit(tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache = Cache(cache_dir=cache_dir)
+
+    @cache.checkpoint(name="step1")
+    def step1():
+        return 1
+
+    @cache.checkpoint(name="step2")
+    def step2():
+        return 2
+
+    step1()
+    time.sleep(0.01)
+    step2()
+    time.sleep(0.01)
+    step1()
+    cache.close()
+    os.remove(cache.manifest_path)
+
+    assert cache.repair().checkpoints_recovered == ("step1", "step2")
+
+
+def test_repair_sweeps_orphaned_blobs(tmp_path):
+    cache = Cache(cache_dir=tmp_path / "cache", deduplicate=True)
+    os.makedirs(cache.blob_dir)
+    _touch(os.path.join(cache.blob_dir, "0" * 64 + ".pkl"))
+    assert cache.repair().blobs_removed == 1
+
+
+def test_read_only_cache_cannot_repair(tmp_path):
+    Cache(cache_dir=tmp_path / "cache")
+    with pytest.raises(PermissionError):
+        Cache(cache_dir=tmp_path / "cache", read_only=True).repair()
@@ -0,0 +1,111 @@
+"""
+Tests that importing the package and opening a cache stay cheap.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import pickled_pipeline
+from pickled_pipeline import Cache
+
+DEFERRED_MODULES = ["asyncio", "concurrent.futures", "socket", "zipfile"]
+
+_LIST_NEW_MODULES = """
+import json, sys
+before = set(sys.modules)
+{code}
+print(json.dumps(sorted(set(sys.modules) - before)))
+"""
+
+
+def _run(*args):
+    package_root = os.path.dirname(os.path.dirname(pickled_pipeline.__file__))
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [package_root, env.get("PYTHONPATH")])
+    )
+    return subprocess.run(
+        [sys.executable, *args],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _new_modules(code):
+    result = _run("-c", _LIST_NEW_MODULES.format(code=code))
+    return set(json.loads(result.stdout.splitlines()[-1]))
+
+
+def test_importing_the_package_does_not_load_the_cache():
+    result = _run("-X", "importtime", "-c", "import pickled_pipeline")
+    imported = {
+        line.rpartition("|")[2].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:")
+    }
+
+    assert "pickled_pipeline" in imported
+    assert "pickled_pipeline.cache" not in imported
+
+
+def test_opening_a_cache_defers_optional_modules(tmp_path):
+    new_modules = _new_modules(
+        "from pickled_pipeline import Cache\n"
+        f"Cache({str(tmp_path / 'cache')!r}).checkpoint()(len)"
+    )
+
+    assert "pickled_pipeline.cache" in new_modules
+    assert new_modules.isdisjoint(DEFERRED_MODULES)
+
+
+def test_cli_command_defers_optional_modules(tmp_path):
+    new_modules = _new_modules(
+        "from pickled_pipeline.cli import cli\n"
+        f"cli(['list', '--cache-dir', {str(tmp_path / 'cache')!r}], "
+        "standalone_mode=False)"
+    )
+
+    assert new_modules.isdisjoint(DEFERRED_MODULES)
+
+
+def test_public_names_resolve_lazily():
+    assert pickled_pipeline.Cache is Cache
+    assert set(pickled_pipeline.__all__) <= set(dir(pickled_pipeline))
+    with pytest.raises(AttributeError):
+        pickled_pipeline.missing_name
+
+
+def test_manifest_is_loaded_on_first_use(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    (cache_dir / "cache_manifest.json").write_text('["step"]')
+    loads = []
+    load_manifest = Cache._load_manifest
+
+    def counting_load(self):
+        loads.append(self)
+        return load_manifest(self)
+
+    monkeypatch.setattr(Cache, "_load_manifest", counting_load)
+    cache = Cache(cache_dir=cache_dir)
+    assert loads == []
+
+    assert cache.list_checkpoints() == ["step"]
+    assert cache.checkpoint_order == ["step"]
+    assert len(loads) == 1
+
+
+def test_malformed_manifest_is_reported_on_first_use(tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    (cache_dir / "cache_manifest.json").write_text('{"step": 1}')
+
+    cache = Cache(cache_dir=cache_dir)
+    with pytest.raises(ValueError, match="JSON list of strings"):
+        cache.list_checkpoints()
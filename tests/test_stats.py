@@ -0,0 +1,164 @@
+"""
+Tests for the persisted per-entry metadata and the stats report built from it.
+"""
+
+import builtins
+import errno
+import os
+import pickle
+
+import pytest
+from click.testing import CliRunner
+
+from pickled_pipeline import Cache, entry
+from pickled_pipeline.cli import cli
+
+
+def test_stats_report_hits_and_disk_cost_per_checkpoint(cache):
+    @cache.checkpoint(name="step1")
+    def step1(x):
+        return x * 2
+
+    @cache.checkpoint(name="step2")
+    def step2(x):
+        return [x] * 100
+
+    step1(1)
+    step1(1)
+    step1(1)
+    step1(2)
+    step2(1)
+
+    stats = cache.stats()
+
+    assert list(stats) == ["step1", "step2"]
+    assert stats["step1"].entries == 2
+    assert stats["step1"].hits == 2
+    assert stats["step1"].hit_ratio == 0.5
+    assert stats["step1"].compute_seconds > 0
+    assert stats["step1"].load_seconds > 0
+    assert stats["step2"].hits == 0
+    assert stats["step2"].payload_bytes > stats["step1"].payload_bytes
+    assert stats["step2"].disk_bytes > stats["step2"].payload_bytes
+
+
+def test_hit_counts_persist_across_cache_instances(cache):
+    @cache.checkpoint(name="step")
+    def step():
+        return "value"
+
+    step()
+    step()
+
+    reopened = Cache(cache_dir=cache.cache_dir)
+
+    @reopened.checkpoint(name="step")
+    def reopened_step():
+        return "value"
+
+    assert reopened_step() == "value"
+    assert reopened.stats()["step"].hits == 2
+
+
+def test_legacy_entries_without_headers_still_load(cache):
+    calls = {"count": 0}
+
+    @cache.checkpoint(name="step")
+    def step():
+        calls["count"] += 1
+        return "value"
+
+    step()
+    [filename] = [
+        name
+        for name in os.listdir(cache.cache_dir)
+        if name != "cache_manifest.json"
+    ]
+    with open(os.path.join(cache.cache_dir, filename), "wb") as f:
+        pickle.dump("legacy value", f)
+
+    assert step() == "legacy value"
+    assert calls["count"] == 1
+    assert cache.stats()["step"].entries == 1
+    assert cache.stats()["step"].hits == 0
+
+
+def test_cli_stats_lists_checkpoints(tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache = Cache(cache_dir=cache_dir)
+
+    @cache.checkpoint(name="step")
+    def step():
+        return "value"
+
+    step()
+    step()
+
+    result = CliRunner().invoke(cli, ["stats", "--cache-dir", str(cache_dir)])
+
+    assert result.exit_code == 0
+    assert "checkpoint" in result.output
+    assert "step" in result.output
+    assert "50%" in result.output
+
+
+def test_hits_leave_entry_files_unchanged_until_closed(cache):
+    @cache.checkpoint(name="step")
+    def step():
+        return "value"
+
+    step()
+    [path] = [
+        os.path.join(cache.cache_dir, name)
+        for name in os.listdir(cache.cache_dir)
+        if name.endswith(".pkl")
+    ]
+    written = os.stat(path).st_mtime_ns
+    step()
+    step()
+    assert os.stat(path).st_mtime_ns == written
+
+    cache.close()
+    assert cache.stats()["step"].hits == 2
+
+
+def test_hits_are_served_when_entries_cannot_be_written(cache, monkeypatch):
+    @cache.checkpoint(name="step")
+    def step():
+        return "value"
+
+    step()
+
+    def read_only_open(file, mode="r", *args, **kwargs):
+        if mode != "rb":
+            raise OSError(errno.EROFS, "Read-only file system", file)
+        return builtins.open(file, mode, *args, **kwargs)
+
+    monkeypatch.setattr(entry, "open", read_only_open, raising=False)
+    assert step() == "value"
+    cache.close()
+    assert step() == "value"
+    assert cache.stats()["step"].hits == 0
+
+
+@pytest.mark.skipif(
+    not hasattr(os, "geteuid") or os.geteuid() == 0,
+    reason="Permissions do not restrict the superuser.",
+)
+def test_hits_are_served_from_an_unwritable_directory(tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache = Cache(cache_dir=cache_dir)
+
+    @cache.checkpoint(name="step")
+    def step():
+        return "value"
+
+    step()
+    for name in os.listdir(cache_dir):
+        os.chmod(cache_dir / name, 0o444)
+    os.chmod(cache_dir, 0o555)
+    try:
+        assert step() == "value"
+        cache.close()
+    finally:
+        os.chmod(cache_dir, 0o755)
@@ -0,0 +1,129 @@
+"""
+Tests for per-checkpoint concurrency and rate limits, which only apply to the
+compute path of cache misses, in both sync and async checkpoints.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from pickled_pipeline.throttle import Throttle, TokenBucket
+
+
+class _ConcurrencyProbe:
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def enter(self):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+
+    def exit(self):
+        with self._lock:
+            self.active -= 1
+
+
+def test_sync_misses_respect_max_concurrency(cache):
+    probe = _ConcurrencyProbe()
+
+    @cache.checkpoint(name="slow", max_concurrency=2)
+    def slow(x):
+        probe.enter()
+        time.sleep(0.02)
+        probe.exit()
+        return x
+
+    threads = [threading.Thread(target=slow, args=(i,)) for i in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert probe.peak == 2
+
+
+def test_cache_hits_do_not_wait_for_busy_compute_slots(cache):
+    release = threading.Event()
+
+    @cache.checkpoint(name="blocking", max_concurrency=1)
+    def blocking(x):
+        if x == "slow":
+            release.wait(timeout=5)
+        return x
+
+    blocking("cached")
+    worker = threading.Thread(target=blocking, args=("slow",))
+    worker.start()
+    try:
+        started = time.perf_counter()
+        assert blocking("cached") == "cached"
+        assert time.perf_counter() - started < 1
+    finally:
+        release.set()
+        worker.join()
+
+
+def test_cache_hits_do_not_consume_rate_tokens(cache):
+    @cache.checkpoint(name="limited", rate=1)
+    def limited():
+        return "value"
+
+    limited()
+    started = time.perf_counter()
+    for _ in range(5):
+        limited()
+    assert time.perf_counter() - started < 0.5
+
+
+def test_token_bucket_spaces_calls_beyond_capacity():
+    bucket = TokenBucket(rate=100, capacity=1)
+
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.01, abs=0.005)
+    assert bucket.reserve() == pytest.approx(0.02, abs=0.005)
+
+
+def test_throttle_rejects_invalid_limits():
+    with pytest.raises(ValueError):
+        Throttle(max_concurrency=0)
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_async_checkpoint_caches_results(cache):
+    calls = {"count": 0}
+
+    @cache.checkpoint(name="fetch")
+    async def fetch(x):
+        calls["count"] += 1
+        await asyncio.sleep(0)
+        return x * 2
+
+    assert asyncio.run(fetch(2)) == 4
+    assert asyncio.run(fetch(2)) == 4
+    assert calls["count"] == 1
+    assert cache.list_checkpoints() == ["fetch"]
+
+
+def test_async_misses_respect_max_concurrency(cache):
+    probe = _ConcurrencyProbe()
+
+    @cache.checkpoint(name="fetch", max_concurrency=2, rate=1000)
+    async def fetch(x):
+        probe.enter()
+        await asyncio.sleep(0.01)
+        probe.exit()
+        return x
+
+    async def run_all():
+        return await asyncio.gather(*(fetch(i) for i in range(6)))
+
+    assert asyncio.run(run_all()) == list(range(6))
+    assert probe.peak == 2
+    # A second event loop gets its own semaphore.
+    assert asyncio.run(run_all()) == list(range(6))
@@ -73,3 +73,37 @@ def test_truncate_cache(cache):
     # Verify that the cache is rebuilt
     remaining_checkpoints = cache.list_checkpoints()
     assert remaining_checkpoints == expected_order
+
+
+def _fill(cache, checkpoint_name, count):
+    @cache.checkpoint(name=checkpoint_name)
+    def step(index):
+        return index
+
+    for index in range(count):
+        step(index)
+
+
+def test_truncate_and_clear_remove_in_parallel_with_progress(cache):
+    _fill(cache, "first", 10)
+    _fill(cache, "second", 600)
+    _fill(cache, "third", 5)
+    reports = []
+
+    assert cache.truncate_cache(
+        "second",
+        jobs=4,
+        progress=lambda removed, total: reports.append((removed, total)),
+    )
+    assert reports[0] == (0, 605)
+    assert reports[-1] == (605, 605)
+    assert [removed for removed, _ in reports] == sorted(
+        removed for removed, _ in reports
+    )
+    assert len(reports) > 2
+    assert len(os.listdir(cache.cache_dir)) == 11
+
+    reports.clear()
+    cache.clear_cache(jobs=1, progress=lambda *report: reports.append(report))
+    assert reports == [(0, 10), (10, 10)]
+    assert os.listdir(cache.cache_dir) == ["cache_manifest.json"]
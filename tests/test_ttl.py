@@ -0,0 +1,99 @@
+"""
+Tests for per-checkpoint TTLs and stale-while-revalidate refreshes.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+
+def test_expired_entry_is_recomputed(cache):
+    calls = {"count": 0}
+
+    @cache.checkpoint(name="drifting", ttl=0.05)
+    def drifting():
+        calls["count"] += 1
+        return calls["count"]
+
+    assert drifting() == 1
+    assert drifting() == 1
+
+    time.sleep(0.1)
+
+    assert drifting() == 2
+    assert drifting() == 2
+
+
+def test_stale_entry_is_served_while_refreshing_in_background(cache):
+    calls = {"count": 0}
+    refresh_started = threading.Event()
+    release_refresh = threading.Event()
+
+    @cache.checkpoint(name="drifting", ttl=0.05, stale_while_revalidate=True)
+    def drifting():
+        calls["count"] += 1
+        if calls["count"] > 1:
+            refresh_started.set()
+            release_refresh.wait(timeout=5)
+        return calls["count"]
+
+    assert drifting() == 1
+    time.sleep(0.1)
+
+    # The stale value comes back immediately; a refresh is already running,
+    # so a second stale read does not start another one.
+    assert drifting() == 1
+    assert refresh_started.wait(timeout=5)
+    assert drifting() == 1
+
+    release_refresh.set()
+    assert cache.wait_for_revalidation(timeout=5)
+
+    assert drifting() == 2
+    assert calls["count"] == 2
+
+
+def test_failed_revalidation_keeps_serving_the_stale_entry(cache, caplog):
+    calls = {"count": 0}
+
+    @cache.checkpoint(name="flaky", ttl=0.05, stale_while_revalidate=True)
+    def flaky():
+        calls["count"] += 1
+        if calls["count"] > 1:
+            raise RuntimeError("upstream down")
+        return "original"
+
+    assert flaky() == "original"
+    time.sleep(0.1)
+
+    assert flaky() == "original"
+    assert cache.wait_for_revalidation(timeout=5)
+    assert flaky() == "original"
+    assert "Background revalidation failed." in caplog.text
+
+
+def test_async_stale_entry_is_refreshed_by_a_task(cache):
+    calls = {"count": 0}
+
+    @cache.checkpoint(name="fetch", ttl=0.05, stale_while_revalidate=True)
+    async def fetch():
+        calls["count"] += 1
+        return calls["count"]
+
+    async def run():
+        first = await fetch()
+        await asyncio.sleep(0.1)
+        stale = await fetch()
+        # Let the background refresh task finish on this loop.
+        await asyncio.sleep(0.05)
+        refreshed = await fetch()
+        return first, stale, refreshed
+
+    assert asyncio.run(run()) == (1, 1, 2)
+
+
+def test_stale_while_revalidate_requires_ttl(cache):
+    with pytest.raises(ValueError, match="requires a ttl"):
+        cache.checkpoint(stale_while_revalidate=True)
@@ -0,0 +1,107 @@
+"""
+Tests for version-aware checkpoint keys.
+"""
+
+import os
+
+import pytest
+from pickled_pipeline.cache import _code_fingerprint
+
+
+def _entry_names(cache):
+    return sorted(
+        name for name in os.listdir(cache.cache_dir) if name.endswith(".pkl")
+    )
+
+
+def test_unversioned_keys_are_unchanged(cache):
+    @cache.checkpoint(name="step")
+    def step(x):
+        return x
+
+    step(1)
+    (before,) = _entry_names(cache)
+
+    @cache.checkpoint(name="step", version=None, code_version=False)
+    def step_again(x):
+        raise AssertionError("should have been a hit")
+
+    assert step_again(1) == 1
+    assert _entry_names(cache) == [before]
+
+
+def test_explicit_version_change_misses_only_that_step(cache):
+    calls = []
+
+    def build(version):
+        @cache.checkpoint(name="clean", version=version)
+        def clean(text):
+            calls.append("clean")
+            return text.strip()
+
+        @cache.checkpoint(name="count")
+        def count(text):
+            calls.append("count")
+            return len(text)
+
+        return lambda text: count(clean(text))
+
+    assert build(1)(" abc ") == 3
+    assert calls == ["clean", "count"]
+
+    calls.clear()
+    assert build(1)(" abc ") == 3
+    assert calls == []
+
+    # A new version recomputes the step; its output is byte-identical, so the
+    # downstream step still hits.
+    calls.clear()
+    assert build("2")(" abc ") == 3
+    assert calls == ["clean"]
+
+
+def test_code_version_follows_function_body(cache):
+    calls = []
+
+    @cache.checkpoint(name="step", code_version=True)
+    def step(x):
+        calls.append(1)
+        return x + 1
+
+    @cache.checkpoint(name="step", code_version=True)
+    def same_body(x):
+        calls.append(1)
+        return x + 1
+
+    @cache.checkpoint(name="step", code_version=True)
+    def changed(x):
+        calls.append(1)
+        return x + 2
+
+    assert step(1) == 2
+    assert same_body(1) == 2
+    assert len(calls) == 1
+    assert changed(1) == 3
+    assert len(calls) == 2
+
+
+def test_code_fingerprint_covers_nested_code_and_constants():
+    def outer_one():
+        def inner():
+            return {"a", "b"}
+
+        return inner
+
+    def outer_two():
+        def inner():
+            return {"a", "c"}
+
+        return inner
+
+    assert _code_fingerprint(outer_one) != _code_fingerprint(outer_two)
+    assert _code_fingerprint(outer_one) == _code_fingerprint(outer_one)
+
+
+def test_code_version_requires_a_python_function(cache):
+    with pytest.raises(TypeError, match="code_version"):
+        cache.checkpoint(code_version=True)(len)
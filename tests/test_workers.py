@@ -0,0 +1,134 @@
+"""
+Tests for sharing a cache with worker processes.
+"""
+
+import multiprocessing
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from pickled_pipeline import Cache
+
+START_METHODS = [
+    pytest.param(
+        method,
+        marks=pytest.mark.skipif(
+            method not in multiprocessing.get_all_start_methods(),
+            reason=f"{method} is not available.",
+        ),
+    )
+    for method in ("fork", "spawn")
+]
+
+
+def square(x):
+    return x * x
+
+
+def square_all(items):
+    return [item * item for item in items]
+
+
+def collect(items, source):
+    return [source]
+
+
+def list_checkpoints(cache):
+    return cache.list_checkpoints()
+
+
+def tag_cache(cache, tag):
+    previous = getattr(cache, "test_tag", None)
+    cache.test_tag = tag
+    return previous
+
+
+@pytest.mark.parametrize("start_method", START_METHODS)
+def test_pipeline_runs_in_worker_processes(tmp_path, start_method):
+    cache = Cache(cache_dir=tmp_path / "cache")
+    step = cache.checkpoint(name="square")(square)
+    batch_step = cache.batch_checkpoint(name="square_all")(square_all)
+    context = multiprocessing.get_context(start_method)
+
+    with ProcessPoolExecutor(max_workers=2, mp_context=context) as pool:
+        assert list(pool.map(step, range(6))) == [0, 1, 4, 9, 16, 25]
+        assert pool.submit(batch_step, [2, 3]).result() == [4, 9]
+        checkpoints = pool.submit(list_checkpoints, cache).result()
+
+    assert sorted(checkpoints) == ["square", "square_all"]
+    assert [step(x) for x in range(6)] == [0, 1, 4, 9, 16, 25]
+    assert batch_step([2, 3]) == [4, 9]
+    metrics = cache.metrics()
+    assert metrics["square"].hits == 6
+    assert metrics["square"].misses == 0
+    assert metrics["square_all"].misses == 0
+
+
+def test_unpickling_reuses_the_open_cache_and_wrapper(tmp_path):
+    cache = Cache(cache_dir=tmp_path / "cache", durability="none")
+    step = cache.checkpoint(name="square", exclude_args=["x"])(square)
+    log = cache.append_checkpoint(name="log")(collect)
+
+    assert pickle.loads(pickle.dumps(cache)) is cache
+    assert pickle.loads(pickle.dumps(step)) is step
+    assert pickle.loads(pickle.dumps(log)) is log
+
+
+def test_handle_reconnects_with_the_same_options(tmp_path):
+    cache = Cache(cache_dir=tmp_path / "cache", deduplicate=True)
+    step = cache.checkpoint(name="square", version=2)(square)
+    data = pickle.dumps(step)
+    del step, cache
+
+    step = pickle.loads(data)
+    assert step(3) == 9
+    assert step._cache.deduplicate
+    assert step._cache._checkpoints["square"].key_version == (2, None)
+
+
+def test_local_functions_cannot_be_pickled(tmp_path):
+    cache = Cache(cache_dir=tmp_path / "cache")
+
+    @cache.checkpoint()
+    def local_step(x):
+        return x
+
+    with pytest.raises((pickle.PicklingError, AttributeError)):
+        pickle.dumps(local_step)
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="fork is not available.",
+)
+def test_forked_child_does_not_inherit_held_locks(tmp_path):
+    cache = Cache(cache_dir=tmp_path / "cache")
+    log = cache.append_checkpoint(name="log", exclude_args=["source"])(
+        collect
+    )
+    context = multiprocessing.get_context("fork")
+
+    def child():
+        log("child")
+
+    with cache._append_locks_lock:
+        process = context.Process(target=child)
+        process.start()
+    process.join(10)
+    if process.is_alive():
+        process.kill()
+
+    assert process.exitcode == 0
+    assert log("parent") == ["child", "parent"]
+
+
+def test_worker_keeps_a_reopened_cache(tmp_path):
+    cache = Cache(cache_dir=tmp_path / "cache")
+    context = multiprocessing.get_context("spawn")
+
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        first = pool.submit(tag_cache, cache, "first").result()
+        second = pool.submit(tag_cache, cache, "second").result()
+
+    assert (first, second) == (None, "first")